@@ -0,0 +1,329 @@
+"""
+bench_gigi.py
+Suite de benchmarks reproductible du chemin critique de Gigi :
+parse → dispatch → contrôleur Spotify (spotipy simulé, latence injectée).
+
+Usage :
+    python bench_gigi.py                      # mesure + comparaison à la baseline
+    python bench_gigi.py --save-baseline      # enregistre la mesure comme baseline
+    python bench_gigi.py --latency-ms 50      # latence simulée de l'API Spotify
+
+Les résultats sont écrits en JSON (--output) ; le code retour vaut 1 si une
+mesure régresse de plus de --tolerance par rapport à la baseline, 2 si la
+baseline est introuvable.
+
+bench_baseline.json, livré avec le code, sert de référence. Les mesures
+dépendent de la machine : sur un autre matériel (Raspberry Pi), enregistrer
+d'abord sa propre baseline avec --save-baseline avant de comparer.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Le contrôleur exige ces variables à l'import ; elles ne servent pas ici
+os.environ.setdefault("CLIENT_ID", "bench")
+os.environ.setdefault("CLIENT_SECRET", "bench")
+os.environ.setdefault("REDIRECT_URI", "http://localhost/callback")
+os.environ.setdefault("RASPO_DEVICE_NAME", "Raspo")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("LIBRARY_INDEX_PATH", "")
+# On mesure le chemin de commande, pas le budget de requêtes/s
+os.environ.setdefault("SPOTIFY_RATE_LIMIT", "100000")
+os.environ.setdefault("SPOTIFY_RATE_BURST", "100000")
+
+import command  # noqa: E402
+import spotify_controller as sp_ctrl  # noqa: E402
+from nlp_parser import NLPParser  # noqa: E402
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json"
+)
+DEFAULT_TOLERANCE = 0.25
+# Écart absolu minimal pour parler de régression (bruit des micro-mesures)
+MIN_REGRESSION_US = 5.0
+DEFAULT_LATENCY_MS = 20.0
+
+# Corpus de commandes réalistes (transcriptions typiques du foyer)
+CORPUS = [
+    "Mets Stromae Santé sur Spotify",
+    "Joue Fade to Black de Metallica",
+    "Lance Booba DKR sur Spotify",
+    "Balance une musique chill sur Spotify",
+    "Peux-tu jouer Paroles Paroles s'il te plaît ?",
+    "pause",
+    "Pause la musique",
+    "Stop la chanson",
+    "Reprends la lecture",
+    "monte le son",
+    "baisse le volume",
+    "musique suivante",
+    "piste précédente",
+    "active le mode aléatoire",
+    "désactive le mode aléatoire",
+    "répète la chanson",
+    "répète l'album",
+    "arrête la répétition",
+    "raconte moi une blague",
+    "quelle heure est il",
+    "comment ça va",
+    "salut",
+    "bonjour",
+    "Mets Angèle Balance ton quoi",
+    "Joue Daft Punk Get Lucky",
+    "Lance la playlist du matin",
+    "euh je sais pas",
+]
+
+# Fautes de frappe / de transcription : passent par l'index approché
+FUZZY_CORPUS = [
+    "jou get lucky",
+    "mts stromae",
+    "suivante piste",
+    "precedent",
+    "desactive mode aleatoire",
+]
+
+# -----------------------------
+# SPOTIFY SIMULÉ
+# -----------------------------
+
+
+class FakeSpotify:
+    """Imite les méthodes de spotipy.Spotify utilisées par le contrôleur."""
+
+    def __init__(self, latency: float, device_name: str):
+        self.latency = latency
+        self.device_name = device_name
+        self.requests = 0
+
+    def _call(self, result=None):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return result
+
+    def devices(self):
+        return self._call(
+            {"devices": [{"id": "raspo-id", "name": self.device_name}]}
+        )
+
+    def search(self, q, type="track", limit=1):
+        return self._call(
+            {"tracks": {"items": [{"uri": f"spotify:track:{abs(hash(q))}"}]}}
+        )
+
+    def start_playback(self, device_id=None, uris=None, **kwargs):
+        return self._call()
+
+    def pause_playback(self, device_id=None):
+        return self._call()
+
+    def next_track(self, device_id=None):
+        return self._call()
+
+    def previous_track(self, device_id=None):
+        return self._call()
+
+    def volume(self, volume_percent, device_id=None):
+        return self._call()
+
+    def shuffle(self, state, device_id=None):
+        return self._call()
+
+    def repeat(self, state, device_id=None):
+        return self._call()
+
+
+def _install_fake_spotify(latency: float) -> FakeSpotify:
+    fake = FakeSpotify(latency, os.environ["RASPO_DEVICE_NAME"])
+    sp_ctrl._client_holder._client = fake
+    sp_ctrl._device_registry.invalidate()
+    sp_ctrl._search_cache.clear()
+    return fake
+
+
+# -----------------------------
+# MESURE
+# -----------------------------
+
+
+def _measure(func: Callable[[], None], iterations: int, ops: int = 1) -> dict:
+    """Chronomètre func iterations fois ; ops = opérations par appel."""
+    func()  # échauffement
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) / ops)
+
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "median_us": median * 1e6,
+        "p95_us": samples[int(0.95 * (len(samples) - 1))] * 1e6,
+        "ops_per_second": 1 / median if median else 0.0,
+        "iterations": iterations,
+    }
+
+
+def run_suite(latency: float) -> Dict[str, dict]:
+    results = {}
+
+    # Démarrage à froid du parser (lexique déjà compilé sur disque)
+    results["parser_cold_start"] = _measure(NLPParser, iterations=50)
+
+    nlp = NLPParser()
+    results["parse_command"] = _measure(
+        lambda: [nlp.parse_command(p) for p in CORPUS],
+        iterations=200,
+        ops=len(CORPUS)
+    )
+
+    uncached = NLPParser(cache_size=0)
+    results["parse_command_uncached"] = _measure(
+        lambda: [uncached.parse_command(p) for p in CORPUS],
+        iterations=200,
+        ops=len(CORPUS)
+    )
+
+    results["parse_command_fuzzy"] = _measure(
+        lambda: [uncached.parse_command(p) for p in FUZZY_CORPUS],
+        iterations=200,
+        ops=len(FUZZY_CORPUS)
+    )
+
+    # Dispatch seul : contrôleur neutralisé, sorties console absorbées
+    parsed = [nlp.parse_command(p) for p in CORPUS]
+    noop_ctrl = {
+        name: (lambda *args, **kwargs: None)
+        for name in (
+            "play_song", "pause_song", "resume_song", "next_track",
+            "previous_track", "change_volume", "shuffle", "repeat"
+        )
+    }
+    originals = {name: getattr(sp_ctrl, name) for name in noop_ctrl}
+    try:
+        for name, func in noop_ctrl.items():
+            setattr(sp_ctrl, name, func)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["execute_command_dispatch"] = _measure(
+                lambda: [command.execute_command(p) for p in parsed],
+                iterations=200,
+                ops=len(parsed)
+            )
+    finally:
+        for name, func in originals.items():
+            setattr(sp_ctrl, name, func)
+
+    # Contrôleur contre spotipy simulé avec latence injectée
+    _install_fake_spotify(latency)
+    results["controller_pause"] = _measure(sp_ctrl.pause_song, iterations=20)
+    results["controller_play_song"] = _measure(
+        lambda: sp_ctrl.play_song("stromae santé"), iterations=20
+    )
+    results["controller_change_volume"] = _measure(
+        lambda: sp_ctrl.change_volume(delta=10), iterations=20
+    )
+
+    return results
+
+
+# -----------------------------
+# BASELINE
+# -----------------------------
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Liste des benchmarks dont la médiane dépasse la baseline + tolérance."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        limit = max(
+            reference["median_us"] * (1 + tolerance),
+            reference["median_us"] + MIN_REGRESSION_US
+        )
+        if result["median_us"] > limit:
+            regressions.append(
+                f"{name} : {result['median_us']:.1f} µs > {limit:.1f} µs"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.latency_ms / 1000)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    print("\n===== BENCHMARK GIGI =====\n")
+    for name, result in results.items():
+        print(
+            f"{name:<28} médiane {result['median_us']:>10.1f} µs"
+            f" | p95 {result['p95_us']:>10.1f} µs"
+            f" | {result['ops_per_second']:>10.0f} ops/s"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Baseline enregistrée dans {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(
+            f"\nBaseline introuvable : {args.baseline}\n"
+            "Relance avec --save-baseline pour l'enregistrer sur cette machine.",
+            file=sys.stderr
+        )
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRÉGRESSIONS :")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nAucune régression (tolérance {args.tolerance:.0%}).")
+    print("==========================\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
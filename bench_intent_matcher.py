@@ -0,0 +1,95 @@
+"""
+bench_intent_matcher.py
+Benchmark de IntentMatcher face au parcours naïf `key in phrase`
+quand la table de synonymes grossit, et de l'index approché (fautes de
+frappe) sur le même vocabulaire.
+
+Usage : python bench_intent_matcher.py
+"""
+
+import random
+import string
+import timeit
+
+from fuzzy_index import FuzzyIntentIndex
+from intent_matcher import IntentMatcher
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+TABLE_SIZES = [10, 100, 1000, 5000]
+REPEAT = 2000
+
+PHRASES = [
+    "mets stromae santé sur spotify",
+    "musique suivante s'il te plait",
+    "peux tu me dire quelle heure est il",
+    "active le mode aléatoire",
+    "joue fade to black de metallica",
+]
+
+# Phrases que seule la correspondance approchée reconnaît
+FUZZY_PHRASES = [
+    ["jou", "fade", "to", "black"],
+    ["suivante", "musique"],
+    ["quelle", "heur", "est", "il"],
+]
+
+
+def _synthetic_table(size: int, seed: int = 42) -> dict:
+    """Table de synonymes aléatoires, sans recouvrement avec PHRASES."""
+    rng = random.Random(seed)
+    table = {}
+    while len(table) < size:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(rng.randint(2, 4))
+        ]
+        table[" ".join(words)] = f"action_{len(table)}"
+    table["musique suivante"] = "suivant"
+    table["quelle heure est il"] = "heure"
+    return table
+
+
+def _naive_search(table: dict, phrase: str):
+    for key in table:
+        if key in phrase:
+            return key, table[key]
+    return None
+
+
+def run_benchmark():
+    print("\n===== BENCHMARK INTENT MATCHER =====\n")
+    print(f"{'synonymes':>10} | {'naïf (µs/phrase)':>18} | {'automate (µs/phrase)':>21}")
+
+    for size in TABLE_SIZES:
+        table = _synthetic_table(size)
+        matcher = IntentMatcher(table)
+
+        naive = timeit.timeit(
+            lambda: [_naive_search(table, p) for p in PHRASES], number=REPEAT
+        )
+        automaton = timeit.timeit(
+            lambda: [matcher.search(p) for p in PHRASES], number=REPEAT
+        )
+
+        per_phrase = 1e6 / (REPEAT * len(PHRASES))
+        print(
+            f"{size:>10} | {naive * per_phrase:>18.2f} | {automaton * per_phrase:>21.2f}"
+        )
+
+    print(f"\n{'synonymes':>10} | {'approché (µs/phrase)':>21}")
+    for size in TABLE_SIZES:
+        fuzzy = FuzzyIntentIndex(["joue", "mets"], _synthetic_table(size), ())
+        elapsed = timeit.timeit(
+            lambda: [fuzzy.match(tokens) for tokens in FUZZY_PHRASES],
+            number=REPEAT
+        )
+        print(f"{size:>10} | {elapsed * 1e6 / (REPEAT * len(FUZZY_PHRASES)):>21.2f}")
+
+    print("\n====================================\n")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,82 @@
+"""
+bench_startup.py
+Mesure le temps d'import de nlp_parser et le démarrage à froid de NLPParser
+(processus Python neuf à chaque essai) et les compare au budget fixé.
+
+Usage : python bench_startup.py   (code retour 1 si le budget est dépassé)
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+RUNS = 5
+
+# Budgets en millisecondes, mesurés avec l'artefact de lexique déjà généré
+IMPORT_BUDGET_MS = 50
+COLD_START_BUDGET_MS = 100
+
+_CHILD_CODE = """
+import json, sys, time
+t0 = time.perf_counter()
+import nlp_parser
+t1 = time.perf_counter()
+nlp_parser.NLPParser()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "init_ms": (t2 - t1) * 1000,
+    "nltk_loaded": "nltk" in sys.modules,
+}))
+"""
+
+
+def _measure_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD_CODE],
+        # Le processus fils importe nlp_parser depuis le dossier du script
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark() -> bool:
+    """Retourne True si les budgets sont respectés."""
+    # Premier essai hors mesure : génère l'artefact de lexique si besoin
+    _measure_once()
+    runs = [_measure_once() for _ in range(RUNS)]
+
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    cold_start_ms = statistics.median(
+        r["import_ms"] + r["init_ms"] for r in runs
+    )
+    nltk_loaded = any(r["nltk_loaded"] for r in runs)
+
+    print("\n===== BENCHMARK DÉMARRAGE NLP =====\n")
+    print(f"Import nlp_parser   : {import_ms:7.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(
+        f"Démarrage à froid   : {cold_start_ms:7.1f} ms (budget {COLD_START_BUDGET_MS} ms)"
+    )
+    print(f"NLTK importé        : {'oui' if nltk_loaded else 'non'}")
+
+    ok = (
+        import_ms <= IMPORT_BUDGET_MS
+        and cold_start_ms <= COLD_START_BUDGET_MS
+        and not nltk_loaded
+    )
+    print(f"\nBudget {'respecté' if ok else 'DÉPASSÉ'}")
+    print("===================================\n")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
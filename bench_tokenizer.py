@@ -0,0 +1,56 @@
+"""
+bench_tokenizer.py
+Benchmark du tokenizer français face à TreebankWordTokenizer (NLTK) sur
+des commandes typiques de Gigi.
+
+Usage : python bench_tokenizer.py
+"""
+
+import timeit
+
+from french_tokenizer import FrenchTokenizer
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+REPEAT = 5000
+
+PHRASES = [
+    "mets stromae santé sur spotify",
+    "joue fade to black de metallica",
+    "peux-tu jouer paroles paroles s'il te plaît ?",
+    "répète l'album",
+    "lance booba dkr, stp !",
+    "balance une musique chill sur spotify",
+]
+
+
+def run_benchmark():
+    from nltk.tokenize import TreebankWordTokenizer
+
+    tokenizers = {
+        "treebank (nltk)": TreebankWordTokenizer(),
+        "français": FrenchTokenizer(keep_elisions=False),
+        "français + accents": FrenchTokenizer(
+            keep_elisions=False, fold_accents=True
+        ),
+    }
+
+    print("\n===== BENCHMARK TOKENIZER =====\n")
+    print(f"{'tokenizer':<20} | {'µs/phrase':>10} | {'accélération':>12}")
+
+    reference = None
+    for name, tokenizer in tokenizers.items():
+        elapsed = timeit.timeit(
+            lambda: [tokenizer.tokenize(p) for p in PHRASES], number=REPEAT
+        )
+        per_phrase = elapsed * 1e6 / (REPEAT * len(PHRASES))
+        reference = reference or per_phrase
+        print(f"{name:<20} | {per_phrase:>10.2f} | {reference / per_phrase:>11.1f}x")
+
+    print("\n===============================\n")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,132 @@
+"""
+circuit_breaker.py
+Disjoncteur autour des appels Spotify : après plusieurs pannes d'affilée
+on échoue immédiatement au lieu d'attendre chaque timeout, puis une seule
+requête de test (half-open) vérifie si le service est revenu.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+FAILURE_THRESHOLD = int(os.getenv("SPOTIFY_BREAKER_THRESHOLD", "3"))
+RESET_TIMEOUT = float(os.getenv("SPOTIFY_BREAKER_RESET", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# -----------------------------
+# DISJONCTEUR
+# -----------------------------
+
+
+class CircuitOpenError(Exception):
+    """Levée sans appel réseau tant que le disjoncteur est ouvert."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} indisponible, nouvel essai dans {retry_in:.0f} s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur classique à trois états.
+
+    - closed : les appels passent ; failure_threshold pannes consécutives
+      ouvrent le circuit.
+    - open : les appels lèvent CircuitOpenError pendant reset_timeout.
+    - half_open : un seul appel de test passe ; un succès referme le
+      circuit, un échec le rouvre pour reset_timeout.
+
+    is_failure décide quelles exceptions comptent comme une panne (une
+    erreur 4xx, par exemple, ne dit rien de la santé du service).
+    """
+
+    def __init__(
+        self,
+        name: str = "Spotify",
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        is_failure: Callable[[Exception], bool] = lambda error: True
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def retry_in(self) -> float:
+        """Secondes avant le prochain appel de test (0 si le circuit est fermé)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def available(self) -> bool:
+        """Un appel passerait-il maintenant ? (ne consomme pas l'appel de test)"""
+        with self._lock:
+            state = self._state(time.monotonic())
+            return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def before_call(self) -> None:
+        """Lève CircuitOpenError si l'appel ne doit pas partir."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - now)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            if self.is_failure(error):
+                self.record_failure()
+            else:
+                # Le service a répondu : il est en vie
+                self.record_success()
+            raise
+        self.record_success()
+        return result
@@ -4,169 +4,335 @@ Assistant vocal principal : Gigi
 Analyse des commandes utilisateur et contrôle Spotify.
 """
 
+import queue
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set, Union
+
+from circuit_breaker import CircuitOpenError
+from request_scheduler import RequestTimeout
+from command_pipeline import CommandPipeline, SpotifyJob
 from nlp_parser import NLPParser
+from parsed_command import Intent, ParsedCommand, to_intent
 import spotify_controller as sp_ctrl
+import tracing
+from warmup import WARMUP_MODE, Warmup, default_steps
 
 # -----------------------------
-# EXÉCUTION DES COMMANDES
+# CONTEXTE & REGISTRE DES ACTIONS
 # -----------------------------
 
 
-def execute_command(parsed_cmd: dict):
-    """
-    Exécute la commande en fonction de l'action et de l'objet détectés.
+def print_spotify_error(ctx: "CommandContext", error: Exception) -> None:
+    """Politique d'erreur par défaut : on prévient l'utilisateur et on continue."""
+    if isinstance(error, CircuitOpenError):
+        ctx.reply(sp_ctrl.spotify_status())
+    elif isinstance(error, RequestTimeout) and error.sent:
+        # Partie vers Spotify : elle peut encore s'appliquer
+        ctx.reply(
+            "Spotify met trop de temps à répondre : commande envoyée, "
+            "mais sans confirmation."
+        )
+    elif isinstance(error, TimeoutError):
+        ctx.reply("Spotify met trop de temps à répondre, commande abandonnée.")
+    else:
+        ctx.reply(f"Erreur Spotify - {error}")
 
-    Args:
-        parsed_cmd (dict): {'action': str, 'object': str}
-    """
-    action = parsed_cmd.get("action")
-    objet = parsed_cmd.get("object")
 
-    if not action:
-        print("Gigi : Je n'ai pas compris la commande.")
-        return
+class CommandContext:
+    """
+    Contexte partagé par les handlers pendant l'exécution d'une commande.
 
-    # Gestion des salutations
-    if action == "salutation":
-        print("Gigi : Salut ! Comment puis-je t'aider ?")
-        return
+    Regroupe l'action, l'objet, l'instant de départ, la politique
+    d'erreur appliquée aux appels Spotify, si fournie, la pipeline
+    qui les exécute en arrière-plan et, si fournie, la fonction qui
+    reçoit les réponses de Gigi (affichées sinon).
+    """
 
-    # Lecture de musique (jouer une chanson spécifique)
-    if action in ["mets", "joue", "jouer", "lance", "balance"]:
-        if not objet:
-            print("Gigi : Quelle chanson veux-tu écouter ?")
+    __slots__ = (
+        "action", "objet", "started_at", "on_error", "pipeline", "on_reply"
+    )
+
+    def __init__(
+        self,
+        action: str,
+        objet: str,
+        on_error: Callable[["CommandContext", Exception],
+                           None] = print_spotify_error,
+        pipeline: Optional[CommandPipeline] = None,
+        on_reply: Optional[Callable[[str], None]] = None
+    ):
+        self.action = action
+        self.objet = objet
+        self.started_at = time.perf_counter()
+        self.on_error = on_error
+        self.pipeline = pipeline
+        self.on_reply = on_reply
+
+    @property
+    def elapsed(self) -> float:
+        """Secondes écoulées depuis le début de la commande."""
+        return time.perf_counter() - self.started_at
+
+    def reply(self, message: str) -> None:
+        if self.on_reply is not None:
+            self.on_reply(message)
+        else:
+            print(f"Gigi : {message}")
+
+    def spotify(self, func: Callable, **kwargs) -> None:
+        """
+        Appelle le contrôleur Spotify en appliquant la politique d'erreur.
+
+        Avec une pipeline, l'appel est mis en file et la fonction rend la
+        main immédiatement ; sinon il est exécuté tout de suite.
+        """
+        if self.pipeline is None:
+            try:
+                func(**kwargs)
+            except Exception as e:
+                self.on_error(self, e)
             return
-        print(f"Gigi : Je lance '{objet}' sur Spotify !")
-        try:
-            sp_ctrl.play_song(song_name=objet)
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
 
-    # Pause de la lecture
-    if action == "pause":
-        print("Gigi : Lecture mise en pause.")
+        job = SpotifyJob(func, kwargs, on_error=lambda e: self.on_error(self, e))
         try:
-            sp_ctrl.pause_song()
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+            self.pipeline.submit(job)
+        except queue.Full:
+            self.reply("Trop de commandes en attente, réessaie dans un instant.")
 
-    # Reprendre la lecture en cours
-    if action in ["reprends", "reprend"]:
-        print("Gigi : Reprise de la lecture.")
-        try:
-            sp_ctrl.resume_song(
-            )  # Nouvelle fonction dans spotify_controller.py
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
 
-    # Arrêter la lecture
-    if action == "stop":
-        print("Gigi : Arrêt de la lecture.")
-        try:
-            sp_ctrl.pause_song(
-            )  # En attendant d'avoir un stop() dédié, on utilise pause
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+Handler = Callable[[CommandContext], None]
 
-        # Volume
-    if action in ["monte", "augmente"]:
-        print("Gigi : J'augmente le volume.")
-        try:
-            sp_ctrl.change_volume(delta=+10)
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+# Action → handler, rempli par le décorateur @handler
+HANDLERS: Dict[Intent, Handler] = {}
 
-    if action in ["baisse", "diminue"]:
-        print("Gigi : Je baisse le volume.")
-        try:
-            sp_ctrl.change_volume(delta=-10)
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+# Actions qui répondent sans Spotify (toujours servies en mode dégradé)
+LOCAL_ACTIONS: Set[Intent] = set()
 
-    # Suivant / Précédent
-    if action == "suivant":
-        print("Gigi : Morceau suivant.")
-        try:
-            sp_ctrl.next_track()
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
 
-    if action == "précédent":
-        print("Gigi : Morceau précédent.")
-        try:
-            sp_ctrl.previous_track()
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+def handler(*actions: str, local: bool = False) -> Callable[[Handler], Handler]:
+    """
+    Décorateur : enregistre la fonction comme handler des actions données.
 
-    # Shuffle
-    if action == "shuffle_on":
-        print("Gigi : Activation du mode aléatoire.")
-        try:
-            sp_ctrl.shuffle(state=True)
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+    local=True indique que le handler n'appelle pas Spotify. Les noms
+    d'actions sont convertis en Action, comme les intentions du parser.
+    Une action déjà gérée par un autre handler lève ValueError.
 
-    if action == "shuffle_off":
-        print("Gigi : Désactivation du mode aléatoire.")
-        try:
-            sp_ctrl.shuffle(state=False)
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+    Exemple :
+        @handler("pause")
+        def _pause(ctx): ...
+    """
 
-    # Repeat
-    if action == "repeat_track":
-        print("Gigi : Répétition du morceau activée.")
-        try:
-            sp_ctrl.repeat(state="track")
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+    def register(func: Handler) -> Handler:
+        for action in map(to_intent, actions):
+            previous = HANDLERS.get(action)
+            if previous is not None and previous is not func:
+                raise ValueError(
+                    f"Action '{action}' déjà gérée par {previous.__name__}"
+                )
+            HANDLERS[action] = func
+            if local:
+                LOCAL_ACTIONS.add(action)
+        return func
 
-    if action == "repeat_context":
-        print("Gigi : Répétition de la playlist activée.")
-        try:
-            sp_ctrl.repeat(state="context")
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
-        return
+    return register
 
-    if action == "repeat_off":
-        print("Gigi : Répétition désactivée.")
-        try:
-            sp_ctrl.repeat(state="off")
-        except Exception as e:
-            print(f"Gigi : Erreur Spotify - {e}")
+
+# -----------------------------
+# HANDLERS
+# -----------------------------
+
+
+# Gestion des salutations
+@handler("salutation", local=True)
+def _salutation(ctx: CommandContext) -> None:
+    ctx.reply("Salut ! Comment puis-je t'aider ?")
+
+
+# Lecture de musique (jouer une chanson spécifique)
+PLAY_ACTIONS = ("mets", "joue", "jouer", "lance", "balance")
+
+
+@handler(*PLAY_ACTIONS)
+def _play(ctx: CommandContext) -> None:
+    if not ctx.objet:
+        ctx.reply("Quelle chanson veux-tu écouter ?")
         return
+    ctx.reply(f"Je lance '{ctx.objet}' sur Spotify !")
+    ctx.spotify(sp_ctrl.play_song, song_name=ctx.objet)
 
-    # Réponses conversationnelles
-    if action == "blague":
-        print(
-            "Gigi : Pourquoi les canards ont-ils autant de plumes ? Pour couvrir leur derrière !"
-        )
+
+# Pause de la lecture
+@handler("pause")
+def _pause(ctx: CommandContext) -> None:
+    ctx.reply("Lecture mise en pause.")
+    ctx.spotify(sp_ctrl.pause_song)
+
+
+# Reprendre la lecture en cours
+@handler("reprends", "reprend")
+def _resume(ctx: CommandContext) -> None:
+    ctx.reply("Reprise de la lecture.")
+    ctx.spotify(sp_ctrl.resume_song)
+
+
+# Arrêter la lecture
+@handler("stop")
+def _stop(ctx: CommandContext) -> None:
+    ctx.reply("Arrêt de la lecture.")
+    # En attendant d'avoir un stop() dédié, on utilise pause
+    ctx.spotify(sp_ctrl.pause_song)
+
+
+# Volume
+@handler("monte", "augmente")
+def _volume_up(ctx: CommandContext) -> None:
+    ctx.reply("J'augmente le volume.")
+    ctx.spotify(sp_ctrl.change_volume, delta=+10)
+
+
+@handler("baisse", "diminue")
+def _volume_down(ctx: CommandContext) -> None:
+    ctx.reply("Je baisse le volume.")
+    ctx.spotify(sp_ctrl.change_volume, delta=-10)
+
+
+# Suivant / Précédent
+@handler("suivant")
+def _next(ctx: CommandContext) -> None:
+    ctx.reply("Morceau suivant.")
+    ctx.spotify(sp_ctrl.next_track)
+
+
+@handler("précédent")
+def _previous(ctx: CommandContext) -> None:
+    ctx.reply("Morceau précédent.")
+    ctx.spotify(sp_ctrl.previous_track)
+
+
+# Shuffle
+@handler("shuffle_on")
+def _shuffle_on(ctx: CommandContext) -> None:
+    ctx.reply("Activation du mode aléatoire.")
+    ctx.spotify(sp_ctrl.shuffle, state=True)
+
+
+@handler("shuffle_off")
+def _shuffle_off(ctx: CommandContext) -> None:
+    ctx.reply("Désactivation du mode aléatoire.")
+    ctx.spotify(sp_ctrl.shuffle, state=False)
+
+
+# Repeat
+@handler("repeat_track")
+def _repeat_track(ctx: CommandContext) -> None:
+    ctx.reply("Répétition du morceau activée.")
+    ctx.spotify(sp_ctrl.repeat, state="track")
+
+
+@handler("repeat_context")
+def _repeat_context(ctx: CommandContext) -> None:
+    ctx.reply("Répétition de la playlist activée.")
+    ctx.spotify(sp_ctrl.repeat, state="context")
+
+
+@handler("repeat_off")
+def _repeat_off(ctx: CommandContext) -> None:
+    ctx.reply("Répétition désactivée.")
+    ctx.spotify(sp_ctrl.repeat, state="off")
+
+
+# Réponses conversationnelles
+@handler("blague", local=True)
+def _blague(ctx: CommandContext) -> None:
+    ctx.reply(
+        "Pourquoi les canards ont-ils autant de plumes ? Pour couvrir leur derrière !"
+    )
+
+
+@handler("heure", local=True)
+def _heure(ctx: CommandContext) -> None:
+    heure = datetime.now().strftime("%H:%M")
+    ctx.reply(f"Il est {heure}.")
+
+
+@handler("humeur", local=True)
+def _humeur(ctx: CommandContext) -> None:
+    ctx.reply("Je vais super bien ! Et toi ?")
+
+
+# -----------------------------
+# EXÉCUTION DES COMMANDES
+# -----------------------------
+
+# Sous cette confiance (correspondance approchée), on demande confirmation
+# avant d'agir : "passe le sel" ne doit pas mettre la musique en pause
+CONFIRM_CONFIDENCE = 0.9
+
+
+def describe(parsed_cmd: ParsedCommand) -> str:
+    """Commande telle que Gigi l'a comprise ("joue get lucky")."""
+    return " ".join(part for part in (parsed_cmd.action, parsed_cmd.object) if part)
+
+
+def execute_command(
+    parsed_cmd: Union[ParsedCommand, dict],
+    pipeline: Optional[CommandPipeline] = None,
+    on_reply: Optional[Callable[[str], None]] = None,
+    confirm: Optional[Callable[[ParsedCommand], bool]] = None
+):
+    """
+    Exécute la commande en fonction de l'action et de l'objet détectés.
+
+    Args:
+        parsed_cmd (ParsedCommand): Résultat de NLPParser.parse_command. Un
+            ancien dict {'action': str, 'object': str} est encore accepté.
+        pipeline (Optional[CommandPipeline]): Si fournie, les appels Spotify
+            y sont mis en file au lieu de bloquer l'appelant.
+        on_reply (Optional[Callable]): Reçoit les réponses de Gigi au lieu
+            de les afficher (ex. démon qui les renvoie au client).
+        confirm (Optional[Callable]): Demande à l'utilisateur de confirmer
+            une commande peu sûre ; sans elle, la commande est refusée.
+
+    Une commande reconnue avec une confiance inférieure à
+    CONFIRM_CONFIDENCE n'est exécutée qu'après confirmation.
+    Si le disjoncteur Spotify est ouvert, seules les actions locales sont
+    exécutées ; les autres répondent aussitôt avec l'état de Spotify.
+    """
+    parsed_cmd = ParsedCommand.from_mapping(parsed_cmd)
+    intent = parsed_cmd.intent
+
+    reply = on_reply or (lambda message: print(f"Gigi : {message}"))
+
+    if intent is None:
+        reply("Je n'ai pas compris la commande.")
         return
 
-    if action == "heure":
-        from datetime import datetime
-        heure = datetime.now().strftime("%H:%M")
-        print(f"Gigi : Il est {heure}.")
+    # Intention canonique : "mets", "lance"... → Action.JOUE
+    func = HANDLERS.get(intent)
+    if func is None:
+        # Action non reconnue
+        reply(f"Action '{parsed_cmd.action}' non reconnue.")
         return
 
-    if action == "humeur":
-        print("Gigi : Je vais super bien ! Et toi ?")
+    if parsed_cmd.confidence < CONFIRM_CONFIDENCE and (
+        confirm is None or not confirm(parsed_cmd)
+    ):
+        reply(
+            f"Je ne suis pas sûr d'avoir compris (« {describe(parsed_cmd)} » ?), "
+            "rien n'est fait."
+        )
         return
 
-    # Action non reconnue
-    print(f"Gigi : Action '{action}' non reconnue.")
+    with tracing.span("execute", intent):
+        ctx = CommandContext(
+            intent, parsed_cmd.object, pipeline=pipeline, on_reply=on_reply
+        )
+        if intent not in LOCAL_ACTIONS and not sp_ctrl.spotify_available():
+            # Mode dégradé : pas d'attente de timeout
+            ctx.reply(sp_ctrl.spotify_status())
+            return
+        func(ctx)
 
 
 # -----------------------------
@@ -174,13 +340,51 @@ def execute_command(parsed_cmd: dict):
 # -----------------------------
 
 
+def _ensure_token() -> bool:
+    """Token Spotify en cache, sinon authentification interactive."""
+    try:
+        if sp_ctrl.warm_token():
+            return True
+    except Exception as e:
+        # Réseau absent : le mode dégradé prendra le relais
+        print(f"Gigi : vérification du token impossible ({e}).")
+        return True
+
+    print("Gigi : aucun token Spotify en cache, authentification requise.")
+    try:
+        sp_ctrl.authenticate()
+    except Exception as e:
+        print(f"Gigi : authentification impossible ({e}), fermeture.")
+        return False
+    return True
+
+
+def _ask_confirmation(parsed_cmd: ParsedCommand) -> bool:
+    answer = input(f"Gigi : Tu veux dire « {describe(parsed_cmd)} » ? (oui/non) ")
+    return answer.strip().lower() in ("oui", "o", "ouais", "yes")
+
+
 def main():
     """
     Assistant vocal Gigi : boucle principale.
     """
     print("Assistant Gigi activé ! Tape 'exit' pour quitter.")
 
+    # Autorisation Spotify éventuelle ici, sur le thread principal : dans
+    # un thread de la pipeline, elle disputerait stdin à la boucle input()
+    if not _ensure_token():
+        return
+
     nlp = NLPParser()
+    pipeline = CommandPipeline()
+
+    # Token, connexion, devices... prêts avant la première commande
+    warmup = Warmup(default_steps(nlp, sp_ctrl))
+    if WARMUP_MODE == "foreground":
+        warmup.run()
+        print(warmup.report())
+    elif WARMUP_MODE != "off":
+        warmup.start()
 
     try:
         while True:
@@ -190,12 +394,23 @@ def main():
                 print("Gigi : À la prochaine !")
                 break
 
+            # Latences par étape (GIGI_TRACING=1) et préchauffage
+            if user_input.lower() == "stats":
+                print(tracing.format_stats())
+                print(warmup.report())
+                continue
+
             parsed_cmd = nlp.parse_command(user_input)
-            execute_command(parsed_cmd)
+            execute_command(parsed_cmd, pipeline=pipeline, confirm=_ask_confirmation)
 
     except KeyboardInterrupt:
         print("\nInterruption clavier détectée. Fermeture de Gigi.")
 
+    finally:
+        pipeline.close(timeout=5)
+        if tracing.tracer.enabled and tracing.TRACE_FILE:
+            tracing.tracer.export(tracing.TRACE_FILE)
+
 
 # -----------------------------
 # LANCEMENT DIRECT
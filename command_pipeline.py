@@ -0,0 +1,268 @@
+"""
+command_pipeline.py
+File d'exécution asynchrone des appels Spotify de l'assistant Gigi :
+la boucle principale répond tout de suite, les appels HTTP partent en arrière-plan.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+DEFAULT_MAX_PENDING = 16
+
+# Fenêtre (secondes) pendant laquelle une commande fusionnable attend
+# une éventuelle commande compatible avant de partir vers Spotify
+DEFAULT_COALESCE_WINDOW = float(os.getenv("GIGI_COALESCE_WINDOW", "0.3"))
+
+# Une commande de ce type annule les commandes en attente ci-dessous
+# sur le même device (ex : "pause" rend caduc un "suivant" pas encore parti)
+SUPERSEDING_KINDS = frozenset({"pause_song"})
+SUPERSEDED_KINDS = frozenset({"next_track", "previous_track", "resume_song"})
+
+# Commandes retenues pendant la fenêtre de fusion ; les autres partent
+# immédiatement
+COALESCIBLE_KINDS = frozenset(
+    {
+        "change_volume", "next_track", "previous_track", "pause_song",
+        "resume_song", "shuffle", "repeat"
+    }
+)
+
+SKIP_KINDS = frozenset({"next_track", "previous_track"})
+
+# -----------------------------
+# TÂCHES & FILES PAR DEVICE
+# -----------------------------
+
+
+class SpotifyJob:
+    """Appel Spotify différé : func(**kwargs) et son callback d'erreur."""
+
+    __slots__ = ("kind", "func", "kwargs", "device", "on_error", "ready_at")
+
+    def __init__(
+        self,
+        func: Callable,
+        kwargs: Dict[str, Any],
+        on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        self.kind = func.__name__
+        self.func = func
+        self.kwargs = kwargs
+        self.device = kwargs.get("device_name")
+        self.on_error = on_error
+        self.ready_at = 0.0
+
+    def run(self) -> None:
+        try:
+            self.func(**self.kwargs)
+        except Exception as e:
+            if self.on_error is None:
+                raise
+            self.on_error(e)
+
+
+# -----------------------------
+# FUSION DES COMMANDES
+# -----------------------------
+
+MERGED = "merged"
+CANCELLED = "cancelled"
+
+
+def coalesce(tail: SpotifyJob, job: SpotifyJob) -> Optional[str]:
+    """
+    Essaie de fusionner job dans tail (dernière tâche en attente).
+
+    Returns:
+        Optional[str]: MERGED si tail absorbe job, CANCELLED si les deux
+        s'annulent (tail doit être retirée), None si incompatibles.
+    """
+    if tail.kind == "change_volume" and job.kind == "change_volume":
+        tail.kwargs["delta"] += job.kwargs["delta"]
+        return MERGED
+
+    if job.kind in SKIP_KINDS and tail.kind in SKIP_KINDS:
+        tail_skips = tail.kwargs.get("skips", 1)
+        job_skips = job.kwargs.get("skips", 1)
+        if tail.kind == job.kind:
+            tail.kwargs["skips"] = tail_skips + job_skips
+            return MERGED
+        if tail_skips == job_skips:
+            return CANCELLED
+        if tail_skips > job_skips:
+            tail.kwargs["skips"] = tail_skips - job_skips
+            return MERGED
+        return None
+
+    if tail.kind == "pause_song" and job.kind == "resume_song":
+        return CANCELLED
+
+    if tail.kind == job.kind and job.kind in ("shuffle", "repeat"):
+        tail.kwargs = job.kwargs
+        return MERGED
+
+    return None
+
+
+class _DeviceLane:
+    """
+    File FIFO bornée d'un device, vidée par un thread dédié.
+
+    Un seul thread par device garantit l'ordre des commandes sur ce device
+    sans bloquer les autres. Une commande fusionnable n'est exécutée qu'une
+    fois sa fenêtre de fusion écoulée sans nouvelle commande compatible.
+    """
+
+    def __init__(self, name: str, maxsize: int, window: float):
+        self.maxsize = maxsize
+        self.window = window
+        self.pending: Deque[SpotifyJob] = deque()
+        self.busy = False
+        self.closed = False
+        self.coalesced = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._work, name=name, daemon=True)
+        self.thread.start()
+
+    def put(self, job: SpotifyJob) -> None:
+        now = time.monotonic()
+        with self.condition:
+            if job.kind in SUPERSEDING_KINDS:
+                kept = deque(
+                    j for j in self.pending if j.kind not in SUPERSEDED_KINDS
+                )
+                self.coalesced += len(self.pending) - len(kept)
+                self.pending = kept
+
+            if self.pending:
+                outcome = coalesce(self.pending[-1], job)
+                if outcome == MERGED:
+                    self.pending[-1].ready_at = now + self.window
+                    self.coalesced += 1
+                    self.condition.notify_all()
+                    return
+                if outcome == CANCELLED:
+                    self.pending.pop()
+                    self.coalesced += 2
+                    self.condition.notify_all()
+                    return
+
+            if job.kind in COALESCIBLE_KINDS:
+                job.ready_at = now + self.window
+            if len(self.pending) >= self.maxsize:
+                raise queue.Full(f"{self.maxsize} commandes déjà en attente")
+            self.pending.append(job)
+            self.condition.notify_all()
+
+    def _work(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                delay = self.pending[0].ready_at - time.monotonic()
+                if delay > 0 and not self.closed:
+                    self.condition.wait(delay)
+                    continue
+                job = self.pending.popleft()
+                self.busy = True
+            try:
+                job.run()
+            except Exception:
+                # Pas de callback d'erreur : on ne tue pas le worker
+                pass
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.busy, timeout
+            )
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+# -----------------------------
+# PIPELINE
+# -----------------------------
+
+
+class CommandPipeline:
+    """
+    Exécute les appels Spotify en arrière-plan, dans l'ordre, par device.
+
+    Chaque device a sa propre file bornée (max_pending). Une pause annule
+    les suivant/précédent/reprise encore en attente sur le même device, et
+    les commandes compatibles arrivées dans la fenêtre window sont fusionnées
+    (volumes additionnés, sauts cumulés, pause + reprise annulées).
+    """
+
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        window: float = DEFAULT_COALESCE_WINDOW
+    ):
+        self.max_pending = max_pending
+        self.window = window
+        self._lanes: Dict[Optional[str], _DeviceLane] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, device: Optional[str]) -> _DeviceLane:
+        with self._lock:
+            lane = self._lanes.get(device)
+            if lane is None:
+                lane = _DeviceLane(f"gigi-spotify-{device or 'default'}",
+                                   self.max_pending, self.window)
+                self._lanes[device] = lane
+            return lane
+
+    def submit(self, job: SpotifyJob) -> None:
+        """
+        Ajoute une tâche dans la file de son device.
+
+        Raises:
+            queue.Full: si la file du device est pleine.
+        """
+        self._lane(job.device).put(job)
+
+    def pending(self) -> int:
+        """Nombre de tâches en attente, tous devices confondus."""
+        with self._lock:
+            lanes = list(self._lanes.values())
+        return sum(len(lane.pending) for lane in lanes)
+
+    def coalesced(self) -> int:
+        """Nombre de commandes économisées par fusion ou annulation."""
+        with self._lock:
+            lanes = list(self._lanes.values())
+        return sum(lane.coalesced for lane in lanes)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Attend que toutes les files soient vides. Retourne False si timeout."""
+        with self._lock:
+            lanes = list(self._lanes.values())
+        return all(lane.join(timeout) for lane in lanes)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Laisse les files se vider puis arrête les threads."""
+        self.join(timeout)
+        with self._lock:
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for lane in lanes:
+            lane.close()
@@ -0,0 +1,17 @@
+"""
+conftest.py
+Configuration commune des tests : spotify_controller lit sa configuration
+à l'import. Des valeurs factices permettent de l'importer hors ligne, sans
+toucher aux caches de recherche et de bibliothèque de l'utilisateur.
+"""
+
+import os
+
+for name, value in {
+    "CLIENT_ID": "test",
+    "CLIENT_SECRET": "test",
+    "REDIRECT_URI": "http://127.0.0.1:8888/callback",
+    "SEARCH_CACHE_PATH": "",
+    "LIBRARY_INDEX_PATH": "",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,314 @@
+"""
+fake_spotify_server.py
+Serveur local imitant le sous-ensemble de l'API Web Spotify utilisé par
+spotify_controller.py, pour les tests de charge et le profilage hors ligne.
+
+Usage :
+    python fake_spotify_server.py --port 8765 --latency-ms 30 --error-rate 0.01
+    SPOTIFY_API_URL=http://127.0.0.1:8765/v1/ python command.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+DEFAULT_DEVICES = ["Raspo", "Olympe"]
+DEFAULT_PORT = 8765
+
+# -----------------------------
+# ÉTAT DU LECTEUR SIMULÉ
+# -----------------------------
+
+
+class FakeSpotifyBackend:
+    """
+    État du lecteur simulé et comportement réseau configurable.
+
+    Args:
+        devices: Noms des devices Spotify Connect exposés.
+        latency: Latence ajoutée à chaque requête (secondes).
+        jitter: Variation aléatoire maximale ajoutée à la latence (secondes).
+        error_rate: Probabilité de répondre 500.
+        rate_limit_rate: Probabilité de répondre 429 avec Retry-After.
+        retry_after: Valeur de l'en-tête Retry-After (secondes).
+    """
+
+    def __init__(
+        self,
+        devices: Optional[List[str]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: Optional[int] = None
+    ):
+        self.devices = {
+            f"device-{i}": name
+            for i, name in enumerate(devices or DEFAULT_DEVICES)
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()  # "METHOD path" et "HTTP <status>"
+        self.requests = 0
+        self.state = {
+            "device_id": next(iter(self.devices)),
+            "is_playing": False,
+            "volume_percent": 50,
+            "shuffle_state": False,
+            "repeat_state": "off",
+            "track_uri": None,
+            "position": 0,
+        }
+
+    # --- Perturbations réseau ---
+
+    def perturb(self) -> Optional[Tuple[int, dict, Dict[str, str]]]:
+        """Applique latence et erreurs simulées ; retourne une réponse d'erreur ou None."""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429, _error(429, "API rate limit exceeded"), {
+                "Retry-After": str(self.retry_after)
+            }
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500, _error(500, "Server error"), {}
+        return None
+
+    def record(self, method: str, path: str, status: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.stats[f"{method} {path}"] += 1
+            if status >= 400:
+                self.stats[f"HTTP {status}"] += 1
+
+    # --- Endpoints ---
+
+    def _check_device(self, device_id: Optional[str]) -> Optional[tuple]:
+        if device_id is None:
+            return None
+        if device_id not in self.devices:
+            return 404, _error(404, "Device not found"), {}
+        self.state["device_id"] = device_id
+        return None
+
+    def handle(self, method: str, path: str, query: Dict[str, str],
+               body: dict) -> Tuple[int, Optional[dict], Dict[str, str]]:
+        with self._lock:
+            device_error = self._check_device(query.get("device_id"))
+            if device_error:
+                return device_error
+
+            state = self.state
+            if method == "GET" and path == "me/player/devices":
+                return 200, {"devices": self._devices_payload()}, {}
+
+            if method == "GET" and path == "me/player":
+                return 200, self._playback_payload(), {}
+
+            if method == "GET" and path == "search":
+                q = query.get("q", "")
+                limit = int(query.get("limit", 1))
+                items = [
+                    {
+                        # Stable d'un processus à l'autre, contrairement à hash()
+                        "uri": f"spotify:track:{_track_id(q, i)}",
+                        "name": q,
+                    } for i in range(limit)
+                ]
+                return 200, {"tracks": {"items": items}}, {}
+
+            if method == "PUT" and path == "me/player/play":
+                if body.get("uris"):
+                    state["track_uri"] = body["uris"][0]
+                    state["position"] = 0
+                state["is_playing"] = True
+                return 204, None, {}
+
+            if method == "PUT" and path == "me/player/pause":
+                state["is_playing"] = False
+                return 204, None, {}
+
+            if method == "POST" and path in ("me/player/next",
+                                             "me/player/previous"):
+                state["position"] += 1 if path.endswith("next") else -1
+                return 204, None, {}
+
+            if method == "PUT" and path == "me/player/volume":
+                state["volume_percent"] = int(query["volume_percent"])
+                return 204, None, {}
+
+            if method == "PUT" and path == "me/player/shuffle":
+                state["shuffle_state"] = query.get("state") == "true"
+                return 204, None, {}
+
+            if method == "PUT" and path == "me/player/repeat":
+                state["repeat_state"] = query.get("state", "off")
+                return 204, None, {}
+
+        return 404, _error(404, "Service not found"), {}
+
+    def _devices_payload(self) -> List[dict]:
+        return [
+            {
+                "id": device_id,
+                "name": name,
+                "is_active": device_id == self.state["device_id"],
+                "type": "Speaker",
+                "volume_percent": self.state["volume_percent"],
+            } for device_id, name in self.devices.items()
+        ]
+
+    def _playback_payload(self) -> dict:
+        state = self.state
+        device_id = state["device_id"]
+        return {
+            "device": {
+                "id": device_id,
+                "name": self.devices[device_id],
+                "volume_percent": state["volume_percent"],
+            },
+            "is_playing": state["is_playing"],
+            "shuffle_state": state["shuffle_state"],
+            "repeat_state": state["repeat_state"],
+            "item": {"uri": state["track_uri"]} if state["track_uri"] else None,
+        }
+
+
+def _track_id(query: str, rank: int) -> str:
+    return hashlib.blake2b(f"{query}:{rank}".encode(), digest_size=6).hexdigest()
+
+
+def _error(status: int, message: str) -> dict:
+    return {"error": {"status": status, "message": message}}
+
+
+# -----------------------------
+# SERVEUR HTTP
+# -----------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    backend: FakeSpotifyBackend
+    protocol_version = "HTTP/1.1"  # keep-alive, comme l'API réelle
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        path = url.path
+        if path.startswith("/v1/"):
+            path = path[len("/v1/"):]
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+
+        response = self.backend.perturb()
+        if response is None:
+            response = self.backend.handle(method, path, query, body)
+        status, payload, headers = response
+        self.backend.record(method, path, status)
+
+        data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(
+    backend: FakeSpotifyBackend,
+    host: str = "127.0.0.1",
+    port: int = 0
+) -> ThreadingHTTPServer:
+    """
+    Démarre le serveur dans un thread en arrière-plan.
+
+    Returns:
+        ThreadingHTTPServer: Serveur démarré (server.server_address donne le port).
+    """
+    handler = type("FakeSpotifyHandler", (_Handler, ), {"backend": backend})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def api_url(server: ThreadingHTTPServer) -> str:
+    """URL à mettre dans SPOTIFY_API_URL pour pointer le contrôleur ici."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1/"
+
+
+# -----------------------------
+# LANCEMENT MANUEL
+# -----------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Faux serveur API Spotify")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--devices", nargs="+", default=DEFAULT_DEVICES)
+    args = parser.parse_args()
+
+    backend = FakeSpotifyBackend(
+        devices=args.devices,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after
+    )
+    server = start_server(backend, args.host, args.port)
+    print(f"Faux Spotify prêt : SPOTIFY_API_URL={api_url(server)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\nStatistiques :", dict(backend.stats))
@@ -0,0 +1,73 @@
+"""
+french_tokenizer.py
+Tokenizer français léger pour les commandes de Gigi : une seule expression
+régulière compilée, au lieu des dizaines de passes (pensées pour
+l'anglais) de TreebankWordTokenizer.
+
+- Élisions séparées : "l'album" → "l'", "album" ; "s'il" → "s'", "il"
+  (mais "aujourd'hui" reste entier).
+- Apostrophe typographique ’ traitée comme '.
+- Traits d'union, sigles et nombres gardés entiers : "peux-tu", "AC/DC", "2.0".
+- Ponctuation isolée ignorée.
+- Repli des accents optionnel ("santé" → "sante").
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# Mots élidés devant voyelle (forme sans apostrophe)
+ELISIONS = (
+    "jusqu", "lorsqu", "puisqu", "quoiqu", "qu", "c", "d", "j", "l", "m", "n",
+    "s", "t"
+)
+
+_TOKEN_RE = re.compile(
+    r"\b(?P<elision>(?:{})')(?=\w)"  # clitique élidé, suivi d'un mot
+    r"|\w+(?:[-'./]\w+)*".format("|".join(ELISIONS)),  # mot (et ses liaisons)
+    re.IGNORECASE
+)
+
+# -----------------------------
+# TOKENIZER
+# -----------------------------
+
+
+@lru_cache(maxsize=4096)
+def fold_accents(word: str) -> str:
+    """Retire les diacritiques : "précédent" → "precedent"."""
+    decomposed = unicodedata.normalize("NFD", word)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class FrenchTokenizer:
+    """
+    Même interface que les tokenizers NLTK : tokenize(text) -> List[str].
+
+    Args:
+        keep_elisions: Si False, les clitiques élidés ("l'", "qu'") sont
+            omis au lieu d'être rendus comme tokens.
+        fold_accents: Replie les accents de chaque token.
+    """
+
+    def __init__(self, keep_elisions: bool = True, fold_accents: bool = False):
+        self.keep_elisions = keep_elisions
+        self.fold_accents = fold_accents
+
+    def tokenize(self, text: str) -> List[str]:
+        text = text.replace("’", "'")
+        if self.keep_elisions:
+            tokens = [match.group() for match in _TOKEN_RE.finditer(text)]
+        else:
+            tokens = [
+                match.group() for match in _TOKEN_RE.finditer(text)
+                if match.lastgroup is None
+            ]
+        if self.fold_accents:
+            return [fold_accents(token) for token in tokens]
+        return tokens
@@ -0,0 +1,272 @@
+"""
+fuzzy_index.py
+Correspondance approchée des intentions : tolère les fautes de frappe et
+les erreurs de transcription ("jou" → "joue", "suivante piste" → "suivant").
+
+Index inversé de trigrammes de caractères sur le vocabulaire du lexique,
+puis distance de Levenshtein bornée sur les seuls candidats retenus.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from french_tokenizer import FrenchTokenizer, fold_accents
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# Confiance minimale pour accepter une correspondance approchée
+MIN_CONFIDENCE = 0.8
+
+# Similarité d'un mot qui ne diffère que par ses accents ("precedent")
+ACCENT_SIMILARITY = 0.95
+
+# Mots courts : une seule faute peut en faire un autre mot ("jour" → "joue").
+# Correction acceptée, mais sous le seuil de confirmation du dispatcher
+# (command.CONFIRM_CONFIDENCE) : "jou get lucky" est joué après un "oui".
+SHORT_WORD_LENGTH = 4
+SHORT_WORD_SIMILARITY = 0.8
+
+# Pénalité d'une expression retrouvée mot à mot (ordre ou mots outils différents)
+UNORDERED_PENALTY = 0.9
+
+# Même découpage que NLPParser, pour retrouver les mots des expressions
+_tokenizer = FrenchTokenizer(keep_elisions=False)
+
+# -----------------------------
+# DISTANCE D'ÉDITION
+# -----------------------------
+
+
+def levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Distance de Levenshtein si elle est <= max_distance, sinon None.
+
+    Seule une bande de largeur 2 * max_distance + 1 autour de la diagonale
+    est calculée, et le calcul s'arrête dès qu'une ligne dépasse la borne.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            current[j] = value if value < too_far else too_far
+            if current[j] < row_min:
+                row_min = current[j]
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+def max_distance_for(word: str) -> int:
+    """Fautes tolérées selon la longueur : aucune sous 3 lettres."""
+    if len(word) < 3:
+        return 0
+    if len(word) <= 7:
+        return 1
+    return 2
+
+
+def similarity(word: str, match: str, distance: int) -> float:
+    if distance and len(word) <= SHORT_WORD_LENGTH:
+        return SHORT_WORD_SIMILARITY
+    return 1.0 - distance / max(len(word), len(match))
+
+
+# -----------------------------
+# INDEX DE TRIGRAMMES
+# -----------------------------
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Vocabulaire indexé par trigrammes de caractères.
+
+    lookup() ne calcule la distance d'édition que pour les mots partageant
+    assez de trigrammes avec la requête (lemme des q-grammes : une édition
+    détruit au plus 3 trigrammes), ce qui garde la recherche rapide même
+    avec un grand vocabulaire.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words: List[str] = sorted(set(words))
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for position, word in enumerate(self.words):
+            for gram in _trigrams(word):
+                self._postings[gram].append(position)
+        self._exact = frozenset(self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(
+        self,
+        word: str,
+        max_distance: Optional[int] = None
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Mot du vocabulaire le plus proche, avec sa distance.
+
+        À distance égale, le mot le plus court puis l'ordre alphabétique
+        départagent. None si rien n'est à moins de max_distance.
+        """
+        if word in self._exact:
+            return word, 0
+        if max_distance is None:
+            max_distance = max_distance_for(word)
+        if max_distance == 0:
+            return None
+
+        grams = _trigrams(word)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] += 1
+
+        required = max(1, len(grams) - 3 * max_distance)
+        best: Optional[Tuple[int, int, str]] = None
+        for position, count in shared.items():
+            if count < required:
+                continue
+            candidate = self.words[position]
+            bound = max_distance if best is None else min(max_distance, best[0])
+            distance = levenshtein(word, candidate, bound)
+            if distance is None:
+                continue
+            key = (distance, len(candidate), candidate)
+            if best is None or key < best:
+                best = key
+        if best is None:
+            return None
+        return best[2], best[0]
+
+
+# -----------------------------
+# INTENTIONS APPROCHÉES
+# -----------------------------
+
+
+class FuzzyMatch(NamedTuple):
+    action: str
+    confidence: float
+    tokens: Tuple[str, ...]  # tokens de la phrase qui ont servi à l'intention
+
+
+class FuzzyIntentIndex:
+    """
+    Rattrapage des intentions quand la correspondance exacte échoue.
+
+    - Expressions (synonymes_intent) : chaque mot significatif de
+      l'expression doit se retrouver, éventuellement mal orthographié,
+      parmi les tokens de la phrase, dans n'importe quel ordre.
+    - Verbes d'intention : premier token proche d'un verbe connu.
+
+    La confiance vaut la similarité moyenne des mots retrouvés (1 - distance
+    / longueur), pénalisée pour les expressions retrouvées mot à mot.
+    """
+
+    def __init__(
+        self,
+        intent_verbs: Iterable[str],
+        synonymes_intent: Mapping[str, str],
+        stopwords: Iterable[str],
+        min_confidence: float = MIN_CONFIDENCE
+    ):
+        self.intent_verbs = frozenset(intent_verbs)
+        self.stopwords = frozenset(stopwords)
+        self.min_confidence = min_confidence
+
+        # Expression → (mots significatifs, action), et mot → expressions
+        self._phrases: List[Tuple[Tuple[str, ...], str]] = []
+        self._phrases_by_word: Dict[str, List[int]] = defaultdict(list)
+        vocabulary = set(self.intent_verbs)
+        for pattern, action in synonymes_intent.items():
+            words = tuple(
+                word for word in _tokenizer.tokenize(pattern)
+                if word not in self.stopwords
+            )
+            if words:
+                for word in set(words):
+                    self._phrases_by_word[word].append(len(self._phrases))
+                self._phrases.append((words, action))
+                vocabulary.update(words)
+
+        self.index = FuzzyIndex(vocabulary)
+        self._folded = {fold_accents(word): word for word in vocabulary}
+
+    def _correct(self, tokens: List[str]) -> Dict[str, Tuple[str, float]]:
+        """Token de la phrase → (mot du vocabulaire, similarité)."""
+        corrected = {}
+        for token in tokens:
+            if token in corrected or token in self.stopwords:
+                continue
+            word = self._folded.get(fold_accents(token))
+            if word is not None and word != token:
+                # Accents oubliés : pas une vraie faute, même sur un mot court
+                corrected[token] = (word, ACCENT_SIMILARITY)
+                continue
+            found = self.index.lookup(token)
+            if found is not None:
+                word, distance = found
+                corrected[token] = (word, similarity(token, word, distance))
+        return corrected
+
+    def match(self, tokens: List[str]) -> Optional[FuzzyMatch]:
+        corrected = self._correct(tokens)
+        if not corrected:
+            return None
+
+        # Mot du vocabulaire → meilleur (similarité, token d'origine)
+        found: Dict[str, Tuple[float, str]] = {}
+        for token, (word, score) in corrected.items():
+            if word not in found or score > found[word][0]:
+                found[word] = (score, token)
+
+        candidates: Set[int] = set()
+        for word in found:
+            candidates.update(self._phrases_by_word.get(word, ()))
+
+        best: Optional[Tuple[int, float, FuzzyMatch]] = None
+        for position in sorted(candidates):
+            words, action = self._phrases[position]
+            if not all(word in found for word in words):
+                continue
+            scores = [found[word][0] for word in words]
+            confidence = UNORDERED_PENALTY * sum(scores) / len(scores)
+            key = (len(words), confidence)
+            if best is None or key > best[:2]:
+                used = tuple(found[word][1] for word in words)
+                best = (len(words), confidence, FuzzyMatch(action, confidence, used))
+        if best is not None and best[1] >= self.min_confidence:
+            return best[2]
+
+        for token in tokens:
+            if token not in corrected:
+                continue
+            word, score = corrected[token]
+            if word in self.intent_verbs and score >= self.min_confidence:
+                return FuzzyMatch(word, score, (token, ))
+        return None
@@ -0,0 +1,329 @@
+"""
+gigi_daemon.py
+Démon Gigi : garde NLPParser et le client Spotify chauds dans un processus
+long, et reçoit les commandes sur une socket Unix locale. Un script ou un
+hook domotique n'a plus à payer le démarrage de Python, du lexique et de
+spotipy pour envoyer "pause".
+
+Protocole : une requête par ligne, une réponse JSON par ligne.
+    -> pause
+    -> {"id": 3, "text": "mets Santé de Stromae"}
+    <- {"id": 3, "ok": true, "action": "mets", "intent": "joue",
+        "object": "santé stromae", "confidence": 1.0,
+        "replies": ["..."], "elapsed_ms": 84.2}
+Une ligne "stats" renvoie les latences par étape (GIGI_TRACING=1).
+
+Usage :
+    python gigi_daemon.py                       # démon
+    python gigi_daemon.py --send "mets Santé"   # client
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, List, Optional
+
+import tracing
+
+# Le client n'importe rien de plus : parser et contrôleur (spotipy) ne sont
+# chargés que par le démon.
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+
+def _default_socket_path() -> str:
+    """Dossier privé de l'utilisateur ($XDG_RUNTIME_DIR), sinon /tmp/gigi-<uid>."""
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "gigi", "gigi.sock")
+    return os.path.join(
+        tempfile.gettempdir(), f"gigi-{os.getuid()}", "gigi.sock"
+    )
+
+
+SOCKET_PATH = os.getenv("GIGI_SOCKET_PATH") or _default_socket_path()
+
+# Commandes Spotify exécutées en parallèle (les autres attendent leur tour)
+DAEMON_WORKERS = int(os.getenv("GIGI_DAEMON_WORKERS", "8"))
+
+# Taille maximale d'une ligne de requête (octets)
+MAX_LINE = 64 * 1024
+
+# Attente maximale d'une réponse côté client (secondes)
+CLIENT_TIMEOUT = 15.0
+
+# -----------------------------
+# DÉMON
+# -----------------------------
+
+
+class GigiDaemon:
+    """
+    Serveur de commandes sur socket Unix.
+
+    Chaque connexion peut envoyer plusieurs requêtes ; elles sont traitées
+    dans l'ordre, les connexions entre elles en parallèle. L'analyse se
+    fait dans la boucle asyncio (quelques µs), l'exécution des actions
+    Spotify dans un pool de threads car les appels sont bloquants ; les
+    actions locales sont exécutées directement.
+
+    Args:
+        parser: NLPParser partagé (thread-safe).
+        execute: execute_command(parsed, on_reply=...).
+        local_actions: Intentions qui n'appellent pas Spotify.
+        workers: Taille du pool d'exécution.
+    """
+
+    def __init__(
+        self,
+        parser,
+        execute: Callable,
+        local_actions: Collection = (),
+        workers: int = DAEMON_WORKERS
+    ):
+        self.parser = parser
+        self.execute = execute
+        self.local_actions = local_actions
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="gigi-daemon"
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.warmup = None  # Warmup lancé avec le démon, pour "stats"
+        self.path: Optional[str] = None
+        self.clients = 0
+        self.requests = 0
+
+    async def start(self, path: str = SOCKET_PATH) -> None:
+        """
+        Ouvre la socket (accessible au seul utilisateur courant).
+
+        Le dossier est créé en 0700 ; un dossier existant doit appartenir
+        à l'utilisateur. Une socket laissée par un démon arrêté brutalement
+        est remplacée, mais RuntimeError si un démon y répond encore.
+        """
+        directory = os.path.dirname(path) or "."
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        elif os.stat(directory).st_uid != os.getuid():
+            raise PermissionError(
+                f"{directory} appartient à un autre utilisateur"
+            )
+
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f"{path} existe et n'est pas une socket")
+            if _daemon_answers(path):
+                raise RuntimeError(f"un démon Gigi répond déjà sur {path}")
+            os.unlink(path)
+
+        # Socket créée directement en 0600 : pas de fenêtre avant un chmod
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=path, limit=MAX_LINE
+            )
+        finally:
+            os.umask(previous_umask)
+        self.path = path
+
+    async def serve_forever(self, path: str = SOCKET_PATH) -> None:
+        if self._server is None:
+            await self.start(path)
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Ligne plus longue que MAX_LINE : on coupe la connexion
+                    writer.write(
+                        _encode({"ok": False, "error": "requête trop longue"})
+                    )
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(_encode(await self.handle_line(line)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> dict:
+        """Traite une ligne de requête et renvoie la réponse à sérialiser."""
+        started_at = time.perf_counter()
+        self.requests += 1
+        text = line.decode("utf-8", errors="replace").strip()
+        request_id = None
+
+        if text.startswith("{"):
+            try:
+                request = json.loads(text)
+                request_id = request.get("id")
+                text = str(request["text"])
+            except (ValueError, KeyError, AttributeError):
+                return {
+                    "ok": False,
+                    "error": 'JSON invalide : {"text": ...} attendu'
+                }
+
+        if text.lower() == "stats":
+            replies = [tracing.format_stats()]
+            if self.warmup is not None:
+                replies.append(self.warmup.report())
+            response = {"id": request_id, "ok": True, "replies": replies}
+        else:
+            parsed = self.parser.parse_command(text)
+            if parsed.intent in self.local_actions:
+                replies = self._run(parsed)
+            else:
+                loop = asyncio.get_running_loop()
+                replies = await loop.run_in_executor(
+                    self._executor, self._run, parsed
+                )
+            response = dict(
+                parsed.as_dict(), id=request_id, ok=True, replies=replies
+            )
+
+        response["elapsed_ms"] = round(
+            (time.perf_counter() - started_at) * 1000, 3
+        )
+        return response
+
+    def _run(self, parsed) -> List[str]:
+        replies: List[str] = []
+        try:
+            self.execute(parsed, on_reply=replies.append)
+        except Exception as e:
+            replies.append(f"Erreur - {e}")
+        return replies
+
+
+def _encode(response: dict) -> bytes:
+    return (json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _daemon_answers(path: str) -> bool:
+    """True si un processus accepte encore les connexions sur la socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def run_daemon(path: str = SOCKET_PATH) -> None:
+    """Lance le démon jusqu'à SIGINT/SIGTERM."""
+    # Chargés une seule fois pour toute la vie du démon
+    import command
+    from nlp_parser import NLPParser
+    from warmup import WARMUP_MODE, Warmup, default_steps
+
+    parser = NLPParser()
+    daemon = GigiDaemon(parser, command.execute_command, command.LOCAL_ACTIONS)
+
+    # La socket s'ouvre sans attendre : les premières requêtes profitent
+    # des étapes déjà terminées
+    if WARMUP_MODE != "off":
+        daemon.warmup = Warmup(default_steps(parser, command.sp_ctrl))
+        daemon.warmup.start(
+            on_done=lambda warmup: print(warmup.report(), flush=True)
+        )
+
+    async def main() -> None:
+        await daemon.start(path)
+        print(f"Gigi à l'écoute sur {path}", flush=True)
+        serving = asyncio.ensure_future(daemon.serve_forever(path))
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, serving.cancel)
+        await serving
+
+    asyncio.run(main())
+    print("Gigi : démon arrêté.")
+
+
+# -----------------------------
+# CLIENT
+# -----------------------------
+
+
+def send(
+    text: str, path: str = SOCKET_PATH, timeout: float = CLIENT_TIMEOUT
+) -> dict:
+    """Envoie une commande au démon et renvoie sa réponse décodée."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(_encode({"text": text}))
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("le démon Gigi a fermé la connexion")
+    return json.loads(line)
+
+
+# -----------------------------
+# LANCEMENT
+# -----------------------------
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Démon Gigi sur socket Unix")
+    cli.add_argument("--socket", default=SOCKET_PATH)
+    cli.add_argument("--send", metavar="COMMANDE", help="mode client")
+    cli.add_argument("--json", action="store_true", help="réponse brute (client)")
+    args = cli.parse_args()
+
+    if args.send is None:
+        try:
+            run_daemon(args.socket)
+        except (RuntimeError, OSError) as e:
+            print(f"Gigi : démarrage impossible : {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    try:
+        response = send(args.send, args.socket)
+    except OSError as e:
+        print(f"Démon Gigi injoignable sur {args.socket} : {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False))
+    else:
+        for message in response.get("replies", [response.get("error")]):
+            print(f"Gigi : {message}")
+    sys.exit(0 if response.get("ok") else 1)
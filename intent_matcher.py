@@ -0,0 +1,100 @@
+"""
+intent_matcher.py
+Recherche multi-motifs en une seule passe (automate d'Aho-Corasick)
+pour les synonymes d'intentions de l'assistant Gigi.
+"""
+
+from collections import deque
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Sortie d'un nœud : (longueur, -priorité, motif, action)
+_Output = Tuple[int, int, str, str]
+
+
+class IntentMatcher:
+    """
+    Automate compilé une fois à partir d'une table {motif: action}.
+
+    search() parcourt la phrase une seule fois, quel que soit le nombre de
+    motifs. Si plusieurs motifs apparaissent, le plus long gagne ; à
+    longueur égale, le premier motif de la table l'emporte.
+    """
+
+    def __init__(self, patterns: Mapping[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[_Output]] = [None]
+
+        for priority, (pattern, action) in enumerate(patterns.items()):
+            if pattern:
+                self._insert(pattern, action, priority)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return sum(1 for output in self._output if output is not None)
+
+    def _insert(self, pattern: str, action: str, priority: int) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+
+        candidate = (len(pattern), -priority, pattern, action)
+        current = self._output[node]
+        if current is None or candidate[:2] > current[:2]:
+            self._output[node] = candidate
+
+    def _build_links(self) -> None:
+        # Parcours en largeur : le lien d'échec d'un nœud pointe vers le plus
+        # long suffixe propre présent dans l'automate. Chaque nœud hérite de
+        # la meilleure sortie de son lien d'échec, ce qui évite de remonter
+        # la chaîne pendant la recherche.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            inherited = self._output[self._fail[node]]
+            own = self._output[node]
+            if inherited is not None and (own is None or inherited[:2] > own[:2]):
+                self._output[node] = inherited
+
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                queue.append(child)
+
+    def search(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Cherche le meilleur motif contenu dans le texte.
+
+        Args:
+            text (str): Phrase déjà normalisée (minuscules).
+
+        Returns:
+            Optional[Tuple[str, str]]: (motif, action), ou None si aucun motif.
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._output
+
+        node = 0
+        best: Optional[_Output] = None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            output = outputs[node]
+            if output is not None and (best is None or output[:2] > best[:2]):
+                best = output
+
+        if best is None:
+            return None
+        return best[2], best[3]
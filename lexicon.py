@@ -0,0 +1,220 @@
+"""
+lexicon.py
+Lexique de l'assistant Gigi (verbes d'intention, synonymes, salutations,
+stopwords) et artefact précompilé chargé au démarrage sans importer NLTK.
+
+L'artefact lexicon.json est livré avec le code : un premier lancement
+n'a besoin ni de NLTK ni du réseau. Après modification des tables
+ci-dessous, le régénérer (NLTK et ses stopwords requis) :
+    python lexicon.py lexicon.json
+"""
+
+import hashlib
+import json
+import os
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# À incrémenter si le format de l'artefact change
+LEXICON_VERSION = 2
+
+DEFAULT_LEXICON_PATH = os.getenv(
+    "GIGI_LEXICON_PATH", os.path.expanduser("~/.cache/gigi/lexicon.json")
+)
+
+# Artefact livré avec le code, utilisé tant qu'il correspond aux tables
+BUNDLED_LEXICON_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "lexicon.json"
+)
+
+# Liste des verbes d'action de base
+INTENT_VERBS = [
+    "mets",
+    "met",
+    "joue",
+    "jouer",
+    "lance",
+    "balance",
+    "pause",
+    "stop",
+    "reprends",
+    "reprend",
+    # Nouveaux verbes ajoutés ici directement !
+    "augmente",
+    "monte",
+    "baisse",
+    "diminue",
+    "suivant",
+    "précédent",
+    "active",
+    "désactive",
+    "répète"
+]
+
+# Synonymes de commandes textuelles → actions
+SYNONYMES_INTENT = {
+    # Commandes de navigation
+    "musique suivante": "suivant",
+    "piste suivante": "suivant",
+    "piste précédente": "précédent",
+    "titre précédent": "précédent",
+
+    # Modes
+    "active le mode aléatoire": "shuffle_on",
+    "désactive le mode aléatoire": "shuffle_off",
+    "répète la chanson": "repeat_track",
+    "répète l'album": "repeat_context",
+    "arrête la répétition": "repeat_off",
+
+    # Conversation
+    "raconte moi une blague": "blague",
+    "quelle heure est il": "heure",
+    "comment ça va": "humeur"
+}
+
+# Variantes d'un même verbe → action canonique (sinon le verbe lui-même)
+INTENT_CANONIQUE = {
+    "mets": "joue",
+    "met": "joue",
+    "jouer": "joue",
+    "lance": "joue",
+    "balance": "joue",
+    "reprend": "reprends",
+    "augmente": "monte",
+    "diminue": "baisse",
+}
+
+# Liste des salutations
+SALUTATIONS = ["salut", "bonjour", "coucou", "yo", "hello"]
+
+# Stopwords personnalisés (ajoutés aux stopwords français de NLTK)
+CUSTOM_STOPWORDS = [
+    "spotify", "musique", "chanson", "s'il", "te", "plait", "la", "le", "les",
+    "un", "une", "sur", "dans", "de", "to", "peux", "tu"
+]
+
+# -----------------------------
+# LEXIQUE COMPILÉ
+# -----------------------------
+
+
+class Lexicon(NamedTuple):
+    """Lexique figé, prêt à l'emploi par NLPParser."""
+    intent_verbs: frozenset
+    synonymes_intent: Mapping[str, str]
+    salutations: frozenset
+    stopwords: frozenset
+    intent_canonique: Mapping[str, str] = MappingProxyType({})
+
+
+def source_fingerprint() -> str:
+    """Empreinte des tables sources : change dès qu'on édite le lexique."""
+    source = json.dumps(
+        [
+            LEXICON_VERSION, INTENT_VERBS, SYNONYMES_INTENT, SALUTATIONS,
+            CUSTOM_STOPWORDS, INTENT_CANONIQUE
+        ],
+        ensure_ascii=False
+    )
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def _french_stopwords() -> list:
+    # Seul endroit où NLTK est importé : uniquement pour régénérer l'artefact
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+    return stopwords.words('french')
+
+
+def build_lexicon_data() -> dict:
+    """Construit le contenu sérialisable de l'artefact (nécessite NLTK)."""
+    stopwords = set(_french_stopwords()).union(CUSTOM_STOPWORDS)
+    return {
+        "version": LEXICON_VERSION,
+        "fingerprint": source_fingerprint(),
+        "intent_verbs": INTENT_VERBS,
+        "synonymes_intent": SYNONYMES_INTENT,
+        "salutations": SALUTATIONS,
+        "stopwords": sorted(stopwords),
+        "intent_canonique": INTENT_CANONIQUE,
+    }
+
+
+def save_lexicon(data: dict, path: str = DEFAULT_LEXICON_PATH) -> None:
+    """Écrit l'artefact de manière atomique (fichier temporaire + rename)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _read_artifact(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != LEXICON_VERSION:
+        return None
+    if data.get("fingerprint") != source_fingerprint():
+        return None
+    return data
+
+
+def _freeze(data: dict) -> Lexicon:
+    return Lexicon(
+        intent_verbs=frozenset(data["intent_verbs"]),
+        synonymes_intent=MappingProxyType(dict(data["synonymes_intent"])),
+        salutations=frozenset(data["salutations"]),
+        stopwords=frozenset(data["stopwords"]),
+        intent_canonique=MappingProxyType(dict(data["intent_canonique"])),
+    )
+
+
+def load_lexicon(path: str = DEFAULT_LEXICON_PATH) -> Lexicon:
+    """
+    Charge le lexique depuis l'artefact précompilé.
+
+    À défaut d'artefact valide à path, l'artefact livré avec le code est
+    utilisé. Si lui aussi est absent, d'une autre version, ou si les
+    tables sources ont changé depuis sa création, l'artefact est régénéré
+    (avec NLTK) à path.
+
+    Args:
+        path (str): Emplacement de l'artefact JSON.
+
+    Returns:
+        Lexicon: Lexique figé.
+    """
+    data = _read_artifact(path)
+    if data is None and path != BUNDLED_LEXICON_PATH:
+        data = _read_artifact(BUNDLED_LEXICON_PATH)
+    if data is None:
+        data = build_lexicon_data()
+        save_lexicon(data, path)
+    return _freeze(data)
+
+
+# -----------------------------
+# LANCEMENT MANUEL (REGÉNÉRATION)
+# -----------------------------
+
+if __name__ == "__main__":
+    import sys
+
+    output = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LEXICON_PATH
+    save_lexicon(build_lexicon_data(), output)
+    print(f"Lexique v{LEXICON_VERSION} généré : {output}")
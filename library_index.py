@@ -0,0 +1,468 @@
+"""
+library_index.py
+Index plein texte local de la bibliothèque Spotify de l'utilisateur
+(titres likés, playlists, écoutes récentes) : un morceau connu est résolu
+sans aucun appel réseau, et dans la version qu'on écoute vraiment.
+
+Stockage SQLite FTS5, insensible à la casse et aux accents
+("sante stromae" trouve "Santé - Stromae"), synchronisé de façon
+incrémentale en arrière-plan.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+DEFAULT_LIBRARY_PATH = os.path.expanduser(
+    "~/.config/spotify_cache/library.sqlite3"
+)
+DEFAULT_SYNC_INTERVAL = 3600.0
+SYNC_RETRY_INTERVAL = 300.0
+
+# Écoutes récentes gardées dans l'index (les plus récentes d'abord)
+RECENT_LIMIT = 500
+
+# Poids bm25 des colonnes : le titre compte plus que l'artiste, puis l'album
+_RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+SOURCE_SAVED = "saved"
+_SAVED_TOTAL = "saved:total"  # nombre de likés annoncé par l'API à la dernière synchro
+SOURCE_RECENT = "recent"
+_PLAYLIST_PREFIX = "playlist:"
+
+_WORD_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    uri TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    artists TEXT NOT NULL,
+    album TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS library_fts USING fts5(
+    name, artists, album,
+    content='tracks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tracks_ai AFTER INSERT ON tracks BEGIN
+    INSERT INTO library_fts(rowid, name, artists, album)
+    VALUES (new.id, new.name, new.artists, new.album);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_ad AFTER DELETE ON tracks BEGIN
+    INSERT INTO library_fts(library_fts, rowid, name, artists, album)
+    VALUES ('delete', old.id, old.name, old.artists, old.album);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_au AFTER UPDATE ON tracks BEGIN
+    INSERT INTO library_fts(library_fts, rowid, name, artists, album)
+    VALUES ('delete', old.id, old.name, old.artists, old.album);
+    INSERT INTO library_fts(rowid, name, artists, album)
+    VALUES (new.id, new.name, new.artists, new.album);
+END;
+CREATE TABLE IF NOT EXISTS memberships (
+    uri TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (uri, source)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Appel d'une méthode spotipy : func(*args, **kwargs) par défaut, ou passage
+# par l'ordonnanceur du contrôleur
+ApiCall = Callable[..., Any]
+
+
+def _direct_call(func: Callable, *args, **kwargs) -> Any:
+    return func(*args, **kwargs)
+
+
+def _match_query(query: str) -> Optional[str]:
+    """Requête FTS5 : tous les mots, chacun entre guillemets (pas de syntaxe)."""
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _track_row(track: Optional[Dict]) -> Optional[tuple]:
+    """(uri, titre, artistes, album) d'un objet track Spotify, None si injouable."""
+    if not track or track.get("type", "track") != "track" or track.get("is_local"):
+        return None
+    if not track.get("uri"):
+        return None
+    artists = ", ".join(artist["name"] for artist in track.get("artists", []))
+    album = (track.get("album") or {}).get("name", "")
+    return track["uri"], track.get("name", ""), artists, album
+
+
+# -----------------------------
+# INDEX LOCAL
+# -----------------------------
+
+
+class LibraryIndex:
+    """
+    Morceaux de la bibliothèque, indexés en plein texte.
+
+    Chaque morceau est rattaché à une ou plusieurs sources (titres likés,
+    une playlist, écoutes récentes) ; il quitte l'index quand plus aucune
+    source ne le contient.
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_LIBRARY_PATH, recent_limit: int = RECENT_LIMIT
+    ):
+        self.path = path
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    # --- Recherche ---
+
+    def lookup(self, query: str) -> Optional[str]:
+        """URI du morceau contenant tous les mots de la requête, ou None."""
+        match = _match_query(query)
+        if match is None:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT tracks.uri FROM library_fts"
+                " JOIN tracks ON tracks.id = library_fts.rowid"
+                " WHERE library_fts MATCH ?"
+                " ORDER BY bm25(library_fts, ?, ?, ?) LIMIT 1",
+                (match, *_RANK_WEIGHTS)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM tracks"
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        size = len(self)
+        with self._lock:
+            return {"tracks": size, "hits": self.hits, "misses": self.misses}
+
+    # --- Écriture ---
+
+    def add_tracks(
+        self,
+        source: str,
+        tracks: Iterable[Optional[Dict]],
+        refresh: bool = False
+    ) -> int:
+        """
+        Ajoute (ou met à jour) des morceaux dans une source ; retourne le
+        nombre ajouté. refresh=True replace les morceaux déjà présents en
+        tête de la source (voir trim_source).
+        """
+        rows = [row for row in map(_track_row, tracks) if row is not None]
+        with self._lock:
+            db = self._connect()
+            db.executemany(
+                "INSERT INTO tracks (uri, name, artists, album) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(uri) DO UPDATE SET"
+                " name = excluded.name, artists = excluded.artists,"
+                " album = excluded.album"
+                " WHERE name != excluded.name OR artists != excluded.artists"
+                " OR album != excluded.album", rows
+            )
+            db.executemany(
+                f"INSERT OR {'REPLACE' if refresh else 'IGNORE'}"
+                " INTO memberships (uri, source) VALUES (?, ?)",
+                [(row[0], source) for row in rows]
+            )
+            db.commit()
+        return len(rows)
+
+    def drop_source(self, source: str) -> None:
+        """Retire une source et les morceaux qui n'appartiennent plus à rien."""
+        with self._lock:
+            db = self._connect()
+            db.execute("DELETE FROM memberships WHERE source = ?", (source, ))
+            db.execute(
+                "DELETE FROM tracks WHERE uri NOT IN"
+                " (SELECT uri FROM memberships)"
+            )
+            db.commit()
+
+    def prune_source(self, source: str, keep: Iterable[str]) -> int:
+        """Retire de la source les morceaux absents de keep ; retourne leur nombre."""
+        keep = set(keep)
+        with self._lock:
+            db = self._connect()
+            stale = [
+                (uri, source) for (uri, ) in db.execute(
+                    "SELECT uri FROM memberships WHERE source = ?", (source, )
+                ) if uri not in keep
+            ]
+            if stale:
+                db.executemany(
+                    "DELETE FROM memberships WHERE uri = ? AND source = ?", stale
+                )
+                db.execute(
+                    "DELETE FROM tracks WHERE uri NOT IN"
+                    " (SELECT uri FROM memberships)"
+                )
+                db.commit()
+        return len(stale)
+
+    def trim_source(self, source: str, keep: int) -> int:
+        """
+        Ne garde que les keep derniers morceaux ajoutés à la source ;
+        retourne le nombre retiré.
+        """
+        with self._lock:
+            db = self._connect()
+            removed = db.execute(
+                "DELETE FROM memberships WHERE source = ? AND rowid NOT IN"
+                " (SELECT rowid FROM memberships WHERE source = ?"
+                " ORDER BY rowid DESC LIMIT ?)", (source, source, keep)
+            ).rowcount
+            if removed:
+                db.execute(
+                    "DELETE FROM tracks WHERE uri NOT IN"
+                    " (SELECT uri FROM memberships)"
+                )
+            db.commit()
+        return removed
+
+    def sources(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT DISTINCT source FROM memberships WHERE source LIKE ?",
+                (f"{prefix}%", )
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key, )
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                (key, value)
+            )
+            db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # --- Synchronisation incrémentale ---
+
+    def sync(self, sp, call: ApiCall = _direct_call) -> Dict[str, int]:
+        """
+        Met l'index à jour depuis Spotify sans tout retélécharger.
+
+        - Titres likés : pages les plus récentes d'abord, arrêt au premier
+          titre déjà vu (added_at). Si le total annoncé par l'API ne
+          correspond plus (titre retiré des likés), toute la liste est
+          relue et les titres absents quittent l'index.
+        - Playlists : seules celles dont le snapshot_id a changé sont
+          relues ; les playlists supprimées quittent l'index.
+        - Écoutes récentes : curseur "after" de l'API ; seules les
+          recent_limit dernières restent dans l'index.
+
+        Args:
+            sp: Client spotipy.
+            call: Exécute func(*args, **kwargs) ; permet de passer par
+                l'ordonnanceur du contrôleur.
+
+        Returns:
+            dict: Nombre de morceaux reçus par type de source.
+        """
+        return {
+            SOURCE_SAVED: self._sync_saved(sp, call),
+            "playlists": self._sync_playlists(sp, call),
+            SOURCE_RECENT: self._sync_recent(sp, call),
+        }
+
+    def _sync_saved(self, sp, call: ApiCall) -> int:
+        last_seen = self.get_state(SOURCE_SAVED) or ""
+        known_total = self.get_state(_SAVED_TOTAL)
+        newest, added, offset, fresh_count, total = last_seen, 0, 0, 0, None
+        while True:
+            page = call(sp.current_user_saved_tracks, limit=50, offset=offset)
+            items = page.get("items", [])
+            if total is None:
+                total = page.get("total")
+            fresh = [item for item in items if item.get("added_at", "") > last_seen]
+            fresh_count += len(fresh)
+            added += self.add_tracks(SOURCE_SAVED, (item.get("track") for item in fresh))
+            newest = max([newest] + [item["added_at"] for item in fresh])
+            if len(fresh) < len(items) or not page.get("next"):
+                break
+            offset += len(items)
+        if newest != last_seen:
+            self.set_state(SOURCE_SAVED, newest)
+
+        # Un titre retiré des likés n'apparaît dans aucune page : seul le
+        # total le trahit (première synchro exclue, elle a déjà tout lu)
+        if last_seen and total is not None and (
+            known_total is None or int(known_total) + fresh_count != total
+        ):
+            total = self._resync_saved(sp, call)
+        if total is not None:
+            self.set_state(_SAVED_TOTAL, str(total))
+        return added
+
+    def _resync_saved(self, sp, call: ApiCall) -> Optional[int]:
+        """Relit tous les likés et retire de l'index ceux qui n'y sont plus."""
+        tracks, offset, total = [], 0, None
+        while True:
+            page = call(sp.current_user_saved_tracks, limit=50, offset=offset)
+            items = page.get("items", [])
+            if total is None:
+                total = page.get("total")
+            tracks.extend(item.get("track") for item in items)
+            if not page.get("next"):
+                break
+            offset += len(items)
+        self.add_tracks(SOURCE_SAVED, tracks)
+        self.prune_source(
+            SOURCE_SAVED,
+            (track["uri"] for track in tracks if track and track.get("uri"))
+        )
+        return total
+
+    def _sync_playlists(self, sp, call: ApiCall) -> int:
+        listed = set()
+        added, offset = 0, 0
+        while True:
+            page = call(sp.current_user_playlists, limit=50, offset=offset)
+            for playlist in page.get("items", []):
+                source = f"{_PLAYLIST_PREFIX}{playlist['id']}"
+                listed.add(source)
+                snapshot = playlist.get("snapshot_id") or ""
+                if self.get_state(source) == snapshot:
+                    continue
+                tracks = self._playlist_tracks(sp, call, playlist["id"])
+                self.drop_source(source)
+                added += self.add_tracks(source, tracks)
+                self.set_state(source, snapshot)
+            if not page.get("next"):
+                break
+            offset += len(page.get("items", []))
+
+        for source in set(self.sources(_PLAYLIST_PREFIX)) - listed:
+            self.drop_source(source)
+        return added
+
+    def _playlist_tracks(self, sp, call: ApiCall, playlist_id: str) -> List[Dict]:
+        tracks, offset = [], 0
+        while True:
+            page = call(
+                sp.playlist_items,
+                playlist_id,
+                limit=100,
+                offset=offset,
+                additional_types=("track", )
+            )
+            items = page.get("items", [])
+            tracks.extend(item.get("track") for item in items)
+            if not page.get("next"):
+                return tracks
+            offset += len(items)
+
+    def _sync_recent(self, sp, call: ApiCall) -> int:
+        after = self.get_state(SOURCE_RECENT)
+        page = call(
+            sp.current_user_recently_played,
+            limit=50,
+            after=int(after) if after else None
+        )
+        # Du plus ancien au plus récent : une écoute répétée repasse en tête
+        items = page.get("items", [])
+        added = self.add_tracks(
+            SOURCE_RECENT,
+            (item.get("track") for item in reversed(items)),
+            refresh=True
+        )
+        self.trim_source(SOURCE_RECENT, self.recent_limit)
+        cursor = (page.get("cursors") or {}).get("after")
+        if cursor:
+            self.set_state(SOURCE_RECENT, str(cursor))
+        return added
+
+
+# -----------------------------
+# SYNCHRONISATION EN ARRIÈRE-PLAN
+# -----------------------------
+
+
+class LibrarySyncer:
+    """Thread qui appelle sync() au démarrage puis toutes les interval secondes."""
+
+    def __init__(
+        self,
+        sync: Callable[[], Any],
+        interval: float = DEFAULT_SYNC_INTERVAL,
+        retry_interval: float = SYNC_RETRY_INTERVAL
+    ):
+        self.sync = sync
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.syncs = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="gigi-library-sync", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync()
+                self.syncs += 1
+                delay = self.interval
+            except Exception:
+                # Réseau ou droits manquants : on réessaiera plus tard
+                self.failures += 1
+                delay = self.retry_interval
+            self._stop.wait(delay)
@@ -0,0 +1,112 @@
+"""
+load_test.py
+Test de charge hors ligne de spotify_controller.py contre fake_spotify_server.py.
+
+Usage :
+    python load_test.py --commands 2000 --threads 8 --latency-ms 20 --error-rate 0.02
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_spotify_server import FakeSpotifyBackend, api_url, start_server
+
+# -----------------------------
+# SCÉNARIO
+# -----------------------------
+
+SONGS = [
+    "stromae santé", "fade to black metallica", "booba dkr",
+    "paroles paroles", "get lucky daft punk", "angèle balance ton quoi"
+]
+
+
+def _scenario(sp_ctrl):
+    """Mélange de commandes proche d'un usage domestique."""
+    return [
+        (lambda: sp_ctrl.play_song(random.choice(SONGS)), 3),
+        (sp_ctrl.pause_song, 3),
+        (sp_ctrl.resume_song, 2),
+        (sp_ctrl.next_track, 3),
+        (sp_ctrl.previous_track, 1),
+        (lambda: sp_ctrl.change_volume(random.choice([-10, 10])), 3),
+        (lambda: sp_ctrl.shuffle(random.random() < 0.5), 1),
+        (lambda: sp_ctrl.repeat(random.choice(["track", "context", "off"])), 1),
+    ]
+
+
+def run(args) -> int:
+    backend = FakeSpotifyBackend(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    server = start_server(backend)
+
+    # Le contrôleur lit sa configuration à l'import
+    os.environ["SPOTIFY_API_URL"] = api_url(server)
+    os.environ.setdefault("RASPO_DEVICE_NAME", "Raspo")
+    os.environ.setdefault("SEARCH_CACHE_PATH", "")
+    os.environ.setdefault("LIBRARY_INDEX_PATH", "")
+    import spotify_controller as sp_ctrl
+
+    random.seed(args.seed)
+    actions, weights = zip(*_scenario(sp_ctrl))
+    plan = random.choices(actions, weights=weights, k=args.commands)
+
+    latencies = []
+    errors: Counter = Counter()
+
+    def timed(action):
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            errors[type(e).__name__ + " " + str(getattr(e, "http_status", ""))] += 1
+        latencies.append(time.perf_counter() - start)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(timed, plan))
+    elapsed = time.perf_counter() - started_at
+    server.shutdown()
+
+    latencies.sort()
+    print("\n===== TEST DE CHARGE CONTRÔLEUR =====\n")
+    print(f"Commandes       : {args.commands} sur {args.threads} threads")
+    print(f"Débit           : {args.commands / elapsed:.1f} commandes/s")
+    print(f"Latence p50     : {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latence p95     : {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.1f} ms")
+    print(f"Latence p99     : {latencies[int(0.99 * (len(latencies) - 1))] * 1000:.1f} ms")
+    print(f"Erreurs         : {sum(errors.values())} {dict(errors)}")
+    scheduler = sp_ctrl.scheduler_stats()
+    print(
+        f"Ordonnanceur    : {scheduler['throttled']} throttlés, "
+        f"{scheduler['retries']} relances, "
+        f"{scheduler['wait_seconds']:.1f} s d'attente de budget"
+    )
+    print(f"Requêtes HTTP   : {backend.requests}")
+    for endpoint, count in backend.stats.most_common():
+        print(f"  {endpoint:<28} {count}")
+    print("\n=====================================\n")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge hors ligne")
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(run(parser.parse_args()))
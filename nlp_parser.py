@@ -3,123 +3,346 @@ nlp_parser.py
 Librairie NLP pour analyser les commandes textuelles de l'assistant vocal Gigi.
 """
 
-import nltk
-from nltk.tokenize import TreebankWordTokenizer
-from nltk.corpus import stopwords
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# -----------------------------
-# CONFIGURATION & VARIABLES
-# -----------------------------
+import tracing
+from french_tokenizer import FrenchTokenizer
+from fuzzy_index import FuzzyIntentIndex
+from intent_matcher import IntentMatcher
+from lexicon import Lexicon, load_lexicon
+from parsed_command import Action, Intent, ParsedCommand, to_intent
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Nombre de phrases normalisées dont le résultat est gardé en mémoire
+PARSE_CACHE_SIZE = int(os.getenv("GIGI_PARSE_CACHE_SIZE", "512"))
+
+# Tables du lexique : les réassigner recompile les index et vide le cache
+_LEXICON_FIELDS = frozenset(
+    {
+        "intent_verbs", "synonymes_intent", "salutations", "custom_stopwords",
+        "intent_canonique"
+    }
+)
+
+# Classes de token (combinables : un verbe peut aussi être un stopword)
+VERB = 1
+STOPWORD = 2
+SALUTATION = 4
+
+# Token → (classes, action canonique ou None)
+TokenClass = Tuple[int, Optional[Intent]]
+
+# Champs d'un résultat, avant la mesure de durée
+_Fields = Tuple[Optional[str], Optional[Intent], Optional[str], float]
+
+_NOT_UNDERSTOOD: _Fields = (None, None, None, 0.0)
+
+# Parser propre à chaque processus du pool de parse_many
+_worker_parser: Optional["NLPParser"] = None
+
+
+def _init_worker(lexicon_tables: tuple) -> None:
+    global _worker_parser
+    _worker_parser = NLPParser(Lexicon(*lexicon_tables))
+
+
+def _parse_batch_in_worker(phrases: List[str]) -> List[ParsedCommand]:
+    return _worker_parser._parse_batch(phrases)
 
 
 class NLPParser:
     """
     Classe de traitement NLP pour les commandes textuelles de l'assistant Gigi.
+
+    Les résultats sont mémorisés par phrase normalisée (LRU de cache_size
+    entrées, 0 pour désactiver). Réassigner une table du lexique
+    (intent_verbs, synonymes_intent, salutations, custom_stopwords,
+    intent_canonique) recompile les index et vide ce cache.
     """
 
-    def __init__(self):
-        # Liste des verbes d'action de base
-        self.intent_verbs = [
-            "mets",
-            "met",
-            "joue",
-            "jouer",
-            "lance",
-            "balance",
-            "pause",
-            "stop",
-            "reprends",
-            "reprend",
-            # Nouveaux verbes ajoutés ici directement !
-            "augmente",
-            "monte",
-            "baisse",
-            "diminue",
-            "suivant",
-            "précédent",
-            "active",
-            "désactive",
-            "répète"
-        ]
+    def __init__(
+        self,
+        lexicon: Optional[Lexicon] = None,
+        cache_size: int = PARSE_CACHE_SIZE
+    ):
+        # Lexique précompilé (voir lexicon.py) : pas d'import NLTK au démarrage
+        lexicon = lexicon or load_lexicon()
+
+        # Verbes d'action de base
+        self.intent_verbs = lexicon.intent_verbs
+
+        # Synonymes de commandes textuelles → actions (lecture seule : on
+        # réassigne la table entière pour la modifier)
+        self.synonymes_intent = MappingProxyType(dict(lexicon.synonymes_intent))
+
+        # Salutations
+        self.salutations = lexicon.salutations
+
+        # Stopwords français + personnalisés
+        self.custom_stopwords = lexicon.stopwords
+
+        # Variantes de verbes → action canonique ("mets" → "joue")
+        self.intent_canonique = MappingProxyType(dict(lexicon.intent_canonique))
+
+        # Résultats mémorisés : phrase normalisée → résultat en lecture seule
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ParsedCommand]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.lexicon_version = 0
+
+        # Tokenizer français compilé ; les clitiques élidés ("l'", "s'")
+        # sont omis comme des stopwords
+        self.tokenizer = FrenchTokenizer(keep_elisions=False)
+
+        self._compile()
+        self._ready = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _LEXICON_FIELDS and self.__dict__.get("_ready"):
+            self._compile()
 
-        # Synonymes de commandes textuelles → actions
-        self.synonymes_intent = {
-            # Commandes de navigation
-            "musique suivante": "suivant",
-            "piste suivante": "suivant",
-            "piste précédente": "précédent",
-            "titre précédent": "précédent",
-
-            # Modes
-            "active le mode aléatoire": "shuffle_on",
-            "désactive le mode aléatoire": "shuffle_off",
-            "répète la chanson": "repeat_track",
-            "répète l'album": "repeat_context",
-            "arrête la répétition": "repeat_off",
-
-            # Conversation
-            "raconte moi une blague": "blague",
-            "quelle heure est il": "heure",
-            "comment ça va": "humeur"
+    def canonical(self, action: str) -> Intent:
+        """Action canonique (membre de Action) : comparable par identité (is)."""
+        return to_intent(self.intent_canonique.get(action, action))
+
+    def _compile(self) -> None:
+        """(Re)construit les index dérivés du lexique et vide le cache."""
+        # Table unique token → classes : une seule recherche par token
+        classes: Dict[str, TokenClass] = {}
+        for token in self.custom_stopwords:
+            classes[token] = (STOPWORD, None)
+        for token in self.salutations:
+            flags, intent = classes.get(token, (0, None))
+            classes[token] = (flags | SALUTATION, intent)
+        for token in self.intent_verbs:
+            flags, _ = classes.get(token, (0, None))
+            classes[token] = (flags | VERB, self.canonical(token))
+        self.token_classes = classes
+
+        # Actions des expressions, internées une fois
+        self._phrase_intents = {
+            action: self.canonical(action)
+            for action in self.synonymes_intent.values()
         }
 
-        # Liste des salutations
-        self.salutations = ["salut", "bonjour", "coucou", "yo", "hello"]
+        # Automate compilé une fois : une seule passe par phrase
+        self.intent_matcher = IntentMatcher(self.synonymes_intent)
 
-        # Stopwords personnalisés
-        french_stopwords = set(stopwords.words('french'))
-        self.custom_stopwords = french_stopwords.union(
-            {
-                "spotify", "musique", "chanson", "s'il", "te", "plait", "la",
-                "le", "les", "un", "une", "sur", "dans", "de", "to", "peux",
-                "tu"
-            }
+        # Rattrapage des fautes de frappe / de transcription
+        self.fuzzy_index = FuzzyIntentIndex(
+            self.intent_verbs, self.synonymes_intent, self.custom_stopwords
         )
 
-        self.tokenizer = TreebankWordTokenizer()
+        with self._cache_lock:
+            self._cache.clear()
+            self.lexicon_version += 1
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "entries": len(self._cache),
+                "lexicon_version": self.lexicon_version,
+            }
 
-    def parse_command(self, phrase: str) -> dict:
+    def parse_command(self, phrase: str, memoize: bool = True) -> ParsedCommand:
         """
         Analyse une phrase textuelle et retourne l'action et l'objet détectés.
 
         Args:
             phrase (str): La commande utilisateur en texte brut.
+            memoize (bool): False pour ne pas consulter ni remplir le cache
+                (phrases qui ne reviendront pas, ex. transcriptions partielles).
 
         Returns:
-            dict: {'action': str, 'object': str}
+            ParsedCommand: Immuable, partagé via le cache ; se lit aussi comme
+                un dict {'action', 'intent', 'object', 'confidence'}.
+                action est le mot reconnu, intent l'action canonique
+                ("mets" → Action.JOUE). Un résultat sorti du cache garde
+                l'elapsed de sa première analyse.
         """
+        with tracing.span("parse") as span:
+            key = phrase.lower().strip()
+            result = self._cache_get(key) if memoize else None
+            if result is None:
+                version = self.lexicon_version
+                started_at = time.perf_counter()
+                fields = self._parse(key)
+                result = ParsedCommand(
+                    *fields, elapsed=time.perf_counter() - started_at
+                )
+                if memoize:
+                    self._cache_put(key, result, version)
+            span.action = result.action
+        return result
+
+    def _cache_get(self, key: str) -> Optional[ParsedCommand]:
+        if not self.cache_size:
+            return None
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return result
+
+    def _cache_put(self, key: str, result: ParsedCommand, version: int) -> None:
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            if version != self.lexicon_version:
+                # Lexique changé pendant l'analyse : résultat périmé
+                return
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _parse(self, phrase: str) -> _Fields:
         phrase = phrase.lower().strip()
+        classes = self.token_classes
 
-        # Vérification salutation
-        if phrase in self.salutations:
-            return {"action": "salutation", "object": ""}
+        # Vérification salutation (la phrase entière)
+        entry = classes.get(phrase)
+        if entry is not None and entry[0] & SALUTATION:
+            return ("salutation", Action.SALUTATION, "", 1.0)
 
-        # Vérification des synonymes d'intentions
-        for key in self.synonymes_intent:
-            if key in phrase:
-                action = self.synonymes_intent[key]
-                return {"action": action, "object": ""}
+        # Vérification des synonymes d'intentions (le plus long motif gagne)
+        match = self.intent_matcher.search(phrase)
+        if match:
+            return (match[1], self._phrase_intents[match[1]], "", 1.0)
 
         # Tokenisation simple
-        tokens = self.tokenizer.tokenize(phrase)
+        with tracing.span("parse.tokenize"):
+            tokens = self.tokenizer.tokenize(phrase)
 
-        # Recherche de l'action
-        action = next((t for t in tokens if t in self.intent_verbs), None)
+        # Une passe : premier verbe = action, le reste hors stopwords = objet
+        action = intent = None
+        kept = []
+        for token in tokens:
+            entry = classes.get(token)
+            if entry is None:
+                kept.append(token)
+            elif entry[0] & VERB and (action is None or token == action):
+                if action is None:
+                    action, intent = token, entry[1]
+            elif not entry[0] & STOPWORD:
+                kept.append(token)
 
-        if not action:
-            return {"action": None, "object": None}
+        if action is not None:
+            return (action, intent, " ".join(kept), 1.0)
 
-        # Suppression des stopwords et du verbe
+        # Correspondance approchée (fautes, mots dans le désordre)
+        with tracing.span("parse.fuzzy"):
+            fuzzy = self.fuzzy_index.match(tokens)
+        if fuzzy is None:
+            return _NOT_UNDERSTOOD
+        if fuzzy.action not in self.intent_verbs:
+            return (
+                fuzzy.action, self._phrase_intents[fuzzy.action], "",
+                fuzzy.confidence
+            )
+
+        # Suppression des stopwords et des tokens qui ont donné le verbe
         filtered_tokens = [
             token for token in tokens
-            if token not in self.custom_stopwords and token != action
+            if token not in fuzzy.tokens
+            and not classes.get(token, (0, None))[0] & STOPWORD
         ]
+        return (
+            fuzzy.action, classes[fuzzy.action][1], " ".join(filtered_tokens),
+            fuzzy.confidence
+        )
 
-        objet = " ".join(filtered_tokens).strip()
+    def _parse_batch(self, phrases: List[str]) -> List[ParsedCommand]:
+        # Les phrases identiques (après normalisation) d'un même lot ne sont
+        # analysées qu'une fois, même sans cache ; les résultats, en lecture
+        # seule, sont partagés.
+        seen: Dict[str, ParsedCommand] = {}
+        results = []
+        for phrase in phrases:
+            key = phrase.lower().strip()
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.parse_command(key)
+            results.append(result)
+        return results
 
-        return {"action": action, "object": objet}
+    def parse_many(
+        self,
+        phrases: Iterable[str],
+        batch_size: int = 256,
+        workers: int = 0,
+        stats: Optional[dict] = None
+    ) -> Iterator[ParsedCommand]:
+        """
+        Analyse un flux de phrases par lots, dans l'ordre d'entrée.
+
+        Les résultats sont identiques à ceux de parse_command. Le flux est
+        consommé au fil de l'eau, ce qui permet de rejouer des corpus qui ne
+        tiennent pas en mémoire.
+
+        Args:
+            phrases (Iterable[str]): Phrases à analyser.
+            batch_size (int): Nombre de phrases par lot.
+            workers (int): Si > 1, répartit les lots sur un pool de processus.
+            stats (Optional[dict]): Rempli au fil de l'eau avec 'phrases',
+                'elapsed' (s) et 'phrases_per_second'.
+
+        Yields:
+            ParsedCommand: Résultat de parse_command pour chaque phrase.
+        """
+        iterator = iter(phrases)
+        batches = iter(lambda: list(islice(iterator, batch_size)), [])
+        started_at = time.perf_counter()
+        count = 0
+
+        def report(batch: List[ParsedCommand]) -> None:
+            nonlocal count
+            count += len(batch)
+            if stats is not None:
+                elapsed = time.perf_counter() - started_at
+                stats["phrases"] = count
+                stats["elapsed"] = elapsed
+                stats["phrases_per_second"] = count / elapsed if elapsed else 0.0
+
+        if workers <= 1:
+            for batch in batches:
+                results = self._parse_batch(batch)
+                report(results)
+                yield from results
+            return
+
+        lexicon_tables = (
+            self.intent_verbs, dict(self.synonymes_intent), self.salutations,
+            self.custom_stopwords, dict(self.intent_canonique)
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(lexicon_tables, )
+        ) as pool:
+            # Nombre de lots en vol borné pour rester en streaming
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append(pool.submit(_parse_batch_in_worker, batch))
+                if len(in_flight) >= workers * 2:
+                    results = in_flight.popleft().result()
+                    report(results)
+                    yield from results
+            while in_flight:
+                results = in_flight.popleft().result()
+                report(results)
+                yield from results
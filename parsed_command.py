@@ -0,0 +1,156 @@
+"""
+parsed_command.py
+Résultat d'analyse d'une commande : objet compact et immuable, partagé tel
+quel par le cache du parser, les lots de parse_many et execute_command.
+
+ParsedCommand se lit comme un dict en lecture seule ({'action', 'intent',
+'object', 'confidence'}) pour le code existant, et par attributs
+(parsed.intent, parsed.object) sur les chemins chauds.
+"""
+
+import sys
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Iterator, Optional, Union
+
+_setattr = object.__setattr__
+_getattr = object.__getattribute__
+
+# -----------------------------
+# ACTIONS CANONIQUES
+# -----------------------------
+
+
+class Action(str, Enum):
+    """
+    Actions canoniques connues de Gigi.
+
+    Chaque membre est aussi une str égale (et de même hash) que sa valeur :
+    Action.JOUE == "joue", et les deux sont interchangeables comme clés de
+    dictionnaire. Les membres étant uniques, on peut les comparer avec is.
+    """
+
+    SALUTATION = "salutation"
+    JOUE = "joue"
+    PAUSE = "pause"
+    REPRENDS = "reprends"
+    STOP = "stop"
+    MONTE = "monte"
+    BAISSE = "baisse"
+    SUIVANT = "suivant"
+    PRECEDENT = "précédent"
+    SHUFFLE_ON = "shuffle_on"
+    SHUFFLE_OFF = "shuffle_off"
+    REPEAT_TRACK = "repeat_track"
+    REPEAT_CONTEXT = "repeat_context"
+    REPEAT_OFF = "repeat_off"
+    BLAGUE = "blague"
+    HEURE = "heure"
+    HUMEUR = "humeur"
+
+    __hash__ = str.__hash__
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+# Action du lexique sans membre dédié : str internée
+Intent = Union[Action, str]
+
+
+def to_intent(name: str) -> Intent:
+    """Membre de Action pour name, sinon name interné (comparable avec is)."""
+    action = Action._value2member_map_.get(name)
+    return action if action is not None else sys.intern(name)
+
+
+# -----------------------------
+# RÉSULTAT D'ANALYSE
+# -----------------------------
+
+_FIELDS = ("action", "intent", "object", "confidence")
+
+
+class ParsedCommand(Mapping):
+    """
+    Résultat de NLPParser.parse_command.
+
+    Attributs :
+        action: Mot ou expression reconnu ("mets"), None sans action.
+        intent: Action canonique (Action.JOUE), None sans action.
+        object: Objet de la commande ("stromae santé"), None sans action.
+        confidence: 1.0 pour une correspondance exacte, moins pour une
+            correspondance approchée, 0.0 sans action.
+        elapsed: Durée de l'analyse (s). Hors de la vue dict : deux résultats
+            de même contenu sont égaux, qu'ils sortent du cache ou non.
+    """
+
+    __slots__ = _FIELDS + ("elapsed", )
+
+    def __init__(
+        self,
+        action: Optional[str],
+        intent: Optional[Intent],
+        object: Optional[str],
+        confidence: float,
+        elapsed: float = 0.0
+    ):
+        _setattr(self, "action", action)
+        _setattr(self, "intent", intent)
+        _setattr(self, "object", object)
+        _setattr(self, "confidence", confidence)
+        _setattr(self, "elapsed", elapsed)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ParsedCommand est immuable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("ParsedCommand est immuable")
+
+    @classmethod
+    def from_mapping(cls, parsed: Mapping) -> "ParsedCommand":
+        """Depuis un ancien dict {'action', 'object'} ; intent déduit de action."""
+        if isinstance(parsed, cls):
+            return parsed
+        action = parsed.get("action")
+        intent = parsed.get("intent") or action
+        return cls(
+            action,
+            to_intent(intent) if intent else None,
+            parsed.get("object"),
+            parsed.get("confidence", 1.0 if action else 0.0)
+        )
+
+    def __reduce__(self):
+        # Les slots immuables ne passent pas par le pickle par défaut
+        return (
+            ParsedCommand,
+            (self.action, self.intent, self.object, self.confidence, self.elapsed)
+        )
+
+    # Vue dict (lecture seule)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            return _getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def as_dict(self) -> dict:
+        """Copie modifiable, sérialisable en JSON (intent en str)."""
+        return {
+            "action": self.action,
+            "intent": None if self.intent is None else str(self.intent),
+            "object": self.object,
+            "confidence": self.confidence,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ParsedCommand(action={self.action!r}, intent={self.intent!r}, "
+            f"object={self.object!r}, confidence={self.confidence!r})"
+        )
@@ -0,0 +1,180 @@
+"""
+playback_state.py
+État de lecture Spotify maintenu localement (volume, device, shuffle/repeat,
+morceau en cours) : mis à jour de façon optimiste après chaque commande et
+resynchronisé par un polling adaptatif.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+POLL_MIN_INTERVAL = float(os.getenv("PLAYBACK_POLL_MIN", "5"))
+POLL_MAX_INTERVAL = float(os.getenv("PLAYBACK_POLL_MAX", "60"))
+
+# -----------------------------
+# ÉTAT DE LECTURE
+# -----------------------------
+
+# Champs modifiables par update() (volume est rangé par device à part)
+_UPDATABLE_FIELDS = frozenset(
+    {"device_name", "is_playing", "shuffle", "repeat", "track_uri"}
+)
+
+
+class PlaybackState:
+    """
+    Dernier état de lecture connu, partagé entre threads.
+
+    Les volumes sont gardés par device id : la liste des devices les
+    fournit gratuitement, ce qui évite un current_playback() pour les
+    commandes relatives ("monte le son").
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.device_id: Optional[str] = None
+        self.device_name: Optional[str] = None
+        self.is_playing: Optional[bool] = None
+        self.shuffle: Optional[bool] = None
+        self.repeat: Optional[str] = None
+        self.track_uri: Optional[str] = None
+        self.volumes: Dict[str, int] = {}
+        self.updated_at = 0.0
+
+    def volume(self, device_id: str) -> Optional[int]:
+        with self._lock:
+            return self.volumes.get(device_id)
+
+    def update(self, device_id: Optional[str] = None, **fields) -> None:
+        """
+        Mise à jour optimiste après une commande réussie.
+
+        Sans device_id, volume s'applique au device courant (ignoré s'il
+        est inconnu). Un autre champ que ceux de l'état lève TypeError.
+
+        Exemple : state.update(device_id, is_playing=False)
+        """
+        unknown = fields.keys() - _UPDATABLE_FIELDS - {"volume"}
+        if unknown:
+            raise TypeError(f"champs d'état inconnus : {sorted(unknown)}")
+        with self._lock:
+            if device_id is not None:
+                self.device_id = device_id
+            if "volume" in fields:
+                volume = fields.pop("volume")
+                if self.device_id is not None:
+                    self.volumes[self.device_id] = volume
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.updated_at = time.time()
+
+    def update_from_devices(self, devices: List[Dict]) -> None:
+        """Récupère les volumes (et le device actif) depuis sp.devices()."""
+        with self._lock:
+            for device in devices:
+                if device.get("volume_percent") is not None:
+                    self.volumes[device["id"]] = device["volume_percent"]
+                if device.get("is_active"):
+                    self.device_id = device["id"]
+                    self.device_name = device["name"]
+            self.updated_at = time.time()
+
+    def update_from_playback(self, playback: Optional[Dict]) -> None:
+        """Resynchronise depuis sp.current_playback() (None = rien ne joue)."""
+        with self._lock:
+            if not playback:
+                self.is_playing = False
+            else:
+                device = playback.get("device") or {}
+                if device.get("id"):
+                    self.device_id = device["id"]
+                    self.device_name = device.get("name")
+                    if device.get("volume_percent") is not None:
+                        self.volumes[device["id"]] = device["volume_percent"]
+                self.is_playing = playback.get("is_playing")
+                self.shuffle = playback.get("shuffle_state")
+                self.repeat = playback.get("repeat_state")
+                item = playback.get("item") or {}
+                self.track_uri = item.get("uri")
+            self.updated_at = time.time()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "device_id": self.device_id,
+                "device_name": self.device_name,
+                "is_playing": self.is_playing,
+                "shuffle": self.shuffle,
+                "repeat": self.repeat,
+                "track_uri": self.track_uri,
+                "volume": self.volumes.get(self.device_id),
+                "updated_at": self.updated_at,
+            }
+
+
+# -----------------------------
+# POLLING ADAPTATIF
+# -----------------------------
+
+
+class PlaybackPoller:
+    """
+    Resynchronise l'état en arrière-plan.
+
+    L'intervalle repart au minimum après chaque commande (touch()) puis
+    double à chaque poll jusqu'au maximum quand l'utilisateur ne fait rien.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], None],
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL
+    ):
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="gigi-playback-poller", daemon=True
+            )
+            self._thread.start()
+
+    def touch(self) -> None:
+        """Signale une activité : prochain poll au bout de min_interval."""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._wake.wait(self.interval):
+                # Activité : on repart pour un intervalle minimal complet
+                self._wake.clear()
+                continue
+            if self._stop.is_set():
+                return
+            try:
+                self.fetch()
+            except Exception:
+                # Réseau indisponible : on réessaiera au prochain intervalle
+                pass
+            self.interval = min(self.interval * 2, self.max_interval)
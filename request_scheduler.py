@@ -0,0 +1,315 @@
+"""
+request_scheduler.py
+Ordonnanceur central des requêtes vers l'API Spotify : budget en seau à
+jetons, respect de Retry-After, backoff avec jitter pour les appels
+idempotents et files de priorité (pause/stop avant les recherches).
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from spotipy.exceptions import SpotifyException
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+PRIORITY_HIGH = 0  # pause, stop : doivent doubler tout le reste
+PRIORITY_NORMAL = 1  # commandes de lecture
+PRIORITY_LOW = 2  # recherches, polling d'état
+
+DEFAULT_RATE = float(os.getenv("SPOTIFY_RATE_LIMIT", "10"))  # requêtes/s
+DEFAULT_BURST = int(os.getenv("SPOTIFY_RATE_BURST", "20"))
+DEFAULT_WORKERS = int(os.getenv("SPOTIFY_SCHEDULER_WORKERS", "4"))
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_BACKOFF = 0.5
+MAX_RETRY_AFTER = 60.0
+
+# -----------------------------
+# SEAU À JETONS
+# -----------------------------
+
+
+class TokenBucket:
+    """Budget de rate requêtes/s avec une rafale maximale de capacity."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Prend un jeton ; retourne le temps à attendre avant de s'en servir."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+# -----------------------------
+# ORDONNANCEUR
+# -----------------------------
+
+
+def _retry_after(error: SpotifyException) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("Retry-After")
+    try:
+        return min(float(value), MAX_RETRY_AFTER) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RequestTimeout(TimeoutError):
+    """
+    Budget de temps dépassé. sent indique si la requête était déjà partie
+    vers Spotify : elle peut alors encore prendre effet (une pause tardive).
+    Sinon elle a été annulée et ne sera jamais envoyée.
+    """
+
+    def __init__(self, message: str, sent: bool):
+        super().__init__(message)
+        self.sent = sent
+
+
+class _Request:
+    __slots__ = (
+        "func", "args", "kwargs", "idempotent", "future", "attempt", "abandoned",
+        "sent"
+    )
+
+    def __init__(self, func, args, kwargs, idempotent):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.idempotent = idempotent
+        self.future: Future = Future()
+        self.attempt = 0
+        self.abandoned = False
+        self.sent = False
+
+
+class RequestScheduler:
+    """
+    Toutes les requêtes Spotify passent par ici.
+
+    - Les requêtes attendent dans une file de priorité (HIGH < NORMAL < LOW,
+      FIFO à priorité égale) et sont exécutées par workers threads.
+    - Chaque exécution consomme un jeton du seau (rate/s, rafale burst).
+    - Un 429 suspend tout l'ordonnanceur pendant Retry-After puis rejoue
+      la requête (Spotify ne l'a pas traitée).
+    - Un 5xx ou une erreur réseau n'est rejoué, avec backoff exponentiel
+      et jitter, que si l'appel est idempotent.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        workers: int = DEFAULT_WORKERS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff: float = DEFAULT_BASE_BACKOFF
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+
+        self._queue: List[Tuple[float, int, int, _Request]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._blocked_until = 0.0
+        self._threads: List[threading.Thread] = []
+
+        self.metrics: Dict[str, float] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "throttled": 0,
+            "retries": 0,
+            "abandoned": 0,
+            "wait_seconds": 0.0,
+        }
+
+    # --- Cycle de vie ---
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"gigi-scheduler-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    # --- API ---
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        priority: int = PRIORITY_NORMAL,
+        idempotent: bool = False,
+        **kwargs
+    ) -> Future:
+        return self._enqueue(func, args, kwargs, priority, idempotent).future
+
+    def call(
+        self,
+        func: Callable,
+        *args,
+        priority: int = PRIORITY_NORMAL,
+        idempotent: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Comme submit() mais attend le résultat (ou relève l'exception).
+
+        Au-delà de timeout secondes (attente en file et relances comprises)
+        lève RequestTimeout : la requête est annulée si elle n'a pas encore
+        été envoyée (sent=False), sinon sa réponse sera ignorée.
+        """
+        request = self._enqueue(func, args, kwargs, priority, idempotent)
+        try:
+            return request.future.result(timeout)
+        except FutureTimeout:
+            with self._condition:
+                # Même verrou que _work : envoyée ou annulée, pas les deux
+                request.abandoned = True
+                sent = request.sent
+            raise RequestTimeout(
+                f"pas de réponse de Spotify après {timeout:.1f} s", sent
+            ) from None
+
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, float]:
+        with self._condition:
+            stats = dict(self.metrics)
+            stats["queue_depth"] = len(self._queue)
+            stats["blocked_for"] = max(0.0, self._blocked_until - time.monotonic())
+        return stats
+
+    # --- Interne ---
+
+    def _enqueue(self, func, args, kwargs, priority, idempotent) -> _Request:
+        request = _Request(func, args, kwargs, idempotent)
+        with self._condition:
+            self._ensure_started()
+            self.metrics["submitted"] += 1
+            self._push(request, priority, time.monotonic())
+        return request
+
+    def _push(self, request: _Request, priority: int, not_before: float) -> None:
+        heapq.heappush(
+            self._queue, (priority, next(self._sequence), not_before, request)
+        )
+        self._condition.notify()
+
+    def _next_request(self) -> Tuple[int, _Request]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                ready = [entry for entry in self._queue if entry[2] <= now]
+                if ready and now >= self._blocked_until:
+                    entry = min(ready)
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    return entry[0], entry[3]
+
+                # Prochain réveil : fin du blocage 429 ou prochaine requête prête
+                deadlines = [entry[2] for entry in self._queue]
+                if self._blocked_until > now:
+                    deadlines.append(self._blocked_until)
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                self._condition.wait(timeout)
+
+    def _count(self, name: str, value: float = 1) -> None:
+        with self._condition:
+            self.metrics[name] += value
+
+    def _work(self) -> None:
+        while True:
+            priority, request = self._next_request()
+            if not self._claim(request):
+                continue
+            wait = self.bucket.reserve()
+            if wait:
+                self._count("wait_seconds", wait)
+                time.sleep(wait)
+                # L'appelant a pu abandonner pendant l'attente de budget
+                if not self._claim(request):
+                    continue
+            self._execute(priority, request)
+
+    def _claim(self, request: _Request) -> bool:
+        """Marque la requête envoyée, sauf si l'appelant l'a abandonnée."""
+        with self._condition:
+            if request.abandoned:
+                # L'appelant a dépassé son budget : inutile d'envoyer
+                self.metrics["abandoned"] += 1
+                return False
+            request.sent = True
+            return True
+
+    def _execute(self, priority: int, request: _Request) -> None:
+        try:
+            result = request.func(*request.args, **request.kwargs)
+        except (SpotifyException, requests.exceptions.RequestException) as error:
+            if self._retry(priority, request, error):
+                return
+            self._count("failed")
+            request.future.set_exception(error)
+        except Exception as error:
+            self._count("failed")
+            request.future.set_exception(error)
+        else:
+            self._count("completed")
+            request.future.set_result(result)
+
+    def _retry(self, priority: int, request: _Request, error: Exception) -> bool:
+        """Replanifie la requête si l'erreur le permet ; True si replanifiée."""
+        if request.attempt >= self.max_retries:
+            return False
+
+        now = time.monotonic()
+        status = getattr(error, "http_status", None)
+        if status == 429:
+            delay = _retry_after(error)
+            if delay is None:
+                delay = self.base_backoff * 2**request.attempt
+            with self._condition:
+                self.metrics["throttled"] += 1
+                self._blocked_until = max(self._blocked_until, now + delay)
+            not_before = now
+        elif request.idempotent and (status is None or status >= 500):
+            # 5xx ou erreur réseau : backoff exponentiel avec jitter
+            backoff = self.base_backoff * 2**request.attempt
+            not_before = now + random.uniform(backoff / 2, backoff)
+        else:
+            return False
+
+        request.attempt += 1
+        with self._condition:
+            self.metrics["retries"] += 1
+            self._push(request, priority, not_before)
+        return True
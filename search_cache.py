@@ -0,0 +1,196 @@
+"""
+search_cache.py
+Cache à deux niveaux pour les recherches de morceaux Spotify :
+un LRU borné en mémoire, adossé à un fichier SQLite qui survit aux redémarrages.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+DEFAULT_SEARCH_CACHE_PATH = os.path.expanduser(
+    "~/.config/spotify_cache/search.sqlite3"
+)
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_ENTRIES = 10000
+DEFAULT_TTL = 7 * 24 * 3600  # une semaine
+
+# -----------------------------
+# FONCTIONS UTILITAIRES
+# -----------------------------
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise une requête pour en faire une clé de cache stable.
+
+    "  Joue  Stromae SANTÉ " et "joue stromae santé" donnent la même clé.
+    """
+    query = unicodedata.normalize("NFC", query)
+    return " ".join(query.lower().split())
+
+
+# -----------------------------
+# CACHE DE RECHERCHE
+# -----------------------------
+
+
+class SearchCache:
+    """
+    Cache requête normalisée → URI de morceau.
+
+    Le premier niveau est un LRU en mémoire de taille max_entries, le second
+    une table SQLite (désactivée si path vaut None). Les entrées expirent
+    après ttl secondes dans les deux niveaux.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_SEARCH_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --- Niveau disque ---
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                " query TEXT PRIMARY KEY,"
+                " uri TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        db = self._connect()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT uri, stored_at FROM search_cache WHERE query = ?", (key, )
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[1] > self.ttl:
+            db.execute("DELETE FROM search_cache WHERE query = ?", (key, ))
+            db.commit()
+            self.evictions += 1
+            return None
+        return row[0], row[1]
+
+    def _disk_put(self, key: str, uri: str, stored_at: float) -> None:
+        db = self._connect()
+        if db is None:
+            return
+        db.execute(
+            "INSERT OR REPLACE INTO search_cache (query, uri, stored_at)"
+            " VALUES (?, ?, ?)", (key, uri, stored_at)
+        )
+        count = db.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        if count > self.max_disk_entries:
+            overflow = count - self.max_disk_entries
+            db.execute(
+                "DELETE FROM search_cache WHERE query IN ("
+                " SELECT query FROM search_cache"
+                " ORDER BY stored_at LIMIT ?)", (overflow, )
+            )
+            self.evictions += overflow
+        db.commit()
+
+    # --- Niveau mémoire ---
+
+    def _memory_put(self, key: str, uri: str, stored_at: float) -> None:
+        self._memory[key] = (uri, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # --- API publique ---
+
+    def get(self, query: str) -> Optional[str]:
+        """Retourne l'URI en cache pour la requête, ou None."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+                self.evictions += 1
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._memory_put(key, *entry)
+                self.disk_hits += 1
+                return entry[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, query: str, uri: str) -> None:
+        """Enregistre l'URI trouvée pour la requête dans les deux niveaux."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, uri, now)
+            self._disk_put(key, uri, now)
+
+    def clear(self) -> None:
+        """Vide les deux niveaux (les compteurs sont conservés)."""
+        with self._lock:
+            self._memory.clear()
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM search_cache")
+                db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs de hits/miss/évictions et taille du niveau mémoire."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -3,10 +3,25 @@ spotify_controller.py
 Librairie pour contrôler Spotify Connect depuis l'API Spotify.
 """
 
+import functools
 import os
-from typing import Optional, List, Dict
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
 import spotipy
+from spotipy.exceptions import SpotifyException, SpotifyOauthError
 from spotipy.oauth2 import SpotifyOAuth
+from circuit_breaker import CircuitBreaker
+from library_index import DEFAULT_LIBRARY_PATH, LibraryIndex, LibrarySyncer
+from playback_state import PlaybackPoller, PlaybackState
+from request_scheduler import (
+    PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, RequestScheduler
+)
+from search_cache import DEFAULT_SEARCH_CACHE_PATH, SearchCache
+from token_refresher import AtomicCacheFileHandler, TokenRefresher
+import tracing
 
 # -----------------------------
 # CONFIGURATION & VARIABLES
@@ -17,56 +32,469 @@ CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 REDIRECT_URI = os.getenv("REDIRECT_URI")
 DEFAULT_DEVICE_NAME = os.getenv("RASPO_DEVICE_NAME")
 
-if not CLIENT_ID or not CLIENT_SECRET or not REDIRECT_URI:
+# Backend alternatif (ex : fake_spotify_server.py) : pas d'OAuth dans ce cas
+API_URL = os.getenv("SPOTIFY_API_URL")
+ACCESS_TOKEN = os.getenv("SPOTIFY_ACCESS_TOKEN", "offline")
+
+if not API_URL and (not CLIENT_ID or not CLIENT_SECRET or not REDIRECT_URI):
     raise EnvironmentError(
         "CLIENT_ID, CLIENT_SECRET et REDIRECT_URI doivent être définis dans les variables d'environnement."
     )
 
+# Droits exigés d'un token : un token d'avant l'index de la bibliothèque
+# reste valable, sans nouvelle autorisation
 SCOPE = "user-read-playback-state user-modify-playback-state"
+# Droits demandés en plus à chaque autorisation, pour l'index local de la
+# bibliothèque (library_index.py) : sans eux, pas de synchronisation
+LIBRARY_SCOPE = (
+    "user-library-read playlist-read-private playlist-read-collaborative "
+    "user-read-recently-played"
+)
 DEFAULT_CACHE_PATH = os.path.expanduser("~/.config/spotify_cache/.cache")
+HTTP_POOL_SIZE = int(os.getenv("SPOTIFY_HTTP_POOL_SIZE", "4"))
+DEVICE_CACHE_TTL = float(os.getenv("DEVICE_CACHE_TTL", "300"))
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", DEFAULT_SEARCH_CACHE_PATH)
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+LIBRARY_INDEX_PATH = os.getenv("LIBRARY_INDEX_PATH", DEFAULT_LIBRARY_PATH)
+LIBRARY_SYNC_INTERVAL = float(os.getenv("LIBRARY_SYNC_INTERVAL", "3600"))
+
+# Timeout de chaque requête HTTP, et budget total d'un appel (file
+# d'attente de l'ordonnanceur et relances comprises)
+HTTP_TIMEOUT = float(os.getenv("SPOTIFY_HTTP_TIMEOUT", "3"))
+CALL_BUDGET = float(os.getenv("SPOTIFY_CALL_BUDGET", "8"))
 
 # -----------------------------
 # FONCTIONS PRIVÉES INTERNES
 # -----------------------------
 
 
+def _build_http_session() -> requests.Session:
+    """Session HTTP keep-alive partagée par l'OAuth et l'API Spotify."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class AuthenticationRequired(RuntimeError):
+    """Aucun token utilisable en cache : l'utilisateur doit s'authentifier."""
+
+    def __init__(self):
+        super().__init__(
+            "aucun token Spotify en cache, lancer l'authentification "
+            "(python spotify_controller.py)"
+        )
+
+
+class _TracedSpotifyOAuth(SpotifyOAuth):
+    """
+    SpotifyOAuth dont la lecture/rafraîchissement du token est tracé.
+
+    Demande SCOPE et LIBRARY_SCOPE, mais un token n'a besoin que de SCOPE
+    pour rester valable ; le token en cache garde les droits réellement
+    accordés (spotipy y recopie sinon ceux demandés).
+
+    Hors authenticate() (interactive=False), un token absent lève
+    AuthenticationRequired au lieu d'ouvrir l'autorisation (input()),
+    qui tournerait sinon dans un thread de l'ordonnanceur.
+    """
+
+    def __init__(self, *args, interactive: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interactive = interactive
+
+    def get_access_token(self, code=None, *args, **kwargs):
+        with tracing.span("spotify.token"):
+            if not self.interactive and code is None and self.validate_token(
+                self.cache_handler.get_cached_token()
+            ) is None:
+                raise AuthenticationRequired()
+            return super().get_access_token(code, *args, **kwargs)
+
+    def validate_token(self, token_info):
+        if token_info is None or not self._is_scope_subset(
+            SCOPE, token_info.get("scope")
+        ):
+            return None
+        if self.is_token_expired(token_info):
+            token_info = self.refresh_access_token(token_info["refresh_token"])
+        return token_info
+
+    def _add_custom_values_to_token_info(self, token_info):
+        granted = token_info.get("scope")
+        token_info = super()._add_custom_values_to_token_info(token_info)
+        if granted is not None:
+            token_info["scope"] = granted
+        return token_info
+
+
 def _init_spotify_client(
     cache_path: str = DEFAULT_CACHE_PATH,
-    open_browser: bool = False
+    open_browser: bool = False,
+    session: Optional[requests.Session] = None,
+    interactive: bool = False
 ) -> spotipy.Spotify:
-    auth_manager = SpotifyOAuth(
+    session = session or _build_http_session()
+    if API_URL:
+        sp = spotipy.Spotify(
+            auth=ACCESS_TOKEN,
+            requests_session=session,
+            requests_timeout=HTTP_TIMEOUT
+        )
+        sp.prefix = API_URL
+        return sp
+
+    auth_manager = _TracedSpotifyOAuth(
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         redirect_uri=REDIRECT_URI,
-        scope=SCOPE,
+        scope=f"{SCOPE} {LIBRARY_SCOPE}",
         open_browser=open_browser,
-        cache_path=cache_path
+        cache_handler=AtomicCacheFileHandler(cache_path),
+        requests_session=session,
+        requests_timeout=HTTP_TIMEOUT,
+        interactive=interactive
+    )
+    return spotipy.Spotify(
+        auth_manager=auth_manager,
+        requests_session=session,
+        requests_timeout=HTTP_TIMEOUT
     )
-    return spotipy.Spotify(auth_manager=auth_manager)
+
+
+class _SpotifyClientHolder:
+    """
+    Client Spotify unique pour tout le processus.
+
+    Le client (OAuth + session HTTP keep-alive) est créé au premier appel
+    puis réutilisé par toutes les fonctions publiques. Il n'est recréé
+    qu'après une erreur d'authentification. Un TokenRefresher renouvelle
+    son token en arrière-plan avant expiration.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH):
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._client: Optional[spotipy.Spotify] = None
+        self._refresher: Optional[TokenRefresher] = None
+
+    def get(self) -> spotipy.Spotify:
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                with tracing.span("spotify.client_init"):
+                    self._client = _init_spotify_client(
+                        cache_path=self._cache_path
+                    )
+                if self._client.auth_manager is not None:
+                    self._refresher = TokenRefresher(self._client.auth_manager)
+                    self._refresher.start()
+            return self._client
+
+    def invalidate(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+            refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.stop()
+        if client is not None:
+            client._session.close()
+
+
+_client_holder = _SpotifyClientHolder()
+
+
+def _get_spotify_client() -> spotipy.Spotify:
+    return _client_holder.get()
+
+
+def _is_outage(error: Exception) -> bool:
+    """Panne côté réseau/Spotify (et non requête invalide ou device absent)."""
+    if isinstance(error, (requests.exceptions.RequestException, TimeoutError)):
+        return True
+    return isinstance(error, SpotifyException) and error.http_status >= 500
+
+
+_scheduler = RequestScheduler()
+_breaker = CircuitBreaker("Spotify", is_failure=_is_outage)
+
+# Priorité des requêtes émises par chaque fonction publique
+_PRIORITIES = {
+    "pause_song": PRIORITY_HIGH,
+    "prefetch_track_uri": PRIORITY_LOW,
+    "warm_device_cache": PRIORITY_LOW,
+    "sync_library": PRIORITY_LOW,
+}
+_request_context = threading.local()
+
+
+def _require_token(func: Callable, args: tuple) -> None:
+    """
+    Vérifie (et rafraîchit au besoin) le token sur le thread appelant,
+    avant la mise en file : un thread de l'ordonnanceur ne doit jamais
+    avoir à obtenir un token. AuthenticationRequired s'il n'y en a pas.
+    """
+    for candidate in (getattr(func, "__self__", None), ) + args[:1]:
+        if isinstance(candidate, spotipy.Spotify):
+            auth_manager = candidate.auth_manager
+            break
+    else:
+        return
+    if auth_manager is not None and auth_manager.validate_token(
+        auth_manager.cache_handler.get_cached_token()
+    ) is None:
+        raise AuthenticationRequired()
+
+
+def _scheduled(
+    func: Callable,
+    *args,
+    priority: Optional[int] = None,
+    idempotent: bool = False,
+    **kwargs
+) -> Any:
+    """
+    Passe la requête par le disjoncteur puis l'ordonnanceur (budget,
+    Retry-After, priorités), avec au plus CALL_BUDGET secondes d'attente.
+
+    Sans priorité explicite, on prend celle de la fonction publique en cours.
+    Circuit ouvert : CircuitOpenError immédiate, sans appel réseau.
+    """
+    _require_token(func, args)
+    if priority is None:
+        priority = getattr(_request_context, "priority", PRIORITY_NORMAL)
+    return _breaker.call(
+        _scheduler.call,
+        func,
+        *args,
+        priority=priority,
+        idempotent=idempotent,
+        timeout=CALL_BUDGET,
+        **kwargs
+    )
+
+
+def _is_auth_error(error: Exception) -> bool:
+    if isinstance(error, SpotifyOauthError):
+        return True
+    return isinstance(error, SpotifyException) and error.http_status == 401
+
+
+def _with_auth_retry(func):
+    """
+    Relance une fois l'appel avec un client neuf si le token est refusé.
+    """
+
+    priority = _PRIORITIES.get(func.__name__, PRIORITY_NORMAL)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Priorité rétablie en sortie : un appel suivant sur ce thread (poll,
+        # préchauffage) n'hérite pas de celle de cette fonction
+        previous = getattr(_request_context, "priority", None)
+        _request_context.priority = priority
+        try:
+            with tracing.span("controller", func.__name__):
+                try:
+                    return func(*args, **kwargs)
+                except (SpotifyException, SpotifyOauthError) as error:
+                    if not _is_auth_error(error):
+                        raise
+                    _client_holder.invalidate()
+                    return func(*args, **kwargs)
+        finally:
+            if previous is None:
+                del _request_context.priority
+            else:
+                _request_context.priority = previous
+
+    return wrapper
+
+
+_playback_state = PlaybackState()
 
 
 def _get_devices(sp: spotipy.Spotify) -> List[Dict]:
-    return sp.devices().get("devices", [])
+    with tracing.span("spotify.devices"):
+        devices = _scheduled(sp.devices, idempotent=True).get("devices", [])
+    # La liste des devices donne les volumes sans requête supplémentaire
+    _playback_state.update_from_devices(devices)
+    return devices
+
+
+def _poll_playback() -> None:
+    sp = _get_spotify_client()
+    with tracing.span("spotify.current_playback"):
+        playback = _scheduled(
+            sp.current_playback, priority=PRIORITY_LOW, idempotent=True
+        )
+    _playback_state.update_from_playback(playback)
 
 
-def _find_device_id(devices: List[Dict], device_name: str) -> Optional[str]:
-    for device in devices:
-        if device["name"].lower() == device_name.lower():
-            return device["id"]
-    return None
+_playback_poller = PlaybackPoller(_poll_playback)
 
 
-def _search_track_uri(sp: spotipy.Spotify, song_name: str) -> Optional[str]:
-    results = sp.search(q=song_name, type='track', limit=1)
+def _normalize_device_name(device_name: str) -> str:
+    return device_name.strip().lower()
+
+
+class _DeviceRegistry:
+    """
+    Cache nom normalisé → id des devices Spotify Connect.
+
+    La liste des devices n'est redemandée à Spotify qu'à l'expiration du
+    TTL, quand un nom est inconnu, ou après une erreur "device not found".
+    """
+
+    def __init__(self, ttl: float = DEVICE_CACHE_TTL):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._ids: Dict[str, str] = {}
+        self._expires_at = 0.0
+
+    def refresh(self, sp: spotipy.Spotify) -> None:
+        ids = {
+            _normalize_device_name(device["name"]): device["id"]
+            for device in _get_devices(sp)
+        }
+        with self._lock:
+            self._ids = ids
+            self._expires_at = time.monotonic() + self._ttl
+
+    def resolve(self, sp: spotipy.Spotify, device_name: str) -> Optional[str]:
+        key = _normalize_device_name(device_name)
+        with self._lock:
+            device_id = self._ids.get(key)
+            fresh = time.monotonic() < self._expires_at
+        if device_id and fresh:
+            return device_id
+
+        self.refresh(sp)
+        with self._lock:
+            return self._ids.get(key)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+
+_device_registry = _DeviceRegistry()
+
+
+def _is_device_gone(error: Exception) -> bool:
+    return isinstance(error, SpotifyException) and error.http_status == 404
+
+
+def _resolve_device(sp: spotipy.Spotify, device_name: Optional[str]) -> str:
+    final_device = device_name or DEFAULT_DEVICE_NAME
+    if not final_device:
+        raise ValueError(
+            "Aucun device défini. Spécifiez device_name ou la variable RASPO_DEVICE_NAME."
+        )
+
+    device_id = _device_registry.resolve(sp, final_device)
+    if not device_id:
+        raise ValueError(f"Device '{final_device}' introuvable.")
+    return device_id
+
+
+def _run_on_device(
+    device_name: Optional[str],
+    call: Callable[[spotipy.Spotify, str], Any],
+    idempotent: bool = True,
+    **optimistic
+) -> Any:
+    """
+    Exécute call(sp, device_id) sur le device résolu depuis le cache.
+
+    L'appel passe par l'ordonnanceur ; idempotent autorise sa relance
+    après une erreur 5xx. Si Spotify répond 404 (device disparu ou id
+    périmé), le cache est invalidé et l'appel est rejoué une fois avec la
+    liste à jour. En cas de succès, l'état de lecture local reçoit les
+    champs optimistic.
+    """
+    sp = _get_spotify_client()
+    device_id = _resolve_device(sp, device_name)
+    try:
+        with tracing.span("spotify.playback"):
+            result = _scheduled(call, sp, device_id, idempotent=idempotent)
+    except SpotifyException as error:
+        if not _is_device_gone(error):
+            raise
+        _device_registry.invalidate()
+        device_id = _resolve_device(sp, device_name)
+        with tracing.span("spotify.playback"):
+            result = _scheduled(call, sp, device_id, idempotent=idempotent)
+
+    _playback_state.update(device_id, **optimistic)
+    _playback_poller.start()
+    _playback_poller.touch()
+    if _library_index is not None:
+        _library_syncer.start()
+    return result
+
+
+_search_cache = SearchCache(
+    path=SEARCH_CACHE_PATH or None, max_entries=SEARCH_CACHE_SIZE
+)
+
+
+def _fetch_track_uri(sp: spotipy.Spotify, song_name: str) -> Optional[str]:
+    with tracing.span("spotify.search"):
+        results = _scheduled(
+            sp.search,
+            q=song_name,
+            type='track',
+            limit=1,
+            priority=PRIORITY_LOW,
+            idempotent=True
+        )
     tracks = results.get('tracks', {}).get('items', [])
     return tracks[0]['uri'] if tracks else None
 
 
+# Bibliothèque de l'utilisateur, consultée avant toute recherche distante
+# (désactivée si LIBRARY_INDEX_PATH est vide)
+_library_index = LibraryIndex(LIBRARY_INDEX_PATH) if LIBRARY_INDEX_PATH else None
+
+
+def _library_lookup(song_name: str) -> Optional[str]:
+    if _library_index is None:
+        return None
+    with tracing.span("library.lookup"):
+        return _library_index.lookup(song_name)
+
+
+def _search_track_uri(sp: spotipy.Spotify, song_name: str) -> Optional[str]:
+    uri = _library_lookup(song_name) or _search_cache.get(song_name)
+    if uri:
+        return uri
+
+    uri = _fetch_track_uri(sp, song_name)
+    if uri:
+        _search_cache.put(song_name, uri)
+    return uri
+
+
+def search_cache_stats() -> Dict[str, int]:
+    """Compteurs du cache de recherche (hits mémoire/disque, miss, évictions)."""
+    return _search_cache.stats()
+
+
+def library_stats() -> Dict[str, int]:
+    """Taille de l'index local de la bibliothèque et hits/miss."""
+    return _library_index.stats() if _library_index is not None else {}
+
+
 # -----------------------------
 # API PUBLIQUE
 # -----------------------------
 
 
+@_with_auth_retry
 def play_song(song_name: str, device_name: Optional[str] = None) -> None:
     """
     Joue un morceau Spotify sur un device donné.
@@ -75,26 +503,22 @@ def play_song(song_name: str, device_name: Optional[str] = None) -> None:
         song_name (str): Nom du morceau à lire.
         device_name (Optional[str]): Device cible (défaut : RASPO_DEVICE_NAME).
     """
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-
-    final_device = device_name or DEFAULT_DEVICE_NAME
-    if not final_device:
-        raise ValueError(
-            "Aucun device défini. Spécifiez device_name ou la variable RASPO_DEVICE_NAME."
-        )
-
-    device_id = _find_device_id(devices, final_device)
-    if not device_id:
-        raise ValueError(f"Device '{final_device}' introuvable.")
+    sp = _get_spotify_client()
+    _resolve_device(sp, device_name)
 
     uri = _search_track_uri(sp, song_name)
     if not uri:
         raise ValueError(f"Morceau '{song_name}' introuvable sur Spotify.")
 
-    sp.start_playback(device_id=device_id, uris=[uri])
+    _run_on_device(
+        device_name,
+        lambda sp, device_id: sp.start_playback(device_id=device_id, uris=[uri]),
+        is_playing=True,
+        track_uri=uri
+    )
 
 
+@_with_auth_retry
 def resume_song(device_name: Optional[str] = None) -> None:
     """
     Reprend la lecture Spotify sur le device spécifié.
@@ -102,24 +526,15 @@ def resume_song(device_name: Optional[str] = None) -> None:
     Args:
         device_name (Optional[str]): Device cible (défaut : RASPO_DEVICE_NAME).
     """
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-
-    final_device = device_name or DEFAULT_DEVICE_NAME
-    if not final_device:
-        raise ValueError(
-            "Aucun device défini. Spécifiez device_name ou RASPO_DEVICE_NAME."
-        )
-
-    device_id = _find_device_id(devices, final_device)
-    if not device_id:
-        raise ValueError(f"Device '{final_device}' introuvable.")
-
-    sp.start_playback(
-        device_id=device_id
-    )  # ATTENTION : pas d'URIs ici => relance la lecture courante
+    # ATTENTION : pas d'URIs ici => relance la lecture courante
+    _run_on_device(
+        device_name,
+        lambda sp, device_id: sp.start_playback(device_id=device_id),
+        is_playing=True
+    )
 
 
+@_with_auth_retry
 def pause_song(device_name: Optional[str] = None) -> None:
     """
     Met en pause la lecture sur le device spécifié.
@@ -127,73 +542,229 @@ def pause_song(device_name: Optional[str] = None) -> None:
     Args:
         device_name (Optional[str]): Device cible (défaut : RASPO_DEVICE_NAME).
     """
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
+    _run_on_device(
+        device_name,
+        lambda sp, device_id: sp.pause_playback(device_id=device_id),
+        is_playing=False
+    )
 
-    final_device = device_name or DEFAULT_DEVICE_NAME
-    device_id = _find_device_id(devices, final_device)
-    if not device_id:
-        raise ValueError(f"Device '{final_device}' introuvable pour pause.")
 
-    sp.pause_playback(device_id=device_id)
+def _skip(device_name: Optional[str], skips: int, method: str) -> None:
+    """
+    Saute skips morceaux (method : "next_track" ou "previous_track").
 
+    Les sauts déjà faits sont comptés : si _run_on_device rejoue l'appel
+    après un 404, seuls les sauts restants sont envoyés.
+    """
+    done = 0
 
-def next_track(device_name: Optional[str] = None) -> None:
-    """Passe au morceau suivant."""
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-    device_id = _find_device_id(devices, device_name or DEFAULT_DEVICE_NAME)
-    if not device_id:
-        raise ValueError(f"Device '{device_name}' introuvable.")
-    sp.next_track(device_id=device_id)
+    def call(sp: spotipy.Spotify, device_id: str) -> None:
+        nonlocal done
+        while done < skips:
+            getattr(sp, method)(device_id=device_id)
+            done += 1
 
+    # Le nouveau morceau sera connu au prochain poll
+    _run_on_device(device_name, call, idempotent=False, track_uri=None)
+
+
+@_with_auth_retry
+def next_track(device_name: Optional[str] = None, skips: int = 1) -> None:
+    """Passe au morceau suivant (skips fois, device résolu une seule fois)."""
+    _skip(device_name, skips, "next_track")
 
-def previous_track(device_name: Optional[str] = None) -> None:
-    """Reviens au morceau précédent."""
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-    device_id = _find_device_id(devices, device_name or DEFAULT_DEVICE_NAME)
-    if not device_id:
-        raise ValueError(f"Device '{device_name}' introuvable.")
-    sp.previous_track(device_id=device_id)
 
+@_with_auth_retry
+def previous_track(device_name: Optional[str] = None, skips: int = 1) -> None:
+    """Reviens au morceau précédent (skips fois)."""
+    _skip(device_name, skips, "previous_track")
 
+
+@_with_auth_retry
 def change_volume(delta: int, device_name: Optional[str] = None) -> None:
     """Augmente ou baisse le volume du device de delta %."""
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-    device_id = _find_device_id(devices, device_name or DEFAULT_DEVICE_NAME)
-    if not device_id:
-        raise ValueError(f"Device '{device_name}' introuvable.")
 
-    # Spotify ne donne pas le volume actuel : on fixe à 50% comme base
-    current_volume = 50
-    new_volume = max(0, min(100, current_volume + delta))
-    sp.volume(new_volume, device_id=device_id)
+    def call(sp: spotipy.Spotify, device_id: str) -> None:
+        # Volume connu via l'état local (liste des devices, polling) ;
+        # 50 % par défaut si Spotify ne l'a jamais donné
+        current_volume = _playback_state.volume(device_id)
+        if current_volume is None:
+            current_volume = 50
+        new_volume = max(0, min(100, current_volume + delta))
+        sp.volume(new_volume, device_id=device_id)
+        _playback_state.update(device_id, volume=new_volume)
+
+    _run_on_device(device_name, call)
 
 
+@_with_auth_retry
 def shuffle(state: bool = True, device_name: Optional[str] = None) -> None:
     """Active ou désactive le mode shuffle."""
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-    device_id = _find_device_id(devices, device_name or DEFAULT_DEVICE_NAME)
-    if not device_id:
-        raise ValueError(f"Device '{device_name}' introuvable.")
-    sp.shuffle(state=state, device_id=device_id)
+    _run_on_device(
+        device_name,
+        lambda sp, device_id: sp.shuffle(state=state, device_id=device_id),
+        shuffle=state
+    )
 
 
+@_with_auth_retry
 def repeat(state: str = 'track', device_name: Optional[str] = None) -> None:
     """
     Répète un track/context/off.
 
     state: 'track' | 'context' | 'off'
     """
-    sp = _init_spotify_client()
-    devices = _get_devices(sp)
-    device_id = _find_device_id(devices, device_name or DEFAULT_DEVICE_NAME)
-    if not device_id:
-        raise ValueError(f"Device '{device_name}' introuvable.")
-    sp.repeat(state=state, device_id=device_id)
+    _run_on_device(
+        device_name,
+        lambda sp, device_id: sp.repeat(state=state, device_id=device_id),
+        repeat=state
+    )
+
+
+def scheduler_stats() -> Dict[str, float]:
+    """Profondeur de file et métriques de throttling de l'ordonnanceur."""
+    return _scheduler.stats()
+
+
+@_with_auth_retry
+def prefetch_track_uri(song_name: str) -> Optional[str]:
+    """
+    Recherche spéculative (transcription encore partielle).
+
+    Le résultat n'est pas mis en cache : l'appelant le confirme avec
+    remember_track_uri() si la requête finale est bien celle-ci.
+    """
+    uri = _library_lookup(song_name) or _search_cache.get(song_name)
+    if uri:
+        return uri
+    return _fetch_track_uri(_get_spotify_client(), song_name)
+
+
+def remember_track_uri(song_name: str, uri: str) -> None:
+    """Met en cache un résultat de prefetch_track_uri() confirmé."""
+    _search_cache.put(song_name, uri)
+
+
+@_with_auth_retry
+def warm_device_cache(device_name: Optional[str] = None) -> None:
+    """
+    Résout le device à l'avance (client, token et liste des devices).
+
+    Appelée en arrière-plan : sans token déjà utilisable,
+    AuthenticationRequired plutôt que l'autorisation interactive.
+    """
+    if not warm_token():
+        raise AuthenticationRequired()
+    _resolve_device(_get_spotify_client(), device_name)
+
+
+def warm_token() -> bool:
+    """
+    Crée le client et charge le token en cache, rafraîchi s'il a expiré.
+
+    N'ouvre jamais l'autorisation interactive : False s'il n'y a pas de
+    token utilisable (lancer authenticate()).
+    """
+    auth_manager = _get_spotify_client().auth_manager
+    if auth_manager is None:
+        return True
+    with tracing.span("spotify.token"):
+        token = auth_manager.validate_token(
+            auth_manager.cache_handler.get_cached_token()
+        )
+    return token is not None
+
+
+def warm_connection() -> None:
+    """
+    Ouvre la connexion keep-alive vers l'API (DNS + TLS) : elle reste dans
+    le pool de la session et sert à la première vraie requête.
+    """
+    sp = _get_spotify_client()
+    with tracing.span("spotify.connect"):
+        # Toute réponse HTTP convient (401 sans token) : seule la
+        # connexion compte
+        sp._session.head(sp.prefix, timeout=HTTP_TIMEOUT)
+
+
+def _library_token_ready() -> bool:
+    """Token utilisable sans autorisation interactive, avec LIBRARY_SCOPE."""
+    if not warm_token():
+        return False
+    auth_manager = _get_spotify_client().auth_manager
+    if auth_manager is None:
+        return True
+    token = auth_manager.cache_handler.get_cached_token()
+    return token is not None and auth_manager._is_scope_subset(
+        LIBRARY_SCOPE, token.get("scope")
+    )
+
+
+def start_library_sync() -> bool:
+    """
+    Lance la synchronisation de la bibliothèque locale en arrière-plan.
+
+    False si l'index est désactivé ; RuntimeError si le token en cache ne
+    permet pas de lire la bibliothèque (relancer authenticate()).
+    """
+    if _library_index is None:
+        return False
+    if not _library_token_ready():
+        raise RuntimeError(
+            "token sans accès à la bibliothèque, relancer l'authentification"
+        )
+    _library_syncer.start()
+    return True
+
+
+@_with_auth_retry
+def sync_library() -> Dict[str, int]:
+    """
+    Synchronisation incrémentale de l'index local (titres likés, playlists,
+    écoutes récentes). Faite automatiquement toutes les
+    LIBRARY_SYNC_INTERVAL secondes après la première commande.
+
+    Appelée depuis un thread : sans token déjà utilisable, on échoue
+    plutôt que d'ouvrir l'autorisation interactive (input()).
+    """
+    if _library_index is None:
+        return {}
+    if not _library_token_ready():
+        raise RuntimeError("token absent ou sans accès à la bibliothèque")
+    call = functools.partial(
+        _scheduled, priority=PRIORITY_LOW, idempotent=True
+    )
+    with tracing.span("library.sync"):
+        return _library_index.sync(_get_spotify_client(), call)
+
+
+_library_syncer = LibrarySyncer(sync_library, LIBRARY_SYNC_INTERVAL)
+
+
+def spotify_available() -> bool:
+    """False tant que le disjoncteur est ouvert (mode dégradé)."""
+    return _breaker.available()
+
+
+def spotify_status() -> str:
+    """Message d'état pour l'utilisateur quand Spotify est indisponible."""
+    if spotify_available():
+        return "Spotify est disponible."
+    return (
+        "Spotify ne répond pas pour le moment, "
+        f"je réessaie dans {_breaker.retry_in():.0f} s."
+    )
+
+
+def get_playback_state() -> Dict:
+    """
+    Dernier état de lecture connu, sans requête réseau.
+
+    Returns:
+        Dict: device_id, device_name, is_playing, shuffle, repeat,
+        track_uri, volume et updated_at (timestamp).
+    """
+    return _playback_state.snapshot()
 
 
 def authenticate(cache_path: str = DEFAULT_CACHE_PATH) -> None:
@@ -203,8 +774,14 @@ def authenticate(cache_path: str = DEFAULT_CACHE_PATH) -> None:
     Args:
         cache_path (str): Emplacement du fichier cache.
     """
-    sp = _init_spotify_client(cache_path=cache_path, open_browser=False)
+    sp = _init_spotify_client(
+        cache_path=cache_path, open_browser=False, interactive=True
+    )
+    # Autorisation interactive sur ce thread, hors ordonnanceur et
+    # disjoncteur : le budget CALL_BUDGET n'a pas à couvrir la saisie
+    sp.auth_manager.get_access_token(as_dict=False)
     _get_devices(sp)
+    _client_holder.invalidate()
     print(f"Authentification terminée. Cache stocké à : {cache_path}")
 
 
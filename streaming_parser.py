@@ -0,0 +1,228 @@
+"""
+streaming_parser.py
+Analyse incrémentale des transcriptions partielles de la reconnaissance
+vocale : l'action est validée dès qu'elle n'est plus ambiguë, et le travail
+Spotify (devices, recherche du morceau) démarre pendant que l'utilisateur
+parle encore.
+
+Exemple :
+    stream = IncrementalParser(NLPParser(), SpotifySpeculator())
+    for partial in ["mets", "mets get", "mets get lucky"]:
+        stream.update(partial)     # {'action': 'mets', ..., 'committed': True}
+    parsed = stream.finish()       # même résultat que parse_command()
+"""
+
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, Mapping, Optional, Set
+
+from nlp_parser import NLPParser
+from parsed_command import Action, Intent, ParsedCommand
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# Confiance minimale pour valider une action avant la fin de la phrase
+COMMIT_CONFIDENCE = 0.85
+
+# Longueur minimale de l'objet avant de lancer une recherche spéculative
+MIN_PREFETCH_LENGTH = 3
+
+# Attente maximale d'une recherche spéculative déjà en vol à la fin de la phrase
+CONFIRM_TIMEOUT = 2.0
+
+# -----------------------------
+# TRAVAIL SPÉCULATIF
+# -----------------------------
+
+
+class SpotifySpeculator:
+    """
+    Prépare les appels Spotify d'une commande encore en cours de dictée.
+
+    - Première action Spotify validée : le client, le token et la liste des
+      devices sont chauffés en arrière-plan.
+    - Action de lecture (Action.JOUE) : l'objet courant est recherché à chaque fois qu'il
+      change. Seule la recherche de la dernière hypothèse est exécutée ; les
+      résultats des hypothèses abandonnées sont jetés et seul celui qui
+      correspond à l'objet final entre dans le cache de recherche.
+    """
+
+    def __init__(
+        self,
+        min_query_length: int = MIN_PREFETCH_LENGTH,
+        confirm_timeout: float = CONFIRM_TIMEOUT
+    ):
+        # Import différé : command importe le contrôleur, qui exige la
+        # configuration Spotify
+        import command
+
+        self._controller = command.sp_ctrl
+        self._local_actions = command.LOCAL_ACTIONS
+        self.min_query_length = min_query_length
+        self.confirm_timeout = confirm_timeout
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="gigi-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._query: Optional[str] = None
+        self._futures: Dict[str, Future] = {}
+        self._warmed = False
+        self._token_ready = False  # vérifié par _warm, avant toute recherche
+        self.stats: Counter = Counter()
+
+    def speculate(self, intent: Intent, objet: str) -> None:
+        if intent in self._local_actions:
+            return
+        with self._lock:
+            if not self._warmed:
+                self._warmed = True
+                self._executor.submit(self._warm)
+
+            if (intent is not Action.JOUE or not objet
+                    or len(objet) < self.min_query_length
+                    or objet == self._query):
+                return
+            self._query = objet
+            self._futures[objet] = self._executor.submit(self._prefetch, objet)
+
+    def confirm(self, intent: Optional[Intent], objet: Optional[str]) -> None:
+        """Fin de phrase : garde la recherche de l'objet final, jette le reste."""
+        with self._lock:
+            futures, self._futures = self._futures, {}
+            self._query = None
+            self._warmed = False
+
+        future = futures.pop(objet, None) if intent is Action.JOUE else None
+        self.stats["stale"] += len(futures)
+        if future is None:
+            return
+        try:
+            uri = future.result(self.confirm_timeout)
+        except FutureTimeout:
+            return
+        if uri:
+            self._controller.remember_track_uri(objet, uri)
+            self.stats["confirmed"] += 1
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _warm(self) -> None:
+        try:
+            # Sans token en cache, rien ne part : une phrase pas encore
+            # finie ne doit pas déclencher l'autorisation interactive
+            self._token_ready = self._controller.warm_token()
+            if self._token_ready:
+                self._controller.warm_device_cache()
+        except Exception:
+            # Spéculatif : la vraie commande remontera l'erreur
+            pass
+
+    def _prefetch(self, query: str) -> Optional[str]:
+        with self._lock:
+            if query != self._query:
+                # Hypothèse dépassée avant même d'avoir été envoyée
+                self.stats["skipped"] += 1
+                return None
+        if not self._token_ready:
+            self.stats["no_token"] += 1
+            return None
+        self.stats["prefetched"] += 1
+        try:
+            return self._controller.prefetch_track_uri(query)
+        except Exception:
+            return None
+
+
+# -----------------------------
+# ANALYSE INCRÉMENTALE
+# -----------------------------
+
+
+def _open_prefixes(synonymes_intent: Mapping[str, str]) -> Dict[str, Set[str]]:
+    """Débuts d'expressions (en mots) → actions auxquelles ils peuvent mener."""
+    prefixes: Dict[str, Set[str]] = defaultdict(set)
+    for pattern, action in synonymes_intent.items():
+        words = pattern.split()
+        for n in range(1, len(words)):
+            prefixes[" ".join(words[:n])].add(action)
+    return dict(prefixes)
+
+
+class IncrementalParser:
+    """
+    Reçoit les hypothèses successives d'un énoncé (update() ou feed()).
+
+    Une action est validée ("committed") quand elle est reconnue avec
+    assez de confiance et que la fin de l'hypothèse n'est pas le début
+    d'une expression menant à une autre action ("active le mode" peut
+    encore devenir shuffle_on). Les salutations, qui ne valent que pour
+    une phrase entière, ne sont jamais validées avant finish().
+    """
+
+    def __init__(
+        self,
+        parser: NLPParser,
+        speculator: Optional[SpotifySpeculator] = None,
+        commit_confidence: float = COMMIT_CONFIDENCE
+    ):
+        self.parser = parser
+        self.speculator = speculator
+        self.commit_confidence = commit_confidence
+        self._prefixes = _open_prefixes(parser.synonymes_intent)
+        self._max_prefix_words = max(
+            (len(prefix.split()) for prefix in self._prefixes), default=0
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        self.text = ""
+        self.committed: Optional[str] = None
+
+    def feed(self, word: str) -> dict:
+        """Ajoute un mot à l'hypothèse courante."""
+        return self.update(f"{self.text} {word}".strip())
+
+    def update(self, partial: str) -> dict:
+        """
+        Remplace l'hypothèse courante (la reconnaissance peut se corriger).
+
+        Returns:
+            dict: Résultat de parse_command pour l'hypothèse, plus
+                'committed' (bool).
+        """
+        self.text = partial
+        # Hypothèses intermédiaires : inutile d'encombrer le cache du parser
+        result = self.parser.parse_command(partial, memoize=False)
+        committed = self._is_unambiguous(partial, result)
+        self.committed = result.action if committed else None
+        if committed and self.speculator is not None:
+            self.speculator.speculate(result.intent, result.object)
+        return dict(result, committed=committed)
+
+    def finish(self, final: Optional[str] = None) -> dict:
+        """Phrase terminée : résultat définitif, identique à parse_command()."""
+        result = self.parser.parse_command(self.text if final is None else final)
+        if self.speculator is not None:
+            self.speculator.confirm(result.intent, result.object)
+        self.reset()
+        return result
+
+    def _is_unambiguous(self, text: str, result: ParsedCommand) -> bool:
+        action = result.action
+        if not action or result.intent is Action.SALUTATION:
+            return False
+        if result.confidence < self.commit_confidence:
+            return False
+
+        words = text.lower().split()
+        for n in range(1, min(len(words), self._max_prefix_words) + 1):
+            actions = self._prefixes.get(" ".join(words[-n:]))
+            if actions and actions != {action}:
+                return False
+        return True
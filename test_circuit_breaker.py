@@ -0,0 +1,68 @@
+"""
+test_circuit_breaker.py
+Tests unitaires du disjoncteur (ouverture, échec rapide, appel de test).
+"""
+
+import time
+
+import pytest
+
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+)
+
+
+def boom():
+    raise ConnectionError("réseau coupé")
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(boom)
+    assert breaker.state == OPEN
+    assert not breaker.available()
+
+    calls = []
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.call(calls.append, "jamais")
+    assert calls == []
+    assert excinfo.value.retry_in > 0
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(ConnectionError):
+        breaker.call(boom)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+
+    # Échec de l'appel de test : le circuit se rouvre
+    with pytest.raises(ConnectionError):
+        breaker.call(boom)
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_only_one_probe_in_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    with pytest.raises(ConnectionError):
+        breaker.call(boom)
+    time.sleep(0.02)
+
+    breaker.before_call()  # appel de test en cours
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_non_outage_errors_do_not_trip():
+    breaker = CircuitBreaker(
+        failure_threshold=1, is_failure=lambda e: not isinstance(e, ValueError)
+    )
+    with pytest.raises(ValueError):
+        breaker.call(lambda: int("x"))
+    assert breaker.state == CLOSED
@@ -0,0 +1,122 @@
+"""
+test_command.py
+Tests unitaires du registre des handlers et du dispatch de execute_command,
+sans appel à Spotify.
+"""
+
+import pytest
+
+import command
+from nlp_parser import NLPParser
+from parsed_command import Action, ParsedCommand
+from test_nlp_parser import LEXIQUE_TEST
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registre isolé : les handlers du module restent intacts."""
+    monkeypatch.setattr(command, "HANDLERS", dict(command.HANDLERS))
+    monkeypatch.setattr(command, "LOCAL_ACTIONS", set(command.LOCAL_ACTIONS))
+    return command.HANDLERS
+
+
+def dispatch(parsed):
+    replies = []
+    command.execute_command(parsed, on_reply=replies.append)
+    return replies
+
+
+def test_duplicate_registration_is_rejected(registry):
+    @command.handler("karaoke")
+    def first(ctx):
+        pass
+
+    with pytest.raises(ValueError, match="first"):
+        @command.handler("karaoke")
+        def second(ctx):
+            pass
+
+    assert registry["karaoke"] is first
+    with pytest.raises(ValueError):
+        command.handler("pause")(lambda ctx: None)
+
+
+def test_unknown_and_missing_actions():
+    assert dispatch({"action": None, "object": None}) == [
+        "Je n'ai pas compris la commande."
+    ]
+    assert dispatch({"action": "karaoke", "object": ""}) == [
+        "Action 'karaoke' non reconnue."
+    ]
+
+
+def test_local_actions_run_in_degraded_mode(registry, monkeypatch):
+    monkeypatch.setattr(command.sp_ctrl, "spotify_available", lambda: False)
+    monkeypatch.setattr(command.sp_ctrl, "spotify_status", lambda: "Spotify HS")
+    calls = []
+    command.handler("karaoke", local=True)(lambda ctx: calls.append(ctx.action))
+
+    assert dispatch({"action": "karaoke", "object": ""}) == []
+    assert calls == ["karaoke"]
+    # Action Spotify : réponse d'état immédiate, handler non appelé
+    monkeypatch.setitem(registry, Action.PAUSE, lambda ctx: calls.append("pause"))
+    assert dispatch({"action": "pause", "object": ""}) == ["Spotify HS"]
+    assert calls == ["karaoke"]
+
+
+def test_spotify_actions_are_routed_by_intent(registry, monkeypatch):
+    monkeypatch.setattr(command.sp_ctrl, "spotify_available", lambda: True)
+    seen = []
+    monkeypatch.setitem(
+        registry, Action.JOUE, lambda ctx: seen.append((ctx.action, ctx.objet))
+    )
+
+    dispatch(ParsedCommand("balance", Action.JOUE, "get lucky", 1.0))
+    dispatch({"action": "mets", "intent": "joue", "object": "santé"})
+
+    assert seen == [(Action.JOUE, "get lucky"), (Action.JOUE, "santé")]
+    assert seen[0][0] is Action.JOUE
+
+
+def test_uncertain_commands_need_confirmation(registry, monkeypatch):
+    monkeypatch.setattr(command.sp_ctrl, "spotify_available", lambda: True)
+    seen = []
+    monkeypatch.setitem(registry, Action.PAUSE, lambda ctx: seen.append("pause"))
+    uncertain = ParsedCommand("pause", Action.PAUSE, "sel", 0.8)
+
+    # Sans moyen de confirmer (démon) : refusée
+    assert dispatch(uncertain) == [
+        "Je ne suis pas sûr d'avoir compris (« pause sel » ?), rien n'est fait."
+    ]
+    asked = []
+    command.execute_command(
+        uncertain, on_reply=lambda message: None,
+        confirm=lambda parsed: asked.append(parsed) or False
+    )
+    assert asked == [uncertain] and seen == []
+
+    command.execute_command(
+        uncertain, on_reply=lambda message: None, confirm=lambda parsed: True
+    )
+    assert seen == ["pause"]
+
+    # "jour" lu comme "joue" : jamais joué sans confirmation
+    parsed = NLPParser(LEXIQUE_TEST).parse_command("quel jour sommes nous")
+    assert parsed.intent is Action.JOUE
+    assert dispatch(parsed)[0].startswith("Je ne suis pas sûr")
+
+
+def test_missing_token_is_handled_before_the_repl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(command.sp_ctrl, "warm_token", lambda: False)
+    monkeypatch.setattr(
+        command.sp_ctrl, "authenticate", lambda: calls.append("authenticate")
+    )
+    assert command._ensure_token()
+    assert calls == ["authenticate"]
+
+    def refused():
+        raise RuntimeError("refusé")
+
+    monkeypatch.setattr(command.sp_ctrl, "authenticate", refused)
+    assert not command._ensure_token()
@@ -0,0 +1,117 @@
+"""
+test_command_pipeline.py
+Tests unitaires de la pipeline d'exécution asynchrone des appels Spotify.
+"""
+
+import queue
+import threading
+
+import pytest
+
+from command_pipeline import CommandPipeline, SpotifyJob
+
+
+def _recorder(calls, gate=None):
+    """Fabrique des fausses fonctions du contrôleur qui notent leurs appels."""
+
+    def make(name):
+
+        def func(**kwargs):
+            if gate is not None:
+                gate.wait()
+            calls.append((name, kwargs))
+
+        func.__name__ = name
+        return func
+
+    return make
+
+
+def test_jobs_run_in_order():
+    calls = []
+    make = _recorder(calls)
+    pipeline = CommandPipeline()
+    for song in ("santé", "dkr", "fade to black"):
+        pipeline.submit(SpotifyJob(make("play_song"), {"song_name": song}))
+    pipeline.close(timeout=2)
+
+    assert [kwargs["song_name"] for _, kwargs in calls] == [
+        "santé", "dkr", "fade to black"
+    ]
+
+
+def test_pause_supersedes_pending_next():
+    calls = []
+    gate = threading.Event()
+    make = _recorder(calls, gate)
+    pipeline = CommandPipeline()
+
+    # Le premier appel bloque le worker, les suivants restent en attente
+    pipeline.submit(SpotifyJob(make("play_song"), {"song_name": "santé"}))
+    pipeline.submit(SpotifyJob(make("next_track"), {}))
+    pipeline.submit(SpotifyJob(make("pause_song"), {}))
+    gate.set()
+    pipeline.close(timeout=2)
+
+    assert [name for name, _ in calls] == ["play_song", "pause_song"]
+
+
+def test_bounded_queue():
+    gate = threading.Event()
+    make = _recorder([], gate)
+    pipeline = CommandPipeline(max_pending=1)
+    pipeline.submit(SpotifyJob(make("play_song"), {"song_name": "a"}))
+
+    with pytest.raises(queue.Full):
+        for _ in range(3):
+            pipeline.submit(SpotifyJob(make("play_song"), {"song_name": "b"}))
+    gate.set()
+    pipeline.close(timeout=2)
+
+
+def test_errors_go_to_callback():
+    errors = []
+
+    def pause_song():
+        raise RuntimeError("device perdu")
+
+    pipeline = CommandPipeline()
+    pipeline.submit(SpotifyJob(pause_song, {}, on_error=errors.append))
+    pipeline.close(timeout=2)
+
+    assert str(errors[0]) == "device perdu"
+
+
+def test_volume_deltas_are_summed():
+    calls = []
+    make = _recorder(calls)
+    pipeline = CommandPipeline(window=0.5)
+    for _ in range(3):
+        pipeline.submit(SpotifyJob(make("change_volume"), {"delta": 10}))
+    pipeline.join(timeout=2)
+
+    assert calls == [("change_volume", {"delta": 30})]
+    assert pipeline.coalesced() == 2
+    pipeline.close()
+
+
+def test_skips_are_folded():
+    calls = []
+    make = _recorder(calls)
+    pipeline = CommandPipeline(window=0.5)
+    for kind in ("next_track", "next_track", "next_track", "previous_track"):
+        pipeline.submit(SpotifyJob(make(kind), {}))
+    pipeline.close(timeout=2)
+
+    assert calls == [("next_track", {"skips": 2})]
+
+
+def test_pause_then_resume_cancel_out():
+    calls = []
+    make = _recorder(calls)
+    pipeline = CommandPipeline(window=0.5)
+    pipeline.submit(SpotifyJob(make("pause_song"), {}))
+    pipeline.submit(SpotifyJob(make("resume_song"), {}))
+    pipeline.close(timeout=2)
+
+    assert calls == []
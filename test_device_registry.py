@@ -0,0 +1,119 @@
+"""
+test_device_registry.py
+Tests unitaires du cache des devices Spotify Connect et de la relance
+après un device disparu (404).
+"""
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+import spotify_controller as sp_ctrl
+
+
+class FakeClock:
+    """Remplace le module time de spotify_controller (monotonic seul)."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeDevicesClient:
+    """Imite sp.devices() et note les commandes reçues."""
+
+    def __init__(self, devices):
+        self.devices_list = devices
+        self.device_calls = 0
+        self.played_on = []
+
+    def devices(self):
+        self.device_calls += 1
+        return {
+            "devices": [
+                {"id": device_id, "name": name}
+                for name, device_id in self.devices_list.items()
+            ]
+        }
+
+
+class NullPoller:
+
+    def start(self):
+        pass
+
+    def touch(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sp_ctrl, "time", clock)
+    return clock
+
+
+def test_device_list_is_cached_until_ttl_expires(clock):
+    client = FakeDevicesClient({"Raspo": "id-1"})
+    registry = sp_ctrl._DeviceRegistry(ttl=300)
+
+    assert registry.resolve(client, " raspo ") == "id-1"
+    assert registry.resolve(client, "Raspo") == "id-1"
+    assert client.device_calls == 1
+
+    clock.now += 301
+    assert registry.resolve(client, "Raspo") == "id-1"
+    assert client.device_calls == 2
+
+
+def test_unknown_device_refreshes_then_fails(clock):
+    client = FakeDevicesClient({"Raspo": "id-1"})
+    registry = sp_ctrl._DeviceRegistry(ttl=300)
+    registry.resolve(client, "Raspo")
+
+    # Nom inconnu : la liste est redemandée même si elle est fraîche
+    assert registry.resolve(client, "Olympe") is None
+    assert client.device_calls == 2
+
+
+def test_device_gone_refreshes_and_replays_once(clock, monkeypatch):
+    client = FakeDevicesClient({"Raspo": "old-id"})
+    monkeypatch.setattr(sp_ctrl, "_get_spotify_client", lambda: client)
+    monkeypatch.setattr(sp_ctrl, "_device_registry", sp_ctrl._DeviceRegistry())
+    monkeypatch.setattr(sp_ctrl, "_playback_poller", NullPoller())
+    monkeypatch.setattr(sp_ctrl, "_library_index", None)
+
+    def call(sp, device_id):
+        sp.played_on.append(device_id)
+        if device_id == "old-id":
+            # Le device a été réenregistré sous un nouvel id
+            sp.devices_list["Raspo"] = "new-id"
+            raise SpotifyException(404, -1, "Device not found")
+
+    sp_ctrl._run_on_device("Raspo", call)
+    assert client.played_on == ["old-id", "new-id"]
+    assert client.device_calls == 2
+
+    with pytest.raises(ValueError):
+        sp_ctrl._run_on_device("Olympe", call)
+
+
+def test_replay_after_404_only_sends_the_remaining_skips(clock, monkeypatch):
+    client = FakeDevicesClient({"Raspo": "old-id"})
+    monkeypatch.setattr(sp_ctrl, "_get_spotify_client", lambda: client)
+    monkeypatch.setattr(sp_ctrl, "_device_registry", sp_ctrl._DeviceRegistry())
+    monkeypatch.setattr(sp_ctrl, "_playback_poller", NullPoller())
+    monkeypatch.setattr(sp_ctrl, "_library_index", None)
+
+    def next_track(device_id):
+        # Le device disparaît après le premier saut
+        if device_id == "old-id" and client.played_on:
+            client.devices_list["Raspo"] = "new-id"
+            raise SpotifyException(404, -1, "Device not found")
+        client.played_on.append(device_id)
+
+    client.next_track = next_track
+    sp_ctrl.next_track("Raspo", skips=3)
+
+    assert client.played_on == ["old-id", "new-id", "new-id"]
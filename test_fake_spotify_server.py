@@ -0,0 +1,62 @@
+"""
+test_fake_spotify_server.py
+Tests du faux serveur de l'API Spotify utilisé par les tests de charge.
+"""
+
+import time
+
+import pytest
+import requests
+
+from fake_spotify_server import FakeSpotifyBackend, api_url, start_server
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(**kwargs):
+        backend = FakeSpotifyBackend(seed=0, **kwargs)
+        server = start_server(backend)
+        servers.append(server)
+        return backend, api_url(server)
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_search_is_reproducible_and_requests_are_counted(serve):
+    backend, url = serve()
+
+    response = requests.get(f"{url}search", params={"q": "santé", "limit": 2})
+    items = response.json()["tracks"]["items"]
+    # Mêmes URI d'un processus à l'autre (pas de hash() randomisé)
+    assert [item["uri"] for item in items] == [
+        "spotify:track:cdd427d354e5", "spotify:track:1bfdb528693f"
+    ]
+    assert requests.put(
+        f"{url}me/player/play", params={"device_id": "inconnu"}
+    ).status_code == 404
+
+    # Une erreur compte une requête, pas deux
+    assert backend.requests == 2
+    assert backend.stats["HTTP 404"] == 1
+
+
+def test_latency_is_injected(serve):
+    _, url = serve(latency=0.1)
+
+    started_at = time.perf_counter()
+    assert requests.get(f"{url}me/player/devices").status_code == 200
+    assert time.perf_counter() - started_at >= 0.1
+
+
+def test_rate_limit_sends_retry_after(serve):
+    backend, url = serve(rate_limit_rate=1.0, retry_after=3)
+
+    response = requests.get(f"{url}me/player")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert backend.stats["HTTP 429"] == 1
@@ -0,0 +1,75 @@
+"""
+test_french_tokenizer.py
+Tests du tokenizer français et de son équivalence avec l'ancien
+TreebankWordTokenizer sur les commandes de Gigi.
+"""
+
+import pytest
+
+from french_tokenizer import FrenchTokenizer
+from nlp_parser import NLPParser
+from test_nlp_parser import LEXIQUE_TEST
+
+# Commandes sans élision ni ponctuation : résultats strictement identiques
+CORPUS_EQUIVALENT = [
+    "Mets Stromae Santé sur Spotify",
+    "Joue Fade to Black de Metallica",
+    "Lance Booba DKR sur Spotify",
+    "Balance une musique chill sur Spotify",
+    "pause",
+    "Pause la musique",
+    "Stop la chanson",
+    "Reprends la lecture",
+    "monte le son",
+    "baisse le volume",
+    "musique suivante",
+    "piste précédente",
+    "active le mode aléatoire",
+    "répète la chanson",
+    "quelle heure est il",
+    "joue AC/DC sur spotify",
+    "mets peux-tu",
+    "jou get lucky",
+    "suivante piste",
+    "rien à voir",
+]
+
+# Différences voulues : élisions séparées, ponctuation ignorée
+CHANGEMENTS_ATTENDUS = {
+    "Joue l'été indien": ("joue", "été indien"),
+    "mets Get Lucky, de Daft Punk !": ("mets", "get lucky daft punk"),
+    "lance aujourd'hui maman": ("lance", "aujourd'hui maman"),
+    "joue \"Santé\" s’il te plait": ("joue", "santé"),
+}
+
+
+def test_tokenize():
+    tokenizer = FrenchTokenizer()
+    assert tokenizer.tokenize("répète l'album") == ["répète", "l'", "album"]
+    assert tokenizer.tokenize("s’il te plaît ?") == ["s'", "il", "te", "plaît"]
+    assert tokenizer.tokenize("d'aujourd'hui") == ["d'", "aujourd'hui"]
+    assert tokenizer.tokenize("AC/DC 2.0, peux-tu...") == ["AC/DC", "2.0", "peux-tu"]
+
+
+def test_options():
+    tokenizer = FrenchTokenizer(keep_elisions=False, fold_accents=True)
+    assert tokenizer.tokenize("qu'il joue l'Été précédent") == [
+        "il", "joue", "Ete", "precedent"
+    ]
+
+
+def test_equivalent_to_treebank():
+    treebank = pytest.importorskip("nltk.tokenize").TreebankWordTokenizer()
+    french = NLPParser(LEXIQUE_TEST, cache_size=0)
+    legacy = NLPParser(LEXIQUE_TEST, cache_size=0)
+    legacy.tokenizer = treebank
+
+    for phrase in CORPUS_EQUIVALENT:
+        assert french.parse_command(phrase) == legacy.parse_command(phrase), phrase
+
+
+def test_elisions_and_punctuation():
+    parser = NLPParser(LEXIQUE_TEST)
+    for phrase, expected in CHANGEMENTS_ATTENDUS.items():
+        result = parser.parse_command(phrase)
+        assert (result["action"], result["object"]) == expected, phrase
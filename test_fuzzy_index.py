@@ -0,0 +1,55 @@
+"""
+test_fuzzy_index.py
+Tests unitaires de la distance bornée et de l'index de trigrammes.
+"""
+
+from fuzzy_index import (
+    SHORT_WORD_SIMILARITY, FuzzyIndex, FuzzyIntentIndex, FuzzyMatch, levenshtein
+)
+
+
+def test_bounded_levenshtein():
+    assert levenshtein("joue", "joue", 1) == 0
+    assert levenshtein("jou", "joue", 1) == 1
+    assert levenshtein("precedent", "précédent", 2) == 2
+    assert levenshtein("pause", "lance", 1) is None
+    assert levenshtein("a", "abcdef", 2) is None
+
+
+def test_index_lookup():
+    index = FuzzyIndex(["joue", "jouer", "pause", "suivant"])
+    assert index.lookup("joue") == ("joue", 0)
+    assert index.lookup("jouee") == ("joue", 1)
+    assert index.lookup("suivnt") == ("suivant", 1)
+    assert index.lookup("suivnat") is None
+    assert index.lookup("suivnat", max_distance=2) == ("suivant", 2)
+    assert index.lookup("xyz") is None
+    assert index.lookup("jou") == ("joue", 1)
+    # Mots trop courts : pas de correction
+    assert index.lookup("jo") is None
+
+
+def test_short_word_slips_stay_below_confirmation():
+    fuzzy = FuzzyIntentIndex(["joue", "suivant"], {}, stopwords=[])
+    assert fuzzy.match(["jou"]) == FuzzyMatch(
+        "joue", SHORT_WORD_SIMILARITY, ("jou", )
+    )
+    assert fuzzy.match(["jour"]).confidence == SHORT_WORD_SIMILARITY
+    assert fuzzy.match(["suivnt"]).confidence > SHORT_WORD_SIMILARITY
+
+
+def test_missing_accents_are_not_typos():
+    fuzzy = FuzzyIntentIndex(["précédent", "arrête"], {}, stopwords=[])
+    match = fuzzy.match(["precedent"])
+    assert (match.action, match.confidence) == ("précédent", 0.95)
+    assert fuzzy.match(["arrete"]).action == "arrête"
+
+
+def test_phrase_words_in_any_order():
+    fuzzy = FuzzyIntentIndex(
+        ["joue"], {"piste suivante": "suivant"}, stopwords=["la"]
+    )
+    match = fuzzy.match(["suivante", "la", "piste"])
+    assert match.action == "suivant"
+    assert set(match.tokens) == {"suivante", "piste"}
+    assert fuzzy.match(["piste"]) is None
@@ -0,0 +1,125 @@
+"""
+test_gigi_daemon.py
+Tests du démon Gigi sur socket Unix, avec un exécuteur factice à la place
+du contrôleur Spotify.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from gigi_daemon import GigiDaemon, send
+from nlp_parser import NLPParser
+from test_nlp_parser import LEXIQUE_TEST
+
+
+class FakeExecutor:
+    """Remplace execute_command : répond sans toucher Spotify."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.threads = set()
+
+    def __call__(self, parsed, on_reply):
+        self.threads.add(threading.current_thread().name)
+        if self.delay:
+            threading.Event().wait(self.delay)
+        on_reply(f"{parsed.intent} {parsed.object}".strip())
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+
+def test_line_and_json_requests(tmp_path):
+    path = str(tmp_path / "gigi.sock")
+    daemon = GigiDaemon(NLPParser(LEXIQUE_TEST), FakeExecutor())
+
+    async def scenario():
+        await daemon.start(path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'pause\n{"id": 7, "text": "Mets Sant\\u00e9"}\n{"id"\n')
+        responses = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        # Client bloquant, comme celui de la ligne de commande
+        sent = await asyncio.to_thread(send, "monte le son", path)
+        await daemon.close()
+        return responses + [sent]
+
+    pause, play, invalid, volume = run(scenario())
+
+    assert pause["intent"] == "pause" and pause["replies"] == ["pause"]
+    assert play["id"] == 7
+    assert (play["action"], play["intent"]) == ("mets", "joue")
+    assert play["replies"] == ["joue santé"]
+    assert not invalid["ok"] and "error" in invalid
+    assert volume["replies"] == ["monte son"]
+    assert volume["elapsed_ms"] >= 0
+
+
+def test_clients_are_served_concurrently(tmp_path):
+    path = str(tmp_path / "gigi.sock")
+    executor = FakeExecutor(delay=0.2)
+    daemon = GigiDaemon(NLPParser(LEXIQUE_TEST), executor, workers=8)
+
+    async def client(i):
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(f"joue morceau {i}\n".encode())
+        response = json.loads(await reader.readline())
+        writer.close()
+        return response
+
+    async def scenario():
+        await daemon.start(path)
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        responses = await asyncio.gather(*(client(i) for i in range(8)))
+        elapsed = loop.time() - started_at
+        await daemon.close()
+        return responses, elapsed
+
+    responses, elapsed = run(scenario())
+
+    assert [r["object"] for r in responses] == [f"morceau {i}" for i in range(8)]
+    # 8 commandes de 200 ms en parallèle, pas en série (1,6 s)
+    assert elapsed < 1.0
+    assert len(executor.threads) > 1
+
+
+def test_socket_is_private_and_never_stolen(tmp_path):
+    path = str(tmp_path / "run" / "gigi.sock")
+    first = GigiDaemon(NLPParser(LEXIQUE_TEST), FakeExecutor())
+    second = GigiDaemon(NLPParser(LEXIQUE_TEST), FakeExecutor())
+
+    async def scenario():
+        await first.start(path)
+        modes = (
+            stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode),
+            stat.S_IMODE(os.stat(path).st_mode),
+        )
+        # Un démon répond : le second refuse au lieu de supprimer sa socket
+        with pytest.raises(RuntimeError, match="répond déjà"):
+            await second.start(path)
+        assert (await asyncio.to_thread(send, "pause", path))["ok"]
+        await first.close()
+        return modes
+
+    assert run(scenario()) == (0o700, 0o600)
+
+    # Socket orpheline (démon tué) : remplacée
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    async def restart():
+        await second.start(path)
+        response = await asyncio.to_thread(send, "pause", path)
+        await second.close()
+        return response
+
+    assert run(restart())["ok"]
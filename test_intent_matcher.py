@@ -0,0 +1,37 @@
+"""
+test_intent_matcher.py
+Tests unitaires de l'automate de synonymes d'intentions.
+"""
+
+from intent_matcher import IntentMatcher
+
+SYNONYMES = {
+    "musique suivante": "suivant",
+    "piste suivante": "suivant",
+    "répète la chanson": "repeat_track",
+    "active le mode aléatoire": "shuffle_on",
+    "désactive le mode aléatoire": "shuffle_off",
+}
+
+
+def test_simple_match():
+    matcher = IntentMatcher(SYNONYMES)
+    assert matcher.search("mets la musique suivante") == (
+        "musique suivante", "suivant"
+    )
+
+
+def test_no_match():
+    matcher = IntentMatcher(SYNONYMES)
+    assert matcher.search("joue stromae santé") is None
+
+
+def test_longest_match_wins():
+    matcher = IntentMatcher(SYNONYMES)
+    # "active le mode aléatoire" est inclus dans "désactive le mode aléatoire"
+    assert matcher.search("désactive le mode aléatoire")[1] == "shuffle_off"
+
+
+def test_priority_on_equal_length():
+    matcher = IntentMatcher({"stop": "stop", "joue": "joue"})
+    assert matcher.search("joue stop")[1] == "stop"
@@ -0,0 +1,66 @@
+"""
+test_lexicon.py
+Tests unitaires du chargement de l'artefact du lexique et de sa
+régénération (NLTK remplacé par une liste figée).
+"""
+
+import json
+
+import pytest
+
+import lexicon
+
+
+@pytest.fixture
+def built(monkeypatch, tmp_path):
+    """Régénération hors ligne, et pas d'artefact livré sauf s'il est créé."""
+    calls = []
+
+    def french_stopwords():
+        calls.append(1)
+        return ["le", "la", "de"]
+
+    monkeypatch.setattr(lexicon, "_french_stopwords", french_stopwords)
+    monkeypatch.setattr(
+        lexicon, "BUNDLED_LEXICON_PATH", str(tmp_path / "bundled.json")
+    )
+    return calls
+
+
+def test_missing_artifact_is_built_then_reused(built, tmp_path):
+    path = str(tmp_path / "cache" / "lexicon.json")
+
+    first = lexicon.load_lexicon(path)
+    assert len(built) == 1
+    assert "mets" in first.intent_verbs and "de" in first.stopwords
+
+    assert lexicon.load_lexicon(path) == first
+    assert len(built) == 1
+
+
+def test_changed_sources_rebuild_the_artifact(built, tmp_path, monkeypatch):
+    path = str(tmp_path / "lexicon.json")
+    lexicon.load_lexicon(path)
+
+    monkeypatch.setattr(lexicon, "SALUTATIONS", lexicon.SALUTATIONS + ["wesh"])
+    assert "wesh" in lexicon.load_lexicon(path).salutations
+    assert len(built) == 2
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["fingerprint"] == lexicon.source_fingerprint()
+
+
+def test_bundled_artifact_is_used_without_nltk(built, tmp_path):
+    lexicon.save_lexicon(lexicon.build_lexicon_data(), lexicon.BUNDLED_LEXICON_PATH)
+    built.clear()
+
+    loaded = lexicon.load_lexicon(str(tmp_path / "absent.json"))
+    assert "de" in loaded.stopwords
+    assert built == []
+
+
+def test_shipped_artifact_matches_the_sources():
+    # Échoue si les tables ont changé sans relancer : python lexicon.py lexicon.json
+    with open(lexicon.BUNDLED_LEXICON_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["version"] == lexicon.LEXICON_VERSION
+    assert data["fingerprint"] == lexicon.source_fingerprint()
@@ -0,0 +1,160 @@
+"""
+test_library_index.py
+Tests unitaires de l'index local de la bibliothèque et de sa
+synchronisation incrémentale.
+"""
+
+from library_index import LibraryIndex
+
+
+def track(uri, name, artist, album=""):
+    return {
+        "uri": uri,
+        "name": name,
+        "type": "track",
+        "artists": [{"name": artist}],
+        "album": {"name": album},
+    }
+
+
+class FakeLibraryClient:
+    """Imite les méthodes spotipy de lecture de la bibliothèque."""
+
+    def __init__(self):
+        self.saved = []  # du plus récent au plus ancien
+        self.playlists = {}  # id → (snapshot_id, [tracks])
+        self.recent = []
+        self.calls = []
+
+    def current_user_saved_tracks(self, limit=20, offset=0):
+        self.calls.append(("saved", offset))
+        items = self.saved[offset:offset + limit]
+        more = offset + limit < len(self.saved)
+        return {
+            "items": items,
+            "next": "suite" if more else None,
+            "total": len(self.saved),
+        }
+
+    def current_user_playlists(self, limit=50, offset=0):
+        items = [
+            {"id": pid, "snapshot_id": snapshot}
+            for pid, (snapshot, _) in self.playlists.items()
+        ]
+        return {"items": items, "next": None}
+
+    def playlist_items(self, playlist_id, limit=100, offset=0, **kwargs):
+        self.calls.append(("playlist", playlist_id))
+        tracks = self.playlists[playlist_id][1]
+        return {"items": [{"track": t} for t in tracks], "next": None}
+
+    def current_user_recently_played(self, limit=50, after=None):
+        return {"items": [{"track": t} for t in self.recent], "cursors": None}
+
+
+def test_lookup_ignores_case_and_accents(tmp_path):
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    index.add_tracks("saved", [
+        track("spotify:track:1", "Santé", "Stromae", "Multitude"),
+        track("spotify:track:2", "Get Lucky", "Daft Punk"),
+        {"uri": "spotify:local:x", "is_local": True, "name": "Démo"},
+    ])
+
+    assert index.lookup("sante stromae") == "spotify:track:1"
+    assert index.lookup("GET LUCKY daft punk") == "spotify:track:2"
+    assert index.lookup("get lucky pharrell") is None
+    assert index.lookup("démo") is None
+    assert len(index) == 2
+
+
+def test_sync_is_incremental(tmp_path):
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    client = FakeLibraryClient()
+    client.saved = [
+        {"added_at": "2024-01-02", "track": track("spotify:track:b", "B", "X")},
+        {"added_at": "2024-01-01", "track": track("spotify:track:a", "A", "X")},
+    ]
+    client.playlists = {"p1": ("v1", [track("spotify:track:c", "Chill", "Y")])}
+
+    assert index.sync(client)["saved"] == 2
+
+    # Rien de neuf : une seule page lue, playlist inchangée non relue
+    client.calls.clear()
+    assert index.sync(client) == {"saved": 0, "playlists": 0, "recent": 0}
+    assert client.calls == [("saved", 0)]
+
+    # Nouveau like et playlist modifiée
+    client.saved.insert(
+        0, {"added_at": "2024-01-03", "track": track("spotify:track:d", "D", "Z")}
+    )
+    client.playlists["p1"] = ("v2", [track("spotify:track:e", "Energie", "Y")])
+    index.sync(client)
+    assert index.lookup("d z") == "spotify:track:d"
+    assert index.lookup("energie") == "spotify:track:e"
+    assert index.lookup("chill") is None
+
+    # Playlist supprimée : ses morceaux quittent l'index
+    del client.playlists["p1"]
+    index.sync(client)
+    assert index.lookup("energie") is None
+
+
+def test_unsaved_tracks_are_pruned(tmp_path):
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    client = FakeLibraryClient()
+    client.saved = [
+        {
+            "added_at": f"2024-01-{day:02d}",
+            "track": track(f"spotify:track:{day}", f"Titre {day}", "X"),
+        }
+        for day in range(60, 0, -1)
+    ]
+    index.sync(client)
+    assert index.lookup("titre 60") == "spotify:track:60"
+
+    # Total inchangé : pas de relecture complète
+    client.calls.clear()
+    index.sync(client)
+    assert client.calls == [("saved", 0)]
+
+    # Un like retiré (et un autre ajouté) : la liste est relue en entier
+    del client.saved[30]
+    client.saved.insert(
+        0, {"added_at": "2024-03-01", "track": track("spotify:track:new", "Neuf", "Y")}
+    )
+    client.calls.clear()
+    index.sync(client)
+    assert client.calls == [("saved", 0), ("saved", 0), ("saved", 50)]
+    assert index.lookup("titre 30") is None
+    assert index.lookup("neuf") == "spotify:track:new"
+    assert index.lookup("titre 29") == "spotify:track:29"
+    assert len(index) == 60
+
+
+def test_recent_plays_are_capped(tmp_path):
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"), recent_limit=3)
+    client = FakeLibraryClient()
+    client.saved = [
+        {"added_at": "2024-01-01", "track": track("spotify:track:a", "Aimé", "X")}
+    ]
+
+    # Écoutes du plus récent au plus ancien, comme l'API
+    client.recent = [
+        track(f"spotify:track:{n}", f"Écoute {n}", "Y") for n in "4321"
+    ]
+    index.sync(client)
+    assert index.lookup("écoute 1") is None
+    assert index.lookup("écoute 4") == "spotify:track:4"
+
+    # Une écoute répétée repasse en tête ; un titre liké reste dans l'index
+    client.recent = [
+        track("spotify:track:2", "Écoute 2", "Y"),
+        track("spotify:track:5", "Écoute 5", "Y"),
+        track("spotify:track:a", "Aimé", "X"),
+    ]
+    index.sync(client)
+    assert [index.lookup(f"écoute {n}") for n in "2345"] == [
+        "spotify:track:2", None, None, "spotify:track:5"
+    ]
+    assert index.lookup("aimé") == "spotify:track:a"
+    assert len(index) == 3
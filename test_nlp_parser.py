@@ -0,0 +1,147 @@
+"""
+test_nlp_parser.py
+Tests unitaires de NLPParser avec un lexique construit à la main
+(pas besoin de l'artefact ni des stopwords NLTK).
+"""
+
+import pytest
+
+import lexicon
+from command import CONFIRM_CONFIDENCE
+from lexicon import Lexicon
+from nlp_parser import NLPParser
+from parsed_command import Action
+
+LEXIQUE_TEST = Lexicon(
+    intent_verbs=frozenset(lexicon.INTENT_VERBS),
+    synonymes_intent=dict(lexicon.SYNONYMES_INTENT),
+    salutations=frozenset(lexicon.SALUTATIONS),
+    stopwords=frozenset(lexicon.CUSTOM_STOPWORDS) | {"à", "du", "des", "il"},
+    intent_canonique=dict(lexicon.INTENT_CANONIQUE),
+)
+
+CORPUS = [
+    "Mets Stromae Santé sur Spotify",
+    "Joue Fade to Black de Metallica",
+    "pause",
+    "musique suivante",
+    "Désactive le mode aléatoire",
+    "salut",
+    "quelle heure est il",
+    "Lance Booba DKR sur Spotify",
+    "rien à voir",
+]
+
+
+def test_parse_command():
+    parser = NLPParser(LEXIQUE_TEST)
+    assert parser.parse_command("Mets Stromae Santé sur Spotify") == {
+        "action": "mets",
+        "intent": "joue",
+        "object": "stromae santé",
+        "confidence": 1.0
+    }
+    assert parser.parse_command("Désactive le mode aléatoire") == {
+        "action": "shuffle_off",
+        "intent": "shuffle_off",
+        "object": "",
+        "confidence": 1.0
+    }
+    assert parser.parse_command("rien à voir") == {
+        "action": None,
+        "intent": None,
+        "object": None,
+        "confidence": 0.0
+    }
+
+
+def test_parse_many_matches_parse_command():
+    parser = NLPParser(LEXIQUE_TEST)
+    phrases = CORPUS * 50
+    stats = {}
+
+    results = list(parser.parse_many(phrases, batch_size=64, stats=stats))
+
+    assert results == [parser.parse_command(p) for p in phrases]
+    assert stats["phrases"] == len(phrases)
+    assert stats["phrases_per_second"] > 0
+
+
+def test_parse_many_results_are_read_only():
+    parser = NLPParser(LEXIQUE_TEST)
+    first, second = parser.parse_many(["pause", "Pause"])
+    with pytest.raises(TypeError):
+        first["action"] = "modifié"
+    assert second["action"] == "pause"
+
+
+def test_results_are_memoized_until_the_lexicon_changes():
+    parser = NLPParser(LEXIQUE_TEST, cache_size=2)
+    first = parser.parse_command("Musique suivante")
+    assert parser.parse_command("  musique suivante ") is first
+    assert parser.cache_stats()["hits"] == 1
+
+    # Réassigner une table invalide le cache et recompile les index
+    parser.synonymes_intent = {"musique suivante": "précédent"}
+    assert parser.parse_command("musique suivante")["action"] == "précédent"
+    assert parser.cache_stats()["lexicon_version"] == 2
+
+    # LRU borné
+    for phrase in ("pause", "stop", "monte le son"):
+        parser.parse_command(phrase)
+    assert parser.cache_stats()["entries"] == 2
+
+
+def test_parse_many_process_pool():
+    parser = NLPParser(LEXIQUE_TEST)
+    phrases = CORPUS * 20
+    results = list(parser.parse_many(phrases, batch_size=16, workers=2))
+    assert results == [parser.parse_command(p) for p in phrases]
+
+
+def test_fuzzy_matching_tolerates_slips():
+    parser = NLPParser(LEXIQUE_TEST)
+
+    result = parser.parse_command("balnce get lucky")
+    assert (result["action"], result["object"]) == ("balance", "get lucky")
+    assert 0.8 <= result["confidence"] < CONFIRM_CONFIDENCE
+
+    # Mot court : corrigé, mais joué seulement après confirmation
+    result = parser.parse_command("jou get lucky")
+    assert (result["action"], result["object"]) == ("joue", "get lucky")
+    assert result["confidence"] < CONFIRM_CONFIDENCE
+
+    result = parser.parse_command("suivante piste")
+    assert result["action"] == "suivant"
+    assert result["object"] == ""
+    assert result["confidence"] < 1.0
+
+    assert parser.parse_command("precedent")["action"] == "précédent"
+    assert parser.parse_command("bof")["action"] is None
+
+
+@pytest.mark.parametrize("phrase", [
+    "quel jour sommes nous",
+    "joie de vivre",
+    "balade en forêt",
+    "une blague stp",
+    "il fait beau",
+    "je suis content",
+])
+def test_ordinary_sentences_are_never_confirmed(phrase):
+    # Une faute sur un mot court change le mot : "jour" n'est pas "joue",
+    # au mieux une commande à confirmer
+    assert NLPParser(LEXIQUE_TEST).parse_command(phrase)["confidence"] < (
+        CONFIRM_CONFIDENCE
+    )
+
+
+def test_intents_are_canonical_and_interned():
+    parser = NLPParser(LEXIQUE_TEST)
+    intents = [
+        parser.parse_command(phrase)["intent"]
+        for phrase in ("mets santé", "Lance Booba", "joue get lucky")
+    ]
+    assert intents[0] is Action.JOUE
+    assert all(intent is intents[0] for intent in intents)
+    assert parser.parse_command("salut")["intent"] == "salutation"
@@ -0,0 +1,45 @@
+"""
+test_parsed_command.py
+Tests unitaires du résultat d'analyse ParsedCommand et des actions canoniques.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from parsed_command import Action, ParsedCommand, to_intent
+
+
+def test_reads_like_a_dict():
+    parsed = ParsedCommand("mets", Action.JOUE, "santé", 1.0, elapsed=0.001)
+
+    assert parsed == {
+        "action": "mets", "intent": "joue", "object": "santé", "confidence": 1.0
+    }
+    assert parsed["object"] == parsed.object == "santé"
+    assert parsed.get("elapsed") is None  # durée hors de la vue dict
+    assert dict(parsed, committed=True)["committed"]
+    assert json.dumps(parsed.as_dict(), ensure_ascii=False) == (
+        '{"action": "mets", "intent": "joue", "object": "santé", '
+        '"confidence": 1.0}'
+    )
+
+
+def test_is_immutable_and_picklable():
+    parsed = ParsedCommand("pause", Action.PAUSE, "", 1.0)
+    with pytest.raises(TypeError):
+        parsed["action"] = "stop"
+    with pytest.raises(AttributeError):
+        parsed.action = "stop"
+    assert pickle.loads(pickle.dumps(parsed)).intent is Action.PAUSE
+
+
+def test_intents():
+    assert to_intent("précédent") is Action.PRECEDENT
+    assert {Action.PAUSE: 1}["pause"] == 1
+    assert f"{Action.JOUE}" == "joue"
+    assert to_intent("karaoke") == "karaoke"
+
+    legacy = ParsedCommand.from_mapping({"action": "pause", "object": ""})
+    assert legacy.intent is Action.PAUSE and legacy.confidence == 1.0
@@ -0,0 +1,74 @@
+"""
+test_playback_state.py
+Tests unitaires de l'état de lecture local et du polling adaptatif.
+"""
+
+import threading
+
+import pytest
+
+from playback_state import PlaybackPoller, PlaybackState
+
+
+def test_volumes_seeded_from_devices():
+    state = PlaybackState()
+    state.update_from_devices(
+        [
+            {"id": "a", "name": "Raspo", "volume_percent": 30, "is_active": True},
+            {"id": "b", "name": "Olympe", "volume_percent": 70},
+        ]
+    )
+    assert state.volume("a") == 30
+    assert state.volume("b") == 70
+    assert state.snapshot()["device_name"] == "Raspo"
+
+
+def test_optimistic_update():
+    state = PlaybackState()
+    state.update("a", volume=40, is_playing=True, track_uri="spotify:track:1")
+
+    snapshot = state.snapshot()
+    assert snapshot["volume"] == 40
+    assert snapshot["is_playing"] is True
+    assert snapshot["track_uri"] == "spotify:track:1"
+
+
+def test_update_from_playback():
+    state = PlaybackState()
+    state.update_from_playback(
+        {
+            "device": {"id": "a", "name": "Raspo", "volume_percent": 55},
+            "is_playing": True,
+            "shuffle_state": True,
+            "repeat_state": "context",
+            "item": {"uri": "spotify:track:2"},
+        }
+    )
+    assert state.volume("a") == 55
+    assert state.snapshot()["repeat"] == "context"
+
+    state.update_from_playback(None)
+    assert state.snapshot()["is_playing"] is False
+
+
+def test_poller_backs_off_when_idle():
+    polled = threading.Event()
+    poller = PlaybackPoller(polled.set, min_interval=0.01, max_interval=0.04)
+    poller.start()
+    assert polled.wait(1)
+    poller.stop()
+    assert poller.interval > poller.min_interval
+
+
+def test_update_cannot_shadow_methods():
+    state = PlaybackState()
+    state.update(volume=40)  # aucun device connu : ignoré
+    assert state.volume("a") is None
+
+    state.update("a", is_playing=True)
+    state.update(volume=40)
+    assert state.volume("a") == 40
+
+    with pytest.raises(TypeError):
+        state.update(snapshot=None)
+    assert callable(state.snapshot) and callable(state.volume)
@@ -0,0 +1,99 @@
+"""
+test_request_scheduler.py
+Tests unitaires de l'ordonnanceur de requêtes Spotify (priorités, 429,
+relance des 5xx).
+"""
+
+import threading
+import time
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+from request_scheduler import (
+    PRIORITY_HIGH, PRIORITY_LOW, RequestScheduler, RequestTimeout, TokenBucket
+)
+
+
+def test_token_bucket_spends_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+def test_high_priority_jumps_the_queue():
+    scheduler = RequestScheduler(rate=1000, burst=1000, workers=1)
+    gate = threading.Event()
+    order = []
+
+    # Occupe l'unique worker pendant qu'on remplit la file
+    blocker = scheduler.submit(gate.wait)
+    time.sleep(0.05)
+    low = scheduler.submit(order.append, "search", priority=PRIORITY_LOW)
+    high = scheduler.submit(order.append, "pause", priority=PRIORITY_HIGH)
+    gate.set()
+
+    for future in (blocker, low, high):
+        future.result(timeout=2)
+    assert order == ["pause", "search"]
+
+
+def test_429_blocks_for_retry_after_then_replays():
+    scheduler = RequestScheduler(rate=1000, burst=1000, workers=1)
+    calls = []
+
+    def throttled_once():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise SpotifyException(
+                429, -1, "rate limited", headers={"Retry-After": "0.2"}
+            )
+        return "ok"
+
+    assert scheduler.call(throttled_once) == "ok"
+    assert calls[1] - calls[0] >= 0.2
+    assert scheduler.stats()["throttled"] == 1
+
+
+def test_server_errors_are_retried_only_when_idempotent():
+    scheduler = RequestScheduler(
+        rate=1000, burst=1000, workers=1, base_backoff=0.01
+    )
+    attempts = {"next": 0, "volume": 0}
+
+    def failing_once(name):
+        attempts[name] += 1
+        if attempts[name] == 1:
+            raise SpotifyException(502, -1, "bad gateway")
+        return name
+
+    with pytest.raises(SpotifyException):
+        scheduler.call(failing_once, "next")
+    assert scheduler.call(failing_once, "volume", idempotent=True) == "volume"
+    assert attempts == {"next": 1, "volume": 2}
+
+
+def test_timeout_cancels_queued_requests_but_reports_sent_ones():
+    scheduler = RequestScheduler(rate=1000, burst=1000, workers=1)
+    gate = threading.Event()
+    sent = []
+
+    def slow():
+        sent.append("slow")
+        gate.wait(2)
+
+    # En vol : la requête est partie, elle peut encore s'appliquer
+    with pytest.raises(RequestTimeout) as in_flight:
+        scheduler.call(slow, timeout=0.1)
+    assert in_flight.value.sent
+
+    # En file derrière elle : annulée, jamais envoyée
+    with pytest.raises(RequestTimeout) as queued:
+        scheduler.call(lambda: sent.append("pause"), timeout=0.1)
+    assert not queued.value.sent
+
+    gate.set()
+    scheduler.call(lambda: None, timeout=2)
+    assert sent == ["slow"]
+    assert scheduler.stats()["abandoned"] == 1
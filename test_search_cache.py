@@ -0,0 +1,57 @@
+"""
+test_search_cache.py
+Tests unitaires du cache de recherche à deux niveaux (LRU + SQLite).
+"""
+
+import time
+
+import search_cache
+from search_cache import SearchCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  Stromae   SANTÉ ") == "stromae santé"
+
+
+def test_memory_hit_after_put(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite3"))
+    assert cache.get("Stromae Santé") is None
+    cache.put("Stromae Santé", "spotify:track:1")
+
+    assert cache.get("stromae  santé") == "spotify:track:1"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "search.sqlite3")
+    cache = SearchCache(path=path)
+    cache.put("Fade to Black", "spotify:track:2")
+    cache.close()
+
+    reopened = SearchCache(path=path)
+    assert reopened.get("fade to black") == "spotify:track:2"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_lru_eviction():
+    cache = SearchCache(path=None, max_entries=2)
+    cache.put("a", "uri:a")
+    cache.put("b", "uri:b")
+    cache.get("a")
+    cache.put("c", "uri:c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "uri:a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiration(tmp_path, monkeypatch):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite3"), ttl=60)
+    cache.put("booba dkr", "spotify:track:3")
+
+    later = time.time() + 120
+    monkeypatch.setattr(search_cache.time, "time", lambda: later)
+    assert cache.get("booba dkr") is None
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,206 @@
+"""
+test_spotify_client.py
+Tests unitaires du client Spotify partagé : session HTTP commune, client
+réutilisé, recréation et relance unique après un token refusé.
+"""
+
+import threading
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+import spotify_controller as sp_ctrl
+from library_index import LibraryIndex
+
+
+class StubSession:
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StubClient:
+    """Imite spotipy.Spotify : pas d'OAuth, donc pas de TokenRefresher."""
+
+    auth_manager = None
+
+    def __init__(self):
+        self._session = StubSession()
+
+
+def test_oauth_and_api_share_one_keep_alive_session(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    sp = sp_ctrl._init_spotify_client(cache_path=str(tmp_path / ".cache"))
+
+    assert sp._session is sp.auth_manager._session
+    adapter = sp._session.get_adapter("https://api.spotify.com/v1/")
+    assert adapter._pool_maxsize == sp_ctrl.HTTP_POOL_SIZE
+
+
+def test_client_is_reused_until_invalidated(monkeypatch):
+    created = []
+
+    def init(**kwargs):
+        created.append(StubClient())
+        return created[-1]
+
+    monkeypatch.setattr(sp_ctrl, "_init_spotify_client", init)
+    holder = sp_ctrl._SpotifyClientHolder()
+
+    first = holder.get()
+    assert holder.get() is first and len(created) == 1
+
+    holder.invalidate()
+    assert first._session.closed
+    assert holder.get() is not first and len(created) == 2
+
+
+class RecordingHolder:
+
+    def __init__(self):
+        self.invalidations = 0
+
+    def invalidate(self):
+        self.invalidations += 1
+
+
+def _failing(errors):
+    """Fonction du contrôleur qui lève les erreurs données, une par appel."""
+    calls = []
+
+    @sp_ctrl._with_auth_retry
+    def command():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return command, calls
+
+
+def test_refused_token_rebuilds_client_and_retries_once(monkeypatch):
+    holder = RecordingHolder()
+    monkeypatch.setattr(sp_ctrl, "_client_holder", holder)
+
+    command, calls = _failing([SpotifyException(401, -1, "expired")])
+    assert command() == "ok"
+    assert len(calls) == 2 and holder.invalidations == 1
+
+    # Refusé deux fois : une seule relance, l'erreur remonte
+    command, calls = _failing([SpotifyException(401, -1, "x")] * 2)
+    with pytest.raises(SpotifyException):
+        command()
+    assert len(calls) == 2 and holder.invalidations == 2
+
+
+def test_other_errors_are_not_retried(monkeypatch):
+    holder = RecordingHolder()
+    monkeypatch.setattr(sp_ctrl, "_client_holder", holder)
+
+    command, calls = _failing([SpotifyException(500, -1, "boom")])
+    with pytest.raises(SpotifyException):
+        command()
+    assert len(calls) == 1 and holder.invalidations == 0
+
+
+def test_priority_is_restored_after_the_call(monkeypatch):
+    seen = []
+
+    @sp_ctrl._with_auth_retry
+    def pause_song():
+        seen.append(sp_ctrl._request_context.priority)
+
+    @sp_ctrl._with_auth_retry
+    def sync_library():
+        pause_song()
+        seen.append(sp_ctrl._request_context.priority)
+        raise ValueError("échec")
+
+    with pytest.raises(ValueError):
+        sync_library()
+
+    assert seen == [sp_ctrl.PRIORITY_HIGH, sp_ctrl.PRIORITY_LOW]
+    assert not hasattr(sp_ctrl._request_context, "priority")
+
+
+def test_tokens_without_library_scope_stay_valid(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    sp = sp_ctrl._init_spotify_client(cache_path=str(tmp_path / ".cache"))
+    auth_manager = sp.auth_manager
+    token = {
+        "access_token": "a", "refresh_token": "r", "expires_at": 2 ** 40,
+        "scope": sp_ctrl.SCOPE,
+    }
+    auth_manager.cache_handler.save_token_to_cache(token)
+    monkeypatch.setattr(sp_ctrl._client_holder, "get", lambda: sp)
+    monkeypatch.setattr(
+        sp_ctrl, "_library_index", LibraryIndex(str(tmp_path / "library.sqlite3"))
+    )
+
+    # Lecture toujours possible, sans nouvelle autorisation...
+    assert auth_manager.validate_token(token) == token
+    assert sp_ctrl.warm_token()
+    # ...mais pas de synchronisation de la bibliothèque
+    assert not sp_ctrl._library_token_ready()
+    with pytest.raises(RuntimeError):
+        sp_ctrl.sync_library()
+
+    auth_manager.cache_handler.save_token_to_cache(
+        dict(token, scope=f"{sp_ctrl.SCOPE} {sp_ctrl.LIBRARY_SCOPE}")
+    )
+    assert sp_ctrl._library_token_ready()
+
+
+def test_refresh_keeps_the_granted_scope(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    auth_manager = sp_ctrl._init_spotify_client(
+        cache_path=str(tmp_path / ".cache")
+    ).auth_manager
+
+    token = auth_manager._add_custom_values_to_token_info(
+        {"access_token": "a", "expires_in": 3600, "scope": sp_ctrl.SCOPE}
+    )
+    assert token["scope"] == sp_ctrl.SCOPE
+
+
+def test_missing_token_never_opens_the_prompt(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    monkeypatch.setattr("builtins.input", lambda *args: pytest.fail("input()"))
+    sp = sp_ctrl._init_spotify_client(cache_path=str(tmp_path / ".cache"))
+
+    with pytest.raises(sp_ctrl.AuthenticationRequired):
+        sp.auth_manager.get_access_token(as_dict=False)
+
+
+def test_authenticate_prompts_on_the_caller_thread(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    events = []
+
+    def get_access_token(self, code=None, *args, **kwargs):
+        events.append(("token", threading.current_thread().name))
+        return "jeton"
+
+    monkeypatch.setattr(
+        sp_ctrl.SpotifyOAuth, "get_access_token", get_access_token
+    )
+    monkeypatch.setattr(sp_ctrl, "_get_devices", lambda sp: events.append("devices"))
+
+    sp_ctrl.authenticate(cache_path=str(tmp_path / ".cache"))
+
+    assert events == [("token", threading.current_thread().name), "devices"]
+
+
+def test_calls_without_token_are_never_enqueued(monkeypatch, tmp_path):
+    monkeypatch.setattr(sp_ctrl, "API_URL", None)
+    sp = sp_ctrl._init_spotify_client(cache_path=str(tmp_path / ".cache"))
+    monkeypatch.setattr(
+        sp_ctrl._scheduler, "call", lambda *args, **kwargs: pytest.fail("file")
+    )
+
+    with pytest.raises(sp_ctrl.AuthenticationRequired):
+        sp_ctrl._scheduled(sp.devices)
+    with pytest.raises(sp_ctrl.AuthenticationRequired):
+        sp_ctrl._scheduled(lambda sp, device_id: None, sp, "device")
@@ -0,0 +1,89 @@
+"""
+test_streaming_parser.py
+Tests unitaires de l'analyse incrémentale des transcriptions partielles.
+"""
+
+from nlp_parser import NLPParser
+from parsed_command import Action
+from streaming_parser import IncrementalParser, SpotifySpeculator
+from test_nlp_parser import LEXIQUE_TEST
+
+
+class RecordingSpeculator:
+    """Remplace SpotifySpeculator : note les appels sans toucher Spotify."""
+
+    def __init__(self):
+        self.speculated = []
+        self.confirmed = []
+
+    def speculate(self, intent, objet):
+        self.speculated.append((intent, objet))
+
+    def confirm(self, intent, objet):
+        self.confirmed.append((intent, objet))
+
+
+def test_commits_as_soon_as_the_verb_is_heard():
+    speculator = RecordingSpeculator()
+    stream = IncrementalParser(NLPParser(LEXIQUE_TEST), speculator)
+
+    assert stream.feed("mets")["committed"]
+    stream.feed("get")
+    stream.feed("lucky")
+
+    # Les variantes du verbe arrivent sous l'intention canonique
+    assert speculator.speculated == [
+        ("joue", ""), ("joue", "get"), ("joue", "get lucky")
+    ]
+    final = stream.finish()
+    assert final == NLPParser(LEXIQUE_TEST).parse_command("mets get lucky")
+    assert speculator.confirmed == [("joue", "get lucky")]
+
+
+def test_waits_while_a_longer_phrase_is_possible():
+    stream = IncrementalParser(NLPParser(LEXIQUE_TEST))
+
+    # "active" est un verbe, mais "active le mode aléatoire" reste possible
+    assert not stream.update("active le mode")["committed"]
+    result = stream.update("active le mode aléatoire")
+    assert result["committed"] and result["action"] == "shuffle_on"
+
+
+def test_salutation_and_revisions_are_not_committed_early():
+    stream = IncrementalParser(NLPParser(LEXIQUE_TEST))
+    assert not stream.update("salut")["committed"]
+
+    assert stream.update("pause")["committed"]
+    # La reconnaissance corrige son hypothèse : plus d'action validée
+    assert not stream.update("pose")["committed"]
+    assert stream.committed is None
+
+
+class NoTokenController:
+    """Contrôleur sans token en cache : rien ne doit appeler Spotify."""
+
+    def __init__(self):
+        self.calls = []
+
+    def warm_token(self):
+        self.calls.append("token")
+        return False
+
+    def warm_device_cache(self):
+        self.calls.append("devices")
+
+    def prefetch_track_uri(self, query):
+        self.calls.append(query)
+
+
+def test_no_speculative_work_without_a_token():
+    speculator = SpotifySpeculator()
+    speculator._controller = controller = NoTokenController()
+
+    speculator.speculate(Action.JOUE, "get lucky")
+    assert speculator._futures["get lucky"].result(5) is None
+    speculator.confirm(Action.JOUE, "get lucky")
+    speculator.close()
+
+    assert controller.calls == ["token"]
+    assert speculator.stats["no_token"] == 1
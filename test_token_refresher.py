@@ -0,0 +1,63 @@
+"""
+test_token_refresher.py
+Tests unitaires du cache de token atomique et du rafraîchissement proactif.
+"""
+
+import json
+import time
+
+from token_refresher import AtomicCacheFileHandler, TokenRefresher
+
+
+class FakeAuthManager:
+    """Imite SpotifyOAuth.refresh_access_token sans réseau."""
+
+    def __init__(self, cache_handler):
+        self.cache_handler = cache_handler
+        self.calls = 0
+
+    def refresh_access_token(self, refresh_token):
+        self.calls += 1
+        token_info = {
+            "access_token": f"token-{self.calls}",
+            "refresh_token": refresh_token,
+            "expires_at": int(time.time()) + 3600,
+        }
+        self.cache_handler.save_token_to_cache(token_info)
+        return token_info
+
+
+def test_cache_is_written_atomically_and_read_once(tmp_path):
+    path = tmp_path / "cache"
+    handler = AtomicCacheFileHandler(str(path))
+    assert handler.get_cached_token() is None
+
+    handler.save_token_to_cache({"access_token": "a", "expires_at": 1})
+    assert json.loads(path.read_text())["access_token"] == "a"
+    assert not (tmp_path / "cache.tmp").exists()
+
+    # Les lectures suivantes viennent de la mémoire
+    path.write_text("{}")
+    assert handler.get_cached_token()["access_token"] == "a"
+
+
+def test_refresh_happens_before_expiry(tmp_path):
+    handler = AtomicCacheFileHandler(str(tmp_path / "cache"))
+    handler.save_token_to_cache(
+        {
+            "access_token": "old",
+            "refresh_token": "r",
+            "expires_at": int(time.time()) + 100,
+        }
+    )
+    auth_manager = FakeAuthManager(handler)
+    refresher = TokenRefresher(auth_manager, margin=300)
+    refresher.start()
+
+    deadline = time.time() + 2
+    while auth_manager.calls == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    refresher.stop()
+
+    assert handler.get_cached_token()["access_token"] == "token-1"
+    assert refresher.seconds_until_refresh() > 3000
@@ -0,0 +1,49 @@
+"""
+test_tracing.py
+Tests unitaires des histogrammes de latence et des spans.
+"""
+
+import json
+
+from tracing import LatencyHistogram, Tracer, _NULL_SPAN
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    # Erreur relative bornée par la largeur des buckets (25 %)
+    assert 0.050 <= summary["p50_ms"] / 1000 <= 0.050 * 1.25
+    assert 0.095 <= summary["p95_ms"] / 1000 <= 0.100
+    assert summary["max_ms"] == 100
+
+
+def test_span_records_stage_and_action():
+    tracer = Tracer(enabled=True)
+    with tracer.span("parse") as span:
+        span.action = "pause"
+
+    stats = tracer.stats()
+    assert stats["parse"]["count"] == 1
+    assert stats["parse[pause]"]["count"] == 1
+
+
+def test_disabled_tracer_is_inert():
+    tracer = Tracer(enabled=False)
+    span = tracer.span("parse")
+    assert span is _NULL_SPAN
+    with span as s:
+        s.action = "pause"
+    assert tracer.stats() == {}
+
+
+def test_export(tmp_path):
+    tracer = Tracer(enabled=True)
+    tracer.record("spotify.devices", 0.02)
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+
+    assert json.loads(path.read_text())["spotify.devices"]["count"] == 1
@@ -0,0 +1,77 @@
+"""
+test_warmup.py
+Tests unitaires du préchauffage, avec un contrôleur factice.
+"""
+
+from nlp_parser import NLPParser
+from test_nlp_parser import LEXIQUE_TEST
+from warmup import Warmup, default_steps
+
+
+class FakeController:
+    """Imite les fonctions de préchauffage de spotify_controller."""
+
+    def __init__(self, token=True):
+        self.token = token
+        self.calls = []
+
+    def warm_token(self):
+        self.calls.append("token")
+        return self.token
+
+    def warm_connection(self):
+        self.calls.append("connexion")
+        raise ConnectionError("réseau indisponible")
+
+    def warm_device_cache(self):
+        self.calls.append("devices")
+
+    def start_library_sync(self):
+        self.calls.append("bibliothèque")
+        return True
+
+
+def test_steps_run_in_order_and_failures_are_reported():
+    parser = NLPParser(LEXIQUE_TEST)
+    controller = FakeController()
+    warmup = Warmup(default_steps(parser, controller))
+
+    results = warmup.run()
+
+    assert [r.name for r in results] == [
+        "parser", "token", "connexion", "devices", "bibliothèque"
+    ]
+    # Une étape en échec n'empêche pas les suivantes
+    assert controller.calls == ["token", "connexion", "devices", "bibliothèque"]
+    errors = {r.name: r.error for r in results}
+    assert errors["parser"] is None and errors["devices"] is None
+    assert errors["connexion"] == "réseau indisponible"
+    assert "réseau indisponible" in warmup.report()
+    # Le parse à chaud ne remplit pas le cache des vraies commandes
+    assert parser.cache_stats()["entries"] == 0
+
+
+def test_missing_token_skips_spotify_steps():
+    controller = FakeController(token=False)
+    warmup = Warmup(default_steps(NLPParser(LEXIQUE_TEST), controller))
+
+    results = warmup.run()
+
+    # Rien ne doit pouvoir ouvrir l'autorisation interactive
+    assert controller.calls == ["token"]
+    assert [r.skipped for r in results] == [False, False, True, True, True]
+    assert "token" in results[1].error
+    assert "ignorée" in warmup.report()
+
+
+def test_background_start():
+    finished = []
+    warmup = Warmup([("a", lambda: None), ("b", lambda: None)])
+    assert "pas encore" in warmup.report()
+
+    warmup.start(on_done=finished.append)
+
+    assert warmup.wait(5) and warmup.done
+    warmup._thread.join(5)
+    assert finished == [warmup]
+    assert [r.name for r in warmup.results] == ["a", "b"]
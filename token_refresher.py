@@ -0,0 +1,137 @@
+"""
+token_refresher.py
+Rafraîchissement proactif du token OAuth Spotify en arrière-plan, et cache
+de token en mémoire écrit de façon atomique sur disque.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from spotipy.cache_handler import CacheHandler
+from spotipy.oauth2 import SpotifyOAuth
+
+import tracing
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# Renouvellement quand il reste moins de REFRESH_MARGIN secondes
+# (spotipy, lui, attend qu'il en reste moins de 60)
+REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "300"))
+RETRY_INTERVAL = 30.0
+
+# -----------------------------
+# CACHE DE TOKEN
+# -----------------------------
+
+
+class AtomicCacheFileHandler(CacheHandler):
+    """
+    Cache de token OAuth partagé : lu une fois sur disque, servi depuis la
+    mémoire ensuite, et réécrit atomiquement (fichier temporaire + rename)
+    à chaque nouveau token.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._token_info: Optional[dict] = None
+        self._loaded = False
+
+    def get_cached_token(self) -> Optional[dict]:
+        with self._lock:
+            if not self._loaded:
+                try:
+                    with open(self.cache_path, encoding="utf-8") as f:
+                        self._token_info = json.load(f)
+                except (OSError, ValueError):
+                    self._token_info = None
+                self._loaded = True
+            return dict(self._token_info) if self._token_info else None
+
+    def save_token_to_cache(self, token_info: dict) -> None:
+        with self._lock:
+            self._token_info = dict(token_info)
+            self._loaded = True
+
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(token_info, f)
+            os.replace(tmp_path, self.cache_path)
+
+
+# -----------------------------
+# RAFRAÎCHISSEMENT EN ARRIÈRE-PLAN
+# -----------------------------
+
+
+class TokenRefresher:
+    """
+    Thread qui renouvelle le token margin secondes avant son expiration.
+
+    Le token rafraîchi passe par le cache_handler de l'auth_manager : le
+    client Spotify qui partage cet auth_manager l'utilise directement, sans
+    jamais attendre un rafraîchissement pendant une commande.
+    """
+
+    def __init__(
+        self,
+        auth_manager: SpotifyOAuth,
+        margin: float = REFRESH_MARGIN,
+        retry_interval: float = RETRY_INTERVAL
+    ):
+        self.auth_manager = auth_manager
+        self.margin = margin
+        self.retry_interval = retry_interval
+        self.refreshes = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="gigi-token-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """Délai avant le prochain renouvellement, None si pas de token."""
+        token_info = self.auth_manager.cache_handler.get_cached_token()
+        if not token_info or "refresh_token" not in token_info:
+            return None
+        return token_info["expires_at"] - self.margin - time.time()
+
+    def refresh_now(self) -> None:
+        token_info = self.auth_manager.cache_handler.get_cached_token()
+        with tracing.span("spotify.token_refresh"):
+            self.auth_manager.refresh_access_token(token_info["refresh_token"])
+        self.refreshes += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self.seconds_until_refresh()
+            if delay is None:
+                # Pas encore authentifié : on repasse plus tard
+                self._stop.wait(self.retry_interval)
+                continue
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+            try:
+                self.refresh_now()
+            except Exception:
+                self.failures += 1
+                self._stop.wait(self.retry_interval)
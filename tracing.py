@@ -0,0 +1,221 @@
+"""
+tracing.py
+Traces de latence par étape (parse, dispatch, contrôleur, appels Spotify)
+avec histogrammes p50/p95/p99 légers, exportables en JSON.
+
+Activé avec GIGI_TRACING=1 ; désactivé, span() renvoie un objet partagé
+qui ne fait rien (coût quasi nul).
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+ENABLED = os.getenv("GIGI_TRACING", "0") == "1"
+TRACE_FILE = os.getenv("GIGI_TRACE_FILE")
+
+# Bornes géométriques des buckets : de 1 µs à ~100 s, facteur 1.25
+_BUCKET_FACTOR = 1.25
+_BUCKET_BOUNDS: List[float] = [
+    1e-6 * _BUCKET_FACTOR**i
+    for i in range(int(math.log(1e8) / math.log(_BUCKET_FACTOR)) + 1)
+]
+
+PERCENTILES = (0.50, 0.95, 0.99)
+
+# -----------------------------
+# HISTOGRAMME
+# -----------------------------
+
+
+class LatencyHistogram:
+    """
+    Histogramme de latences à buckets fixes (mémoire constante).
+
+    Les percentiles sont estimés par la borne haute du bucket concerné,
+    soit une erreur relative d'au plus 25 %.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        threshold = q * self.count
+        cumulated = 0
+        for index, count in enumerate(self.counts):
+            cumulated += count
+            if cumulated >= threshold:
+                if index < len(_BUCKET_BOUNDS):
+                    return min(_BUCKET_BOUNDS[index], self.max)
+                return self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Résumé en millisecondes."""
+        result = {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+        for q in PERCENTILES:
+            result[f"p{int(q * 100)}_ms"] = self.percentile(q) * 1000
+        return result
+
+
+# -----------------------------
+# SPANS
+# -----------------------------
+
+
+class Span:
+    """Mesure d'une étape ; l'action peut être précisée avant la fin du bloc."""
+
+    __slots__ = ("tracer", "stage", "action", "started_at")
+
+    def __init__(self, tracer: "Tracer", stage: str, action: Optional[str]):
+        self.tracer = tracer
+        self.stage = stage
+        self.action = action
+        self.started_at = 0.0
+
+    def __enter__(self) -> "Span":
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.tracer.record(
+            self.stage, time.perf_counter() - self.started_at, self.action
+        )
+
+
+class _NullSpan:
+    """Span inerte, partagée, utilisée quand le traçage est désactivé."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    @property
+    def action(self) -> None:
+        return None
+
+    @action.setter
+    def action(self, value) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# -----------------------------
+# TRACEUR
+# -----------------------------
+
+
+class Tracer:
+    """Collecte les latences par étape et par (étape, action)."""
+
+    def __init__(self, enabled: bool = ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Optional[str]],
+                               LatencyHistogram] = {}
+
+    def span(self, stage: str, action: Optional[str] = None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, stage, action)
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        action: Optional[str] = None
+    ) -> None:
+        keys = [(stage, None)]
+        if action:
+            keys.append((stage, action))
+        with self._lock:
+            for key in keys:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.record(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Résumés indexés par "étape" et "étape[action]"."""
+        with self._lock:
+            items = sorted(
+                self._histograms.items(),
+                key=lambda item: (item[0][0], item[0][1] or "")
+            )
+            return {
+                stage if action is None else f"{stage}[{action}]":
+                histogram.summary()
+                for (stage, action), histogram in items
+            }
+
+    def export(self, path: str) -> None:
+        """Écrit les résumés dans un fichier JSON (écriture atomique)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+tracer = Tracer()
+
+
+def span(stage: str, action: Optional[str] = None):
+    """
+    Mesure le bloc `with` comme étape stage (éventuellement pour action).
+
+    Exemple :
+        with tracing.span("spotify.devices"):
+            sp.devices()
+    """
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return Span(tracer, stage, action)
+
+
+def format_stats() -> str:
+    """Tableau lisible des latences pour la console."""
+    lines = [
+        f"{'étape':<36} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} (ms)"
+    ]
+    for name, summary in tracer.stats().items():
+        lines.append(
+            f"{name:<36} {summary['count']:>6} {summary['p50_ms']:>9.2f}"
+            f" {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
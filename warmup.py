@@ -0,0 +1,179 @@
+"""
+warmup.py
+Préchauffage au démarrage : tout ce dont la première commande a besoin
+(lexique et index du parser, token Spotify, connexion TLS à l'API, liste
+des devices, synchronisation de la bibliothèque) est préparé avant qu'elle
+arrive, au lieu d'être payé par le premier "joue ...".
+
+Le préchauffage peut tourner en arrière-plan pendant que l'invite est
+déjà affichée : chaque étape est idempotente et sûre en parallèle d'une
+vraie commande, qui se contente alors d'en profiter si elle est finie.
+
+Exemple :
+    warmup = Warmup(default_steps(parser))
+    warmup.start()             # ou warmup.run() pour attendre
+    ...
+    print(warmup.report())     # durée de chaque étape
+"""
+
+import os
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import tracing
+
+# -----------------------------
+# CONFIGURATION & VARIABLES
+# -----------------------------
+
+# "background" (défaut), "foreground" (attendre avant l'invite) ou "off"
+WARMUP_MODE = os.getenv("GIGI_WARMUP", "background")
+
+# Phrases analysées pour chauffer tokenizer, expressions et index approché
+WARMUP_PHRASES = ("mets santé de stromae", "active le mode aléatoire", "jou")
+
+Step = Tuple[str, Callable[[], object]]
+
+# -----------------------------
+# ÉTAPES
+# -----------------------------
+
+
+class StepResult(NamedTuple):
+    name: str
+    seconds: float
+    error: Optional[str] = None  # None si l'étape a réussi
+    skipped: bool = False  # non lancée après un WarmupAborted
+
+
+class WarmupAborted(RuntimeError):
+    """Échec qui rend inutiles toutes les étapes suivantes."""
+
+
+def _warm_parser(parser) -> None:
+    for phrase in WARMUP_PHRASES:
+        parser.parse_command(phrase, memoize=False)
+
+
+def _check_token(controller) -> None:
+    # Sans token, les étapes suivantes tomberaient dans l'autorisation
+    # interactive (input()) depuis le thread de préchauffage
+    if not controller.warm_token():
+        raise WarmupAborted("aucun token en cache, lancer l'authentification")
+
+
+def default_steps(parser=None, controller=None) -> List[Step]:
+    """
+    Étapes dans l'ordre de la première commande.
+
+    Args:
+        parser: NLPParser à chauffer (créé ici si absent : lexique chargé).
+        controller: Module contrôleur ; spotify_controller par défaut.
+    """
+    if controller is None:
+        # Import différé : le contrôleur exige la configuration Spotify
+        import spotify_controller as controller
+
+    steps: List[Step] = []
+    if parser is None:
+        def load_parser():
+            from nlp_parser import NLPParser
+            _warm_parser(NLPParser())
+
+        steps.append(("parser", load_parser))
+    else:
+        steps.append(("parser", lambda: _warm_parser(parser)))
+
+    steps += [
+        ("token", lambda: _check_token(controller)),
+        ("connexion", controller.warm_connection),
+        ("devices", controller.warm_device_cache),
+        ("bibliothèque", controller.start_library_sync),
+    ]
+    return steps
+
+
+# -----------------------------
+# PRÉCHAUFFAGE
+# -----------------------------
+
+
+class Warmup:
+    """
+    Exécute les étapes dans l'ordre et mesure chacune.
+
+    Une étape en échec (réseau absent) est notée puis on passe à la
+    suivante : la commande concernée refera le travail et remontera
+    l'erreur elle-même. Après un WarmupAborted (token manquant), les
+    étapes restantes sont notées comme ignorées sans être lancées.
+    """
+
+    def __init__(self, steps: Sequence[Step]):
+        self.steps = list(steps)
+        self.results: List[StepResult] = []
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run(self) -> List[StepResult]:
+        aborted: Optional[str] = None
+        for name, func in self.steps:
+            if aborted is not None:
+                self.results.append(StepResult(name, 0.0, aborted, skipped=True))
+                continue
+            started_at = time.perf_counter()
+            error = None
+            with tracing.span(f"warmup.{name}"):
+                try:
+                    func()
+                except WarmupAborted as e:
+                    error = str(e)
+                    aborted = f"échec de l'étape {name}"
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+            self.results.append(
+                StepResult(name, time.perf_counter() - started_at, error)
+            )
+        self._done.set()
+        return self.results
+
+    def start(
+        self, on_done: Optional[Callable[["Warmup"], None]] = None
+    ) -> None:
+        """Lance run() dans un thread ; on_done(self) est appelé à la fin."""
+
+        def target():
+            self.run()
+            if on_done is not None:
+                on_done(self)
+
+        self._thread = threading.Thread(
+            target=target, name="gigi-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def report(self) -> str:
+        """Durée de chaque étape, lisible en console."""
+        if not self.results:
+            return "Préchauffage : pas encore commencé."
+        lines = ["Préchauffage :"]
+        for name, seconds, error, skipped in self.results:
+            if skipped:
+                status = f"ignorée ({error})"
+            else:
+                status = f"échec ({error})" if error else "ok"
+            lines.append(f"  {name:<14} {seconds * 1000:>9.1f} ms  {status}")
+        total = sum(result.seconds for result in self.results)
+        pending = len(self.steps) - len(self.results)
+        lines.append(
+            f"  {'total':<14} {total * 1000:>9.1f} ms"
+            + (f"  ({pending} étape(s) en cours)" if pending else "")
+        )
+        return "\n".join(lines)